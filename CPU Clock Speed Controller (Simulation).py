@@ -1,16 +1,334 @@
 import tkinter as tk
-from tkinter import messagebox
-import time
+from tkinter import messagebox, filedialog
+import os
+import queue
 import threading
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+GOVERNORS = ["performance", "powersave", "ondemand", "conservative", "schedutil"]
+DEFAULT_PSTATES = "800:0.70, 1200:0.78, 1600:0.86, 2000:0.95, 2400:1.05, 2800:1.15, 3200:1.25"
+UP_THRESHOLD = 0.80  # ondemand jumps to the top, conservative steps up, above this utilisation
+DOWN_THRESHOLD = 0.20  # conservative steps down below this utilisation
+SCHEDUTIL_HEADROOM = 1.25  # schedutil asks for 25% more than the frequency-invariant utilisation
+PHASE_MEAN_S = 0.5  # mean length of a synthetic workload phase
+PHASE_LEVELS = [(0.03, 0.02), (0.25, 0.10), (0.55, 0.15), (0.95, 0.05)]  # (mean, spread) of demand per phase
+POLL_MS = 100
+CPUFREQ_ROOT = "/sys/devices/system/cpu"
+PROC_STAT = "/proc/stat"
+STAT_READ_BYTES = 1 << 16  # enough for the cpu lines at the top of /proc/stat on large machines
+HISTORY_POINTS = 600  # telemetry samples kept in the ring buffer
+REDRAW_MS = 250  # live chart refresh throttle
+MAX_CHART_CORES = 16  # per-core lines drawn; the mean is always drawn
+
+
+def parse_pstates(text):
+    """Parse "MHz:V, MHz:V, ..." into (frequencies in Hz, voltages), both sorted by frequency."""
+    states = []
+    for part in text.split(","):
+        mhz, _, volts = part.partition(":")
+        states.append((float(mhz) * 1e6, float(volts)))
+    states.sort()
+    if not states or states[0][0] <= 0 or min(v for _, v in states) <= 0:
+        raise ValueError("P-states need positive frequencies and voltages")
+    return np.array([f for f, _ in states]), np.array([v for _, v in states])
+
+
+def synthetic_trace(seconds, period, seed=None):
+    """Bursty utilisation demand per sample, as a fraction of the top P-state's capacity.
+
+    The workload alternates between idle, light, medium and saturating phases
+    of exponentially distributed length, with uniform noise inside a phase.
+    """
+    rng = np.random.default_rng(seed)
+    samples = int(round(seconds / period))
+    lengths = np.maximum(1, rng.exponential(PHASE_MEAN_S / period, samples).astype(int))
+    count = np.searchsorted(np.cumsum(lengths), samples) + 1
+    levels = np.array(PHASE_LEVELS)[rng.integers(len(PHASE_LEVELS), size=count)]
+    phase = np.repeat(np.arange(count), lengths[:count])[:samples]
+    mean, spread = levels[phase, 0], levels[phase, 1]
+    return np.clip(mean + rng.uniform(-spread, spread), 0.0, 1.0)
+
+
+def read_utilisation_trace(path):
+    """One utilisation sample per line, as 0-1 or as a percentage."""
+    values = []
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split("#")[0].strip().rstrip("%")
+            if not line:
+                continue
+            try:
+                values.append(float(line.replace(",", " ").split()[-1]))
+            except ValueError:
+                raise ValueError(f"{path}:{line_no}: expected a utilisation value")
+    trace = np.array(values)
+    if trace.size == 0:
+        raise ValueError(f"{path}: no samples")
+    return np.clip(trace / 100 if trace.max() > 1 else trace, 0.0, 1.0)
+
+
+def simulate_governor(trace, period, freqs, volts, governor, capacitance_nf=1.0, leakage_a=0.5,
+                      transition_us=10.0):
+    """Replay a utilisation trace through one cpufreq governor.
+
+    Each sample offers `trace[k] * top frequency * period` cycles of work;
+    whatever the current P-state cannot retire carries over as backlog, and
+    once the trace ends the CPU keeps running until the backlog drains. The
+    governor sees the busy fraction of the sample just finished and picks
+    the next P-state; a change stalls the core for `transition_us`.
+
+    Power is C*V^2*f while busy plus V*I_leak throughout, so a race-to-idle
+    at high voltage trades dynamic energy against leakage time. Energy is
+    counted until the later of the trace end and the last retired cycle.
+    """
+    top = len(freqs) - 1
+    f_max = freqs[top]
+    capacitance = capacitance_nf * 1e-9
+    stall = transition_us * 1e-6
+    dynamic = capacitance * volts ** 2 * freqs  # W per P-state while busy
+    leakage = leakage_a * volts  # W per P-state at all times
+    state = top if governor != "powersave" else 0
+    backlog = 0.0  # cycles offered but not yet retired
+    energy = busy_time = finished = max_lag = 0.0
+    cycles_at = 0.0  # sum of f * busy time, for the time-weighted mean frequency
+    transitions = 0
+    changed = False
+    frequency = []
+    k = 0
+    while k < len(trace) or backlog > 0:
+        start = k * period
+        if k < len(trace):
+            backlog += trace[k] * f_max * period
+        f = freqs[state]
+        usable = period - stall if changed else period
+        done = min(backlog, f * usable)
+        backlog -= done
+        busy = done / f
+        if done > 0:
+            finished = start + period - usable + busy
+        if k < len(trace) or backlog > 0:
+            energy += dynamic[state] * busy + leakage[state] * period
+        else:
+            energy += dynamic[state] * busy + leakage[state] * (finished - start)
+        busy_time += busy
+        cycles_at += f * busy
+        max_lag = max(max_lag, backlog / f_max)
+        frequency.append(f)
+        util = busy / period
+
+        previous = state
+        if governor == "ondemand":
+            # Jump to the top when busy, otherwise scale with the load.
+            if util > UP_THRESHOLD:
+                state = top
+            else:
+                state = min(top, int(np.searchsorted(freqs, freqs[0] + util * (f_max - freqs[0]))))
+        elif governor == "conservative":
+            if util > UP_THRESHOLD:
+                state = min(top, state + 1)
+            elif util < DOWN_THRESHOLD:
+                state = max(0, state - 1)
+        elif governor == "schedutil":
+            invariant = util * f / f_max
+            state = min(top, int(np.searchsorted(freqs, SCHEDUTIL_HEADROOM * invariant * f_max)))
+        changed = state != previous
+        transitions += changed
+        k += 1
+
+    elapsed = max(finished, len(trace) * period)
+    return {
+        "governor": governor,
+        "completion": finished,
+        "energy": energy,
+        "edp": energy * finished,
+        "power": energy / elapsed if elapsed else 0.0,
+        "mean_mhz": cycles_at / busy_time * 1e-6 if busy_time else freqs[state] * 1e-6,
+        "transitions": transitions,
+        "max_lag": max_lag,
+        "frequency": np.array(frequency) * 1e-6,
+    }
+
+
+class TelemetrySampler:
+    """Per-core frequency and utilisation from sysfs and /proc/stat.
+
+    Every scaling_cur_freq file and /proc/stat stay open for the sampler's
+    lifetime and are re-read with os.pread at offset 0, so a sample costs one
+    syscall per file and no path lookups. Samples land in fixed-size NumPy
+    ring buffers guarded by a lock; cores without cpufreq read as NaN.
+    """
+
+    def __init__(self, root=CPUFREQ_ROOT, stat_path=PROC_STAT, capacity=HISTORY_POINTS):
+        self.cores = sorted(int(name[3:]) for name in os.listdir(root)
+                            if name.startswith("cpu") and name[3:].isdigit())
+        if not self.cores:
+            raise ValueError(f"No cpu<N> directories under {root}")
+        self.freq_fds = []
+        for core in self.cores:
+            path = os.path.join(root, f"cpu{core}", "cpufreq", "scaling_cur_freq")
+            try:
+                self.freq_fds.append(os.open(path, os.O_RDONLY))
+            except OSError:
+                self.freq_fds.append(None)
+        self.stat_fd = os.open(stat_path, os.O_RDONLY)
+        self.column = {core: i for i, core in enumerate(self.cores)}
+        self.times = np.full(capacity, np.nan)
+        self.freq = np.full((capacity, len(self.cores)), np.nan)  # MHz
+        self.util = np.full((capacity, len(self.cores)), np.nan)  # percent busy since the previous sample
+        self.next = 0
+        self.count = 0
+        self.lock = threading.Lock()
+        self.previous = self.read_cpu_times()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def read_frequencies(self):
+        return np.array([float(os.pread(fd, 32, 0)) * 1e-3 if fd is not None else np.nan
+                         for fd in self.freq_fds])
+
+    def read_cpu_times(self):
+        # (busy, total) jiffies per core; idle and iowait count as not busy.
+        # Cores without a usable line (offline, or absent from this host) stay NaN.
+        busy = np.full(len(self.cores), np.nan)
+        total = np.full(len(self.cores), np.nan)
+        for line in os.pread(self.stat_fd, STAT_READ_BYTES, 0).decode().splitlines():
+            if not line.startswith("cpu"):
+                break
+            fields = line.split()
+            i = self.column.get(int(fields[0][3:])) if fields[0][3:].isdigit() else None
+            if i is None:
+                continue
+            ticks = [int(v) for v in fields[1:9]]
+            if len(ticks) < 5:
+                continue
+            total[i] = sum(ticks)
+            busy[i] = total[i] - ticks[3] - ticks[4]
+        return busy, total
+
+    def sample(self, now=None):
+        freq = self.read_frequencies()
+        busy, total = self.read_cpu_times()
+        elapsed = total - self.previous[1]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            util = np.where(elapsed == 0, 0.0, 100 * (busy - self.previous[0]) / elapsed)
+        self.previous = busy, total
+        with self.lock:
+            self.times[self.next] = time.monotonic() if now is None else now
+            self.freq[self.next] = freq
+            self.util[self.next] = util
+            self.next = (self.next + 1) % len(self.times)
+            self.count = min(self.count + 1, len(self.times))
+
+    def series(self):
+        """(times, MHz, utilisation %) for the retained samples, oldest first."""
+        with self.lock:
+            order = np.arange(self.next - self.count, self.next) % len(self.times)
+            return self.times[order], self.freq[order], self.util[order]
+
+    def start(self, interval, on_error):
+        def run():
+            while not self.stop_event.wait(interval):
+                try:
+                    self.sample()
+                except (OSError, ValueError, IndexError) as e:
+                    on_error(str(e))
+                    return
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+        for fd in self.freq_fds + [self.stat_fd]:
+            if fd is not None:
+                os.close(fd)
+        self.freq_fds = []
+        self.stat_fd = None
+
+
+class TelemetryChart:
+    """Live per-core frequency and utilisation, redrawn on a throttled after() timer.
+
+    The x axis is seconds before the newest sample, so it never moves; a
+    refresh blits the animated lines over the cached axes and only does a
+    full draw when a frequency outgrows the y limit or the core count changes."""
+
+    def __init__(self, master):
+        self.sampler = None
+        self.fig, (self.ax_freq, self.ax_util) = plt.subplots(2, 1, figsize=(7.5, 4.2), sharex=True)
+        self.ax_freq.set_title("Host CPU Telemetry")
+        self.ax_freq.set_ylabel("Frequency (MHz)")
+        self.ax_util.set_ylabel("Utilisation (%)")
+        self.ax_util.set_xlabel("Seconds Ago")
+        self.ax_freq.set_ylim(0, 1000)
+        self.ax_util.set_ylim(0, 105)
+        self.lines = []
+        self.fig.tight_layout()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+        self.canvas.draw()
+        master.after(REDRAW_MS, self.refresh, master)
+
+    def attach(self, sampler, interval):
+        self.sampler = sampler
+        for line in self.lines:
+            line.remove()
+        shown = min(len(sampler.cores), MAX_CHART_CORES)
+        self.lines = []
+        for ax in (self.ax_freq, self.ax_util):
+            self.lines.append([ax.plot([], [], linewidth=0.7, alpha=0.6, animated=True)[0] for _ in range(shown)]
+                              + [ax.plot([], [], color="black", linewidth=1.4, animated=True)[0]])
+        self.ax_util.set_xlim(-interval * len(sampler.times), 0)
+        self.canvas.draw()
+
+    def on_draw(self, event):
+        # Full draws skip animated artists; cache the empty axes and add them back.
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_lines()
+
+    def draw_lines(self):
+        for ax, lines in zip((self.ax_freq, self.ax_util), self.lines):
+            for line in lines:
+                ax.draw_artist(line)
+
+    def refresh(self, master):
+        if self.sampler is not None and self.sampler.count:
+            times, freq, util = self.sampler.series()
+            x = times - times[-1]
+            for lines, values in zip(self.lines, (freq, util)):
+                for core, line in enumerate(lines[:-1]):
+                    line.set_data(x, values[:, core])
+                present = (~np.isnan(values)).sum(axis=1)
+                lines[-1].set_data(x, np.where(present, np.nansum(values, axis=1) / np.maximum(present, 1), np.nan))
+            top = np.nanmax(freq) if not np.isnan(freq).all() else 0.0
+            if top > self.ax_freq.get_ylim()[1]:
+                self.ax_freq.set_ylim(0, top * 1.15)
+                self.canvas.draw()
+            elif self.background is not None:
+                self.canvas.restore_region(self.background)
+                self.draw_lines()
+                self.canvas.blit(self.fig.bbox)
+        master.after(REDRAW_MS, self.refresh, master)
+
 
 class CPUClockSimulator:
     def __init__(self, root):
         self.root = root
         self.root.title("CPU Clock Speed Controller Simulator")
-        self.root.geometry("700x500")
-        
+        self.root.geometry("780x860")
+
         self.is_running = False
+        self.trace = None  # loaded utilisation samples; None for the synthetic workload
+        self.sampler = None
+        self.events = queue.Queue()
         self.create_widgets()
+        self.root.after(POLL_MS, self.poll_events)
 
     def create_widgets(self):
         title = tk.Label(self.root, text="CPU Clock Speed Controller (Simulation)", font=("Arial", 16, "bold"))
@@ -20,17 +338,90 @@ class CPUClockSimulator:
         self.task_entry = tk.Entry(self.root)
         self.task_entry.pack(pady=5)
 
-        tk.Label(self.root, text="Set CPU Clock Speed (MHz):").pack()
-        self.clock_entry = tk.Entry(self.root)
-        self.clock_entry.pack(pady=5)
-        self.clock_entry.insert(0, "2400")  # Default 2.4 GHz
+        tk.Label(self.root, text="P-State Table (MHz:Volts, ...):").pack()
+        self.pstate_entry = tk.Entry(self.root, width=80)
+        self.pstate_entry.pack(pady=5)
+        self.pstate_entry.insert(0, DEFAULT_PSTATES)
+
+        settings_frame = tk.Frame(self.root)
+        settings_frame.pack(pady=5)
+        self.entries = {}
+        fields = [
+            ("capacitance_nf", "Switched Capacitance (nF):", "1.0"),
+            ("leakage_a", "Leakage Current (A):", "0.5"),
+            ("transition_us", "P-State Switch Latency (us):", "10"),
+            ("period_ms", "Governor Sample Period (ms):", "10"),
+            ("seconds", "Synthetic Trace Length (s):", "30"),
+            ("seed", "Seed:", "1"),
+        ]
+        for i, (key, label, default) in enumerate(fields):
+            tk.Label(settings_frame, text=label).grid(row=i // 2, column=2 * (i % 2), sticky="w", padx=(10, 0))
+            entry = tk.Entry(settings_frame, width=10)
+            entry.insert(0, default)
+            entry.grid(row=i // 2, column=2 * (i % 2) + 1, sticky="w")
+            self.entries[key] = entry
 
-        run_btn = tk.Button(self.root, text="Run Task", command=self.run_task)
-        run_btn.pack(pady=10)
+        button_frame = tk.Frame(self.root)
+        button_frame.pack(pady=5)
+        tk.Button(button_frame, text="Load Utilisation Trace", command=self.load_trace).pack(side="left", padx=5)
+        tk.Button(button_frame, text="Use Synthetic Trace", command=self.clear_trace).pack(side="left", padx=5)
+        self.run_btn = tk.Button(button_frame, text="Run Task", command=self.run_task)
+        self.run_btn.pack(side="left", padx=5)
 
-        tk.Label(self.root, text="Simulation Log:").pack()
-        self.log_box = tk.Text(self.root, height=15, width=80, state="disabled")
-        self.log_box.pack(pady=10)
+        telemetry_frame = tk.LabelFrame(self.root, text="Host Telemetry")
+        telemetry_frame.pack(padx=10, pady=5)
+        tk.Label(telemetry_frame, text="Sysfs CPU Root:").grid(row=0, column=0, sticky="w")
+        self.sysfs_entry = tk.Entry(telemetry_frame, width=30)
+        self.sysfs_entry.insert(0, CPUFREQ_ROOT)
+        self.sysfs_entry.grid(row=0, column=1, sticky="w")
+        tk.Label(telemetry_frame, text="Sample Every (ms):").grid(row=0, column=2, sticky="w", padx=(10, 0))
+        self.interval_entry = tk.Entry(telemetry_frame, width=8)
+        self.interval_entry.insert(0, "200")
+        self.interval_entry.grid(row=0, column=3, sticky="w")
+        self.telemetry_btn = tk.Button(telemetry_frame, text="Start Telemetry", command=self.toggle_telemetry)
+        self.telemetry_btn.grid(row=0, column=4, padx=10, pady=5)
+
+        self.status = tk.Label(self.root, text="", anchor="w", justify="left")
+        self.status.pack(fill="x", padx=10)
+        self.chart = TelemetryChart(self.root)
+
+    def toggle_telemetry(self):
+        if self.sampler is not None:
+            self.sampler.stop()
+            self.sampler = None
+            self.telemetry_btn.config(text="Start Telemetry")
+            self.log("Telemetry stopped.")
+            return
+        try:
+            interval = float(self.interval_entry.get()) * 1e-3
+            if interval <= 0:
+                raise ValueError("Enter a positive sample interval")
+            self.sampler = TelemetrySampler(self.sysfs_entry.get().strip() or CPUFREQ_ROOT)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.chart.attach(self.sampler, interval)
+        self.sampler.start(interval, lambda message: self.events.put(("telemetry_error", message)))
+        self.telemetry_btn.config(text="Stop Telemetry")
+        missing = sum(fd is None for fd in self.sampler.freq_fds)
+        self.log(f"Sampling {len(self.sampler.cores)} cores every {interval * 1e3:g} ms"
+                 + (f"; {missing} without cpufreq" if missing else ""))
+
+    def load_trace(self):
+        path = filedialog.askopenfilename(title="Select Utilisation Trace (one sample per line)")
+        if not path:
+            return
+        try:
+            self.trace = read_utilisation_trace(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.log(f"Loaded {len(self.trace):,} utilisation samples (mean {100 * self.trace.mean():.1f}%) "
+                 f"from {path}")
+
+    def clear_trace(self):
+        self.trace = None
+        self.log("Using the synthetic bursty workload.")
 
     def run_task(self):
         if self.is_running:
@@ -38,35 +429,100 @@ class CPUClockSimulator:
             return
 
         task_name = self.task_entry.get().strip()
-        clock_speed = self.clock_entry.get().strip()
-
-        if not task_name or not clock_speed.isdigit():
-            messagebox.showerror("Error", "Enter valid task name and clock speed")
+        if not task_name:
+            messagebox.showerror("Error", "Enter valid task name")
+            return
+        try:
+            freqs, volts = parse_pstates(self.pstate_entry.get())
+            params = {key: float(self.entries[key].get())
+                      for key in ("capacitance_nf", "leakage_a", "transition_us")}
+            period = float(self.entries["period_ms"].get()) * 1e-3
+            seconds = float(self.entries["seconds"].get())
+            seed = int(self.entries["seed"].get()) if self.entries["seed"].get().strip() else None
+            if min(params.values()) < 0 or period <= 0 or seconds <= 0 or params["transition_us"] * 1e-6 >= period:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Enter a P-state table like 800:0.7, 2400:1.05, non-negative power "
+                                          "parameters, and a sample period longer than the switch latency")
             return
 
         self.is_running = True
-        clock_speed = int(clock_speed)
-        threading.Thread(target=self.simulate_task, args=(task_name, clock_speed), daemon=True).start()
+        self.run_btn.config(state=tk.DISABLED)
+        trace = self.trace if self.trace is not None else synthetic_trace(seconds, period, seed)
+        threading.Thread(target=self.simulate_task, args=(task_name, trace, period, freqs, volts, params),
+                         daemon=True).start()
 
-    def simulate_task(self, task_name, clock_speed):
-        self.log(f"Starting CPU Task '{task_name}' at {clock_speed} MHz")
+    def simulate_task(self, task_name, trace, period, freqs, volts, params):
+        # Runs off the Tk thread; every update goes back through self.events.
+        try:
+            self.events.put(("log", f"Starting CPU Task '{task_name}': {len(trace):,} samples of "
+                                    f"{period * 1e3:g} ms, mean demand {100 * trace.mean():.1f}% of "
+                                    f"{freqs[-1] * 1e-6:g} MHz"))
+            results = []
+            for governor in GOVERNORS:
+                started = time.perf_counter()
+                result = simulate_governor(trace, period, freqs, volts, governor, **params)
+                results.append(result)
+                self.events.put(("log", f"  {governor:<13} done in {time.perf_counter() - started:.2f} s"))
+        except Exception as e:
+            self.events.put(("error", str(e)))
+            return
+        self.events.put(("done", (task_name, trace, period, results)))
 
-        # Simulated execution time inversely proportional to clock speed
-        base_cycles = 1_000_000
-        exec_time = base_cycles / (clock_speed * 1_000_000)  # seconds
+    def poll_events(self):
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == "log":
+                    self.log(payload)
+                    continue
+                if kind == "telemetry_error":
+                    messagebox.showerror("Error", f"Telemetry stopped: {payload}")
+                    if self.sampler is not None:
+                        self.toggle_telemetry()
+                    continue
+                if kind == "done":
+                    self.show_results(*payload)
+                elif kind == "error":
+                    messagebox.showerror("Error", payload)
+                self.is_running = False
+                self.run_btn.config(state=tk.NORMAL)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self.poll_events)
 
-        for i in range(5):
-            self.log(f"Running... ({i+1}/5)")
-            time.sleep(exec_time)  # simulate processing
+    def show_results(self, task_name, trace, period, results):
+        best = min(results, key=lambda r: r["edp"])
+        self.log(f"Task '{task_name}' completed; lowest energy-delay product: {best['governor']}")
 
-        self.log(f"Task '{task_name}' completed in ~{exec_time*5:.6f} seconds")
-        self.is_running = False
+        window = tk.Toplevel(self.root)
+        window.title(f"Governor Comparison - {task_name}")
+        table = tk.Text(window, height=len(results) + 1, width=90, font=("Courier", 9))
+        table.insert(tk.END, f"{'Governor':<14}{'Time (s)':>10}{'Energy (J)':>12}{'EDP (J*s)':>12}{'Avg W':>8}"
+                             f"{'Avg MHz':>9}{'Switches':>10}{'Max Lag (ms)':>14}")
+        for r in results:
+            table.insert(tk.END, f"\n{r['governor']:<14}{r['completion']:>10.3f}{r['energy']:>12.2f}"
+                                 f"{r['edp']:>12.2f}{r['power']:>8.2f}{r['mean_mhz']:>9.0f}"
+                                 f"{r['transitions']:>10,}{r['max_lag'] * 1e3:>14.1f}")
+        table.config(state="disabled")
+        table.pack(padx=10, pady=5)
+        fig, (ax_demand, ax_freq) = plt.subplots(2, 1, figsize=(9, 6), sharex=True)
+        times = np.arange(len(trace)) * period
+        ax_demand.plot(times, 100 * trace, color="gray", linewidth=0.8)
+        ax_demand.set_ylabel("Demand (% of max)")
+        for r in results:
+            ax_freq.step(np.arange(len(r["frequency"])) * period, r["frequency"], where="post",
+                         linewidth=0.9, label=r["governor"])
+        ax_freq.set_xlabel("Time (s)")
+        ax_freq.set_ylabel("Frequency (MHz)")
+        ax_freq.legend(fontsize=8)
+        fig.tight_layout()
+        canvas = FigureCanvasTkAgg(fig, master=window)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True)
 
     def log(self, message):
-        self.log_box.config(state="normal")
-        self.log_box.insert(tk.END, message + "\n")
-        self.log_box.see(tk.END)
-        self.log_box.config(state="disabled")
+        self.status.config(text=message)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,146 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
+import bisect
+import heapq
+import time
+
+ENGINES = ["Indexed (O(log B))", "Linear Scan"]
+DISPLAY_LIMIT = 1000  # rows written to the results box per section
+
+
+# ---------------- Indexed Allocation Engine ---------------- #
+
+class MaxSegmentTree:
+    """Max segment tree over block capacities for leftmost-fit queries."""
+
+    def __init__(self, values):
+        self.size = 1
+        while self.size < len(values):
+            self.size *= 2
+        self.tree = [float("-inf")] * (2 * self.size)
+        self.tree[self.size:self.size + len(values)] = values
+        for i in range(self.size - 1, 0, -1):
+            self.tree[i] = max(self.tree[2 * i], self.tree[2 * i + 1])
+
+    def update(self, index, value):
+        tree = self.tree
+        i = index + self.size
+        tree[i] = value
+        i //= 2
+        while i:
+            new = max(tree[2 * i], tree[2 * i + 1])
+            if tree[i] == new:
+                break  # ancestors above are unchanged too
+            tree[i] = new
+            i //= 2
+
+    def leftmost_at_least(self, value):
+        """Index of the first leaf >= value, or -1."""
+        tree = self.tree
+        if tree[1] < value:
+            return -1
+        i = 1
+        while i < self.size:
+            i = 2 * i if tree[2 * i] >= value else 2 * i + 1
+        return i - self.size
+
+
+class SortedMultiset:
+    """Sorted list split into short buckets so inserts and deletes only
+    shift one bucket; lookups bisect the bucket maxima, then one bucket."""
+
+    BUCKET = 512
+
+    def __init__(self, items):
+        items = sorted(items)
+        self.buckets = [items[i:i + self.BUCKET] for i in range(0, len(items), self.BUCKET)]
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+
+    def pop_at_least(self, key):
+        """Remove and return the smallest item >= key, or None."""
+        b = bisect.bisect_left(self.maxes, key)
+        if b == len(self.buckets):
+            return None
+        bucket = self.buckets[b]
+        item = bucket.pop(bisect.bisect_left(bucket, key))
+        if bucket:
+            self.maxes[b] = bucket[-1]
+        else:
+            del self.buckets[b]
+            del self.maxes[b]
+        return item
+
+    def add(self, item):
+        b = bisect.bisect_left(self.maxes, item)
+        if b == len(self.buckets):
+            if not self.buckets or len(self.buckets[-1]) >= self.BUCKET:
+                self.buckets.append([item])
+                self.maxes.append(item)
+                return
+            b -= 1
+        bucket = self.buckets[b]
+        bisect.insort(bucket, item)
+        self.maxes[b] = bucket[-1]
+        if len(bucket) > 2 * self.BUCKET:
+            self.buckets[b:b + 1] = [bucket[:self.BUCKET], bucket[self.BUCKET:]]
+            self.maxes[b:b + 1] = [bucket[self.BUCKET - 1], bucket[-1]]
+
+
+class IndexedAllocator:
+    """First/Best/Worst Fit in O(log B) per request.
+
+    Each method takes and updates `blocks` exactly like the linear-scan
+    versions on AllocationSimulator and returns the same allocation list,
+    including tie-breaking towards the lowest block index.
+    """
+
+    def first_fit(self, blocks, processes):
+        allocation = [-1] * len(processes)
+        if not blocks:
+            return allocation
+        tree = MaxSegmentTree(blocks)
+
+        for i, size in enumerate(processes):
+            j = tree.leftmost_at_least(size)
+            if j != -1:
+                allocation[i] = j
+                blocks[j] -= size
+                tree.update(j, blocks[j])
+        return allocation
+
+    def best_fit(self, blocks, processes):
+        # Sorted (remaining, index) pairs; the first pair >= (size, -1) is the
+        # smallest block that fits, lowest index first among equal sizes.
+        allocation = [-1] * len(processes)
+        free = SortedMultiset((remaining, j) for j, remaining in enumerate(blocks))
+
+        for i, size in enumerate(processes):
+            found = free.pop_at_least((size, -1))
+            if found is None:
+                continue
+            remaining, j = found
+            allocation[i] = j
+            blocks[j] = remaining - size
+            free.add((blocks[j], j))
+        return allocation
+
+    def worst_fit(self, blocks, processes):
+        # Max-heap of (-remaining, index); entries whose size no longer matches
+        # the block are stale and dropped when they reach the top.
+        allocation = [-1] * len(processes)
+        heap = [(-remaining, j) for j, remaining in enumerate(blocks)]
+        heapq.heapify(heap)
+
+        for i, size in enumerate(processes):
+            while heap and -heap[0][0] != blocks[heap[0][1]]:
+                heapq.heappop(heap)
+            if not heap or -heap[0][0] < size:
+                continue
+            _, j = heapq.heappop(heap)
+            allocation[i] = j
+            blocks[j] -= size
+            heapq.heappush(heap, (-blocks[j], j))
+        return allocation
 
 
 class AllocationSimulator:
@@ -36,6 +177,17 @@ class AllocationSimulator:
         self.algorithm.current(0)
         self.algorithm.pack(pady=5)
 
+        # Engine Selection
+        tk.Label(self.root, text="Select Engine:").pack(pady=5)
+
+        self.engine = ttk.Combobox(
+            self.root,
+            state="readonly",
+            values=ENGINES
+        )
+        self.engine.current(0)
+        self.engine.pack(pady=5)
+
         # Allocate Button
         allocate_btn = tk.Button(self.root, text="Run Allocation",
                                  command=self.run_allocation)
@@ -107,21 +259,29 @@ class AllocationSimulator:
 
         original_blocks = blocks.copy()
         selected_algo = self.algorithm.get()
+        engine = IndexedAllocator() if self.engine.get() == ENGINES[0] else self
 
+        start = time.perf_counter()
         if selected_algo == "First Fit":
-            allocation = self.first_fit(blocks, processes)
+            allocation = engine.first_fit(blocks, processes)
         elif selected_algo == "Best Fit":
-            allocation = self.best_fit(blocks, processes)
+            allocation = engine.best_fit(blocks, processes)
         else:
-            allocation = self.worst_fit(blocks, processes)
+            allocation = engine.worst_fit(blocks, processes)
+        elapsed = time.perf_counter() - start
 
         self.display_results(processes, allocation, original_blocks, blocks)
+        self.result_text.insert(
+            tk.END,
+            f"\n{len(processes)} requests over {len(blocks)} blocks "
+            f"in {elapsed * 1000:.2f} ms ({self.engine.get()})\n"
+        )
 
     def display_results(self, processes, allocation, original_blocks, remaining_blocks):
         self.result_text.insert(tk.END, "ALLOCATION RESULTS\n")
         self.result_text.insert(tk.END, "-" * 50 + "\n\n")
 
-        for i in range(len(processes)):
+        for i in range(min(len(processes), DISPLAY_LIMIT)):
             if allocation[i] != -1:
                 self.result_text.insert(
                     tk.END,
@@ -135,9 +295,17 @@ class AllocationSimulator:
                     f"-> Not Allocated\n"
                 )
 
+        if len(processes) > DISPLAY_LIMIT:
+            allocated = sum(1 for a in allocation if a != -1)
+            self.result_text.insert(
+                tk.END,
+                f"... {len(processes) - DISPLAY_LIMIT} more "
+                f"({allocated} of {len(processes)} allocated in total)\n"
+            )
+
         self.result_text.insert(tk.END, "\nRemaining Memory in Blocks:\n")
 
-        for i in range(len(remaining_blocks)):
+        for i in range(min(len(remaining_blocks), DISPLAY_LIMIT)):
             self.result_text.insert(
                 tk.END,
                 f"Block {i + 1}: {remaining_blocks[i]} remaining "
@@ -1,25 +1,561 @@
 import tkinter as tk
-from tkinter import messagebox
-from queue import PriorityQueue
+from tkinter import messagebox, ttk, filedialog
+from array import array
+from collections import deque
+from itertools import chain
+import heapq
+import queue
+import threading
 import time
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+SERVICE_DISTRIBUTIONS = ["Fixed", "Exponential", "Lognormal", "Uniform"]
+LOGNORMAL_SIGMA = 0.5
+SAMPLE_BATCH = 4096  # random draws generated per NumPy call
+PERCENTILES = [50, 99, 99.9]
+POLL_MS = 100
+COALESCING_POLICIES = ["Per-Packet", "Count", "Time", "Adaptive", "NAPI"]
+RING_SIZE = 1024  # NIC receive descriptors
+ADAPTIVE_LOW_RATE = 20e3  # packets/s below which the adaptive policy interrupts per packet
+ADAPTIVE_HIGH_RATE = 500e3  # packets/s at which it reaches its widest window
+ADAPTIVE_MAX_US = 100.0
+ADAPTIVE_EWMA = 1 / 64  # weight of each new inter-arrival gap in the rate estimate
+
+BALANCING_POLICIES = ["Static", "Round-Robin", "Least-Loaded", "irqbalance"]
+INF = float("inf")
+SOFTIRQ_LEVEL = 1e9  # softirq work ranks below every hard IRQ priority but above the task
+
+# Event kinds on the calendar
+ARRIVAL, COMPLETE, MASK, UNMASK, REBALANCE = range(5)
 
 class Interrupt:
-    def __init__(self, name, priority):
+    def __init__(self, name, priority, rate=1000.0, service_dist="Exponential", service_us=5.0,
+                 deadline_us=100.0, maskable=True, trace=None, softirq_us=0.0, affinity=None):
         self.name = name
         self.priority = priority  # Lower number = higher priority
+        self.rate = rate  # Poisson arrivals per second, unless a trace is given
+        self.service_dist = service_dist
+        self.service_us = service_us  # mean ISR service time
+        self.deadline_us = deadline_us  # arrival -> ISR (and softirq) completion
+        self.maskable = maskable
+        self.trace = trace  # sorted arrival times in seconds
+        self.softirq_us = softirq_us  # mean bottom-half work queued by each ISR; 0 for none
+        self.affinity = affinity  # cores the line may be steered to; None for all
 
     def __lt__(self, other):
         return self.priority < other.priority
 
+
+def draws(sample, rng):
+    """Endless iterator of floats from `sample(rng, n)`, generated in batches."""
+    def batches():
+        while True:
+            yield sample(rng, SAMPLE_BATCH).tolist()
+    return chain.from_iterable(batches())
+
+
+def service_sampler(dist, mean):
+    if dist == "Fixed":
+        return lambda rng, n: np.full(n, mean)
+    if dist == "Exponential":
+        return lambda rng, n: rng.exponential(mean, n)
+    if dist == "Lognormal":
+        # Parameterised so the mean, not the median, equals `mean`.
+        mu = np.log(mean) - LOGNORMAL_SIGMA ** 2 / 2
+        return lambda rng, n: rng.lognormal(mu, LOGNORMAL_SIGMA, n)
+    if dist == "Uniform":
+        return lambda rng, n: rng.uniform(0.5 * mean, 1.5 * mean, n)
+    raise ValueError(f"Unknown service distribution: {dist}")
+
+
+def arrival_times(irq, rng):
+    """Absolute arrival times in seconds: the trace if one is loaded, else Poisson."""
+    if irq.trace is not None:
+        return iter(irq.trace)
+    if irq.rate <= 0:
+        return iter(())
+    def batches():
+        now = 0.0
+        while True:
+            times = now + np.cumsum(rng.exponential(1 / irq.rate, SAMPLE_BATCH))
+            now = times[-1]
+            yield times.tolist()
+    return chain.from_iterable(batches())
+
+
+def read_arrival_trace(path):
+    """Parse `<irq name> <time in us>` lines into {name: sorted times in seconds}."""
+    traces = {}
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            fields = line.replace(",", " ").split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            try:
+                traces.setdefault(fields[0], []).append(float(fields[1]) * 1e-6)
+            except (ValueError, IndexError):
+                raise ValueError(f"{path}:{line_no}: expected '<irq name> <time in us>'")
+    return {name: sorted(times) for name, times in traces.items()}
+
+
+def percentiles(values):
+    values = np.frombuffer(values, dtype=float) if len(values) else np.zeros(1)
+    return np.percentile(values, PERCENTILES), float(values.max())
+
+
+def parse_cpulist(text):
+    """Parse an affinity list like "0-3,6" into sorted core numbers; blank means None (all cores)."""
+    if not text.strip():
+        return None
+    cores = set()
+    for part in text.split(","):
+        low, _, high = part.strip().partition("-")
+        cores.update(range(int(low), int(high or low) + 1))
+    return sorted(cores)
+
+
+def simulate(irqs, duration, overhead_us=1.0, mask_period_us=0.0, mask_length_us=0.0, seed=None,
+             cores=1, balancing="Static", migration_us=0.0, rebalance_ms=10.0):
+    """Run `cores` CPUs for `duration` virtual seconds against the IRQ lines in `irqs`.
+
+    The calendar is a heapq of (time, seq, kind, arg) events. Each arrival is
+    steered to one core in its line's affinity mask by `balancing`:
+      Static       the lowest core in the mask
+      Round-Robin  the next core in the mask, interrupt by interrupt
+      Least-Loaded the core with the fewest unfinished requests
+      irqbalance   a per-line target, reassigned every `rebalance_ms` by
+                   placing lines heaviest-first on the least-loaded core
+    On its core, an arrival whose line outranks the running handler preempts
+    it (the preempted handler waits on that core's nesting stack); otherwise
+    the request waits in one of the core's two pending heaps, maskable and
+    non-maskable, ordered by priority then arrival; while masked only the
+    non-maskable heap is served. A line with softirq work queues it on the core's softirq
+    backlog when its hard ISR finishes; backlog work runs whenever no hard
+    ISR is due and is preempted by any of them.
+
+    Every `mask_period_us`, measured from the start of one masked window to
+    the start of the next, the tasks disable interrupts for `mask_length_us`,
+    holding maskable lines pending. ISR entry/exit costs `overhead_us`. A hard
+    ISR that runs on a different core from its line's previous one pays
+    `migration_us` of cache misses. A preempted handler's completion event
+    stays in the calendar and is skipped because its seq no longer matches
+    the core's outstanding completion.
+    """
+    rng = np.random.default_rng(seed)
+    overhead = overhead_us * 1e-6
+    migration = migration_us * 1e-6
+    lines = range(len(irqs))
+    priority = [irq.priority for irq in irqs]
+    maskable = [irq.maskable for irq in irqs]
+    deadline = [irq.deadline_us * 1e-6 for irq in irqs]
+    services = [draws(service_sampler(irq.service_dist, irq.service_us * 1e-6), rng) for irq in irqs]
+    softirqs = [draws(service_sampler(irq.service_dist, irq.softirq_us * 1e-6), rng) if irq.softirq_us > 0
+                else None for irq in irqs]
+    arrivals = [arrival_times(irq, rng) for irq in irqs]
+    allowed = [[core for core in (irq.affinity or range(cores)) if core < cores] or list(range(cores))
+               for irq in irqs]
+    latency = [array("d") for _ in irqs]
+    response = [array("d") for _ in irqs]
+    missed = [0] * len(irqs)
+    migrations = [0] * len(irqs)
+    policy = BALANCING_POLICIES.index(balancing)
+    static, round_robin, least_loaded, irqbalance = range(len(BALANCING_POLICIES))
+    target = [allowed[line][0] if policy == static else allowed[line][line % len(allowed[line])]
+              for line in lines]
+    turn = [0] * len(irqs)  # round-robin position per line
+    last_core = [None] * len(irqs)
+    line_busy = [0.0] * len(irqs)  # CPU time per line since the last rebalance
+
+    calendar = []
+    seq = 0
+    for line, times in enumerate(arrivals):
+        t = next(times, None)
+        if t is not None and t < duration:
+            calendar.append((t, seq, ARRIVAL, line))
+            seq += 1
+    if mask_period_us > 0 and mask_length_us > 0:
+        calendar.append((mask_period_us * 1e-6, seq, MASK, None))
+        seq += 1
+    if policy == irqbalance:
+        calendar.append((rebalance_ms * 1e-3, seq, REBALANCE, None))
+        seq += 1
+    heapq.heapify(calendar)
+
+    # Per-core state. Handler records are [line, arrival, remaining, is_hard].
+    pending = [[] for _ in range(cores)]  # maskable requests: (priority, arrival time, seq, line)
+    urgent = [[] for _ in range(cores)]  # non-maskable requests, same layout
+    stack = [[] for _ in range(cores)]  # preempted handlers
+    backlog = [deque() for _ in range(cores)]  # softirq work: (line, arrival)
+    running = [None] * cores
+    level = [INF] * cores  # priority of the running handler; arrivals must beat it to preempt
+    resumed = [0.0] * cores  # when the running handler last got the core
+    completion = [-1] * cores  # seq of the running handler's COMPLETE event
+    load = [0] * cores  # unfinished requests steered to each core
+    hard_busy = [0.0] * cores
+    soft_busy = [0.0] * cores
+    masked = False
+    max_depth = 0
+    events = 0
+    heappush, heappop, heapreplace = heapq.heappush, heapq.heappop, heapq.heapreplace
+
+    def charge(core, t):
+        # Account the running handler's time on `core` up to t.
+        record = running[core]
+        spent = t - resumed[core]
+        line_busy[record[0]] += spent
+        if record[3]:
+            hard_busy[core] += spent
+        else:
+            soft_busy[core] += spent
+        record[2] -= spent
+
+    def best_pending(core):
+        # The heap holding the highest-priority request allowed to run now, or None.
+        waiting, nmi = pending[core], urgent[core]
+        if waiting and not masked and (not nmi or waiting[0] < nmi[0]):
+            return waiting
+        return nmi or None
+
+    def start_hard(core, line, arrived, t):
+        nonlocal max_depth
+        latency[line].append(t - arrived + overhead)
+        service = overhead + next(services[line])
+        if last_core[line] != core:
+            if last_core[line] is not None:
+                migrations[line] += 1
+                service += migration
+            last_core[line] = core
+        running[core] = [line, arrived, service, True]
+        level[core] = priority[line]
+        if len(stack[core]) >= max_depth:
+            max_depth = len(stack[core]) + 1
+
+    def dispatch(core, t):
+        # The core is free: take the best pending hard ISR if it outranks the
+        # interrupted handler, else resume that handler, else drain softirqs.
+        nonlocal seq
+        heap = best_pending(core)
+        interrupted = stack[core]
+        if heap is not None and (not interrupted or heap[0][0] < (
+                priority[interrupted[-1][0]] if interrupted[-1][3] else SOFTIRQ_LEVEL)):
+            _, arrived, _, line = heappop(heap)
+            start_hard(core, line, arrived, t)
+        elif interrupted:
+            running[core] = record = interrupted.pop()
+            level[core] = priority[record[0]] if record[3] else SOFTIRQ_LEVEL
+        elif backlog[core]:
+            line, arrived = backlog[core].popleft()
+            running[core] = [line, arrived, next(softirqs[line]), False]
+            level[core] = SOFTIRQ_LEVEL
+        else:
+            return
+        resumed[core] = t
+        completion[core] = seq
+        heappush(calendar, (t + running[core][2], seq, COMPLETE, core))
+        seq += 1
+
+    while calendar:
+        t, event_seq, kind, arg = calendar[0]
+        if t >= duration:
+            break
+        events += 1
+
+        if kind == ARRIVAL:
+            line = arg
+            nxt = next(arrivals[line], INF)
+            if nxt < duration:
+                heapreplace(calendar, (nxt, seq, ARRIVAL, line))
+                seq += 1
+            else:
+                heappop(calendar)
+            if policy == round_robin:
+                cores_ok = allowed[line]
+                core = cores_ok[turn[line] % len(cores_ok)]
+                turn[line] += 1
+            elif policy == least_loaded:
+                core = min(allowed[line], key=load.__getitem__)
+            else:
+                core = target[line]
+            load[core] += 1
+            if priority[line] >= level[core] or (masked and maskable[line]):
+                heappush((pending if maskable[line] else urgent)[core], (priority[line], t, seq, line))
+                seq += 1
+                continue
+            if running[core] is not None:
+                charge(core, t)
+                stack[core].append(running[core])
+                start_hard(core, line, t, t)
+            else:
+                # Common case, inlined: an idle core takes the interrupt at once.
+                latency[line].append(overhead)
+                service = overhead + next(services[line])
+                if last_core[line] != core:
+                    if last_core[line] is not None:
+                        migrations[line] += 1
+                        service += migration
+                    last_core[line] = core
+                running[core] = [line, t, service, True]
+                level[core] = priority[line]
+                if not max_depth:
+                    max_depth = 1
+            resumed[core] = t
+            completion[core] = seq
+            heappush(calendar, (t + running[core][2], seq, COMPLETE, core))
+            seq += 1
+            continue
+
+        heappop(calendar)
+        if kind == COMPLETE:
+            core = arg
+            if event_seq != completion[core]:
+                continue
+            line, arrived, _, hard = running[core]
+            spent = t - resumed[core]
+            line_busy[line] += spent
+            running[core] = None
+            level[core] = INF
+            if hard:
+                hard_busy[core] += spent
+                if softirqs[line] is not None:
+                    backlog[core].append((line, arrived))
+                    dispatch(core, t)
+                    continue
+            else:
+                soft_busy[core] += spent
+            load[core] -= 1
+            elapsed = t - arrived
+            response[line].append(elapsed)
+            if elapsed > deadline[line]:
+                missed[line] += 1
+            if pending[core] or urgent[core] or stack[core] or backlog[core]:
+                dispatch(core, t)
+        elif kind == MASK:
+            heappush(calendar, (t + mask_length_us * 1e-6, seq, UNMASK, None))
+            heappush(calendar, (t + mask_period_us * 1e-6, seq + 1, MASK, None))
+            seq += 2
+            masked = True
+        elif kind == UNMASK:
+            masked = False
+            for core in range(cores):
+                # Unmasked requests may outrank what ran during the window.
+                heap = best_pending(core)
+                if heap is None or heap[0][0] >= level[core]:
+                    continue
+                if running[core] is not None:
+                    charge(core, t)
+                    stack[core].append(running[core])
+                    running[core] = None
+                dispatch(core, t)
+        else:
+            # irqbalance: heaviest lines first, each onto its least-loaded allowed core.
+            assigned = [0.0] * cores
+            for line in sorted(lines, key=line_busy.__getitem__, reverse=True):
+                core = min(allowed[line], key=assigned.__getitem__)
+                target[line] = core
+                assigned[core] += line_busy[line]
+                line_busy[line] = 0.0
+            heappush(calendar, (t + rebalance_ms * 1e-3, seq, REBALANCE, None))
+            seq += 1
+
+    for core in range(cores):
+        if running[core] is not None:
+            charge(core, duration)
+    return {
+        "irqs": irqs,
+        "duration": duration,
+        "events": events,
+        "busy": sum(hard_busy) + sum(soft_busy),
+        "hard_busy": hard_busy,
+        "soft_busy": soft_busy,
+        "max_depth": max_depth,
+        "latency": latency,
+        "response": response,
+        "missed": missed,
+        "migrations": migrations,
+        "migration_time": sum(migrations) * migration,
+        "unserved": sum(load),
+    }
+
+
+def adaptive_thresholds(rate):
+    """(frames, usecs) for the adaptive policy at an estimated `rate` in packets/s.
+
+    Below ADAPTIVE_LOW_RATE every packet interrupts; from there the time
+    threshold ramps linearly to ADAPTIVE_MAX_US at ADAPTIVE_HIGH_RATE, and the
+    frame threshold is what that window holds at the current rate."""
+    ramp = min(1.0, max(0.0, (rate - ADAPTIVE_LOW_RATE) / (ADAPTIVE_HIGH_RATE - ADAPTIVE_LOW_RATE)))
+    usecs = ADAPTIVE_MAX_US * ramp
+    return max(1, int(rate * usecs * 1e-6)), usecs
+
+
+def simulate_coalescing(rate, policy, duration, per_packet_us=1.0, overhead_us=2.0, count=16, time_us=50.0,
+                        budget=64, poll_overhead_us=0.5, ring_size=RING_SIZE, seed=None):
+    """One CPU receiving Poisson packets at `rate` per second through a NIC ring.
+
+    Policies decide when the NIC interrupts: per packet, once `count` packets
+    are waiting, `time_us` after the first waiting packet, or adaptively
+    (count and time thresholds scaled to the estimated rate). Every interrupt
+    costs `overhead_us` of hard-IRQ time, preempting packet processing if it
+    is underway, and leads to a batch that processes everything in the ring at
+    `per_packet_us` each. Under NAPI the hard IRQ instead masks itself and
+    schedules polling: each poll round costs `poll_overhead_us` and processes
+    up to `budget` packets; a round that fills its budget polls again,
+    otherwise the IRQ is re-enabled. Packets arriving to a full ring are
+    dropped.
+
+    There are only three event sources (next arrival, coalescing timer, CPU
+    finishing its current work item), so the calendar is their minimum
+    rather than a heap.
+    """
+    rng = np.random.default_rng(seed)
+    arrivals = arrival_times(Interrupt("nic", 1, rate), rng)
+    per_packet = per_packet_us * 1e-6
+    overhead = overhead_us * 1e-6
+    poll_overhead = poll_overhead_us * 1e-6
+    napi = policy == "NAPI"
+
+    ring = deque()
+    batch = deque()  # arrival times of packets taken off the ring, in processing order
+    cursor = 0.0  # when the packet at the head of `batch` starts processing
+    latency = array("d")
+    next_arrival = next(arrivals, INF)
+    timer = INF
+    finish = INF
+    work = None  # "irq", "batch" or "poll" while the CPU is busy
+    signaled = 0  # packets since the NIC last interrupted
+    irq_pending = False  # ring has packets an interrupt asked to be processed
+    irq_enabled = True  # NAPI masks the IRQ while polling
+    polled = 0
+    offered = drops = interrupts = polls = 0
+    busy = 0.0
+    gap = 1 / rate if rate > 0 else INF  # adaptive policy's EWMA inter-arrival time
+    last_arrival = 0.0
+    frames, usecs = count, time_us
+
+    while True:
+        t = min(next_arrival, timer, finish)
+        if t >= duration:
+            break
+
+        if t == finish:
+            while batch:
+                cursor += per_packet
+                latency.append(cursor - batch.popleft())
+            if work == "irq" and not napi or irq_pending:
+                # Process what the interrupt(s) found, plus anything since.
+                irq_pending = False
+                work = "batch"
+                cost = 0.0
+                take = len(ring)
+            elif work == "irq" or (work == "poll" and polled == budget):
+                work = "poll"
+                cost = poll_overhead
+                take = polled = min(budget, len(ring))
+                polls += 1
+            elif work == "poll" and ring:
+                # Packets landed during the last round, so the NIC asserts as it is unmasked.
+                interrupts += 1
+                work = "irq"
+                busy += overhead
+                finish = t + overhead
+                continue
+            else:
+                irq_enabled = True
+                work = None
+                finish = INF
+                continue
+            for _ in range(take):
+                batch.append(ring.popleft())
+            cursor = t + cost
+            finish = cursor + take * per_packet
+            busy += finish - t
+            continue
+
+        if t == timer:
+            fire = True
+            timer = INF
+        else:
+            next_arrival = next(arrivals, INF)
+            offered += 1
+            if len(ring) >= ring_size:
+                drops += 1
+                continue
+            ring.append(t)
+            signaled += 1
+            if napi:
+                fire = irq_enabled
+                irq_enabled = False
+            elif policy == "Per-Packet":
+                fire = True
+            else:
+                if policy == "Adaptive":
+                    gap += ADAPTIVE_EWMA * ((t - last_arrival) - gap)
+                    last_arrival = t
+                    frames, usecs = adaptive_thresholds(1 / gap if gap > 0 else INF)
+                fire = policy in ("Count", "Adaptive") and signaled >= frames
+                if not fire and policy != "Count" and timer == INF:
+                    timer = t + usecs * 1e-6
+        if not fire:
+            continue
+
+        # The NIC raises its interrupt; the hard IRQ runs now, preempting any batch.
+        signaled = 0
+        timer = INF
+        interrupts += 1
+        busy += overhead
+        if work is None:
+            work = "irq"
+            finish = t + overhead
+            continue
+        irq_pending = not napi
+        while batch and cursor + per_packet <= t:
+            cursor += per_packet
+            latency.append(cursor - batch.popleft())
+        cursor += overhead  # the packet in progress (or the batch's start) slips
+        finish += overhead
+
+    if finish < INF:
+        busy -= max(0.0, finish - duration)
+    return {
+        "rate": rate,
+        "policy": policy,
+        "offered": offered,
+        "delivered": len(latency),
+        "drops": drops,
+        "interrupts": interrupts,
+        "polls": polls,
+        "busy": busy / duration,
+        "latency": latency,
+    }
+
+
+def sweep_coalescing(rates, duration, progress=None, **params):
+    """simulate_coalescing for every policy at every rate: {policy: [result, ...]}."""
+    results = {policy: [] for policy in COALESCING_POLICIES}
+    done = 0
+    for policy in COALESCING_POLICIES:
+        for rate in rates:
+            results[policy].append(simulate_coalescing(rate, policy, duration, **params))
+            done += 1
+            if progress:
+                progress(done)
+    return results
+
+
 class InterruptSimulator:
     def __init__(self, root):
         self.root = root
         self.root.title("Interrupt Handling Simulator")
-        self.root.geometry("700x500")
-        
-        self.interrupt_queue = PriorityQueue()
+        self.root.geometry("900x1040")
+
+        self.interrupts = []
+        self.traces = {}
+        self.events = queue.Queue()
         self.create_widgets()
         self.task_running = False
+        self.root.after(POLL_MS, self.poll_events)
 
     def create_widgets(self):
         title = tk.Label(self.root, text="Interrupt Handling Simulator", font=("Arial", 16, "bold"))
@@ -29,25 +565,119 @@ class InterruptSimulator:
         instruction.pack(pady=5)
 
         # CPU Task Input
-        tk.Label(self.root, text="CPU Task Name:").pack()
-        self.task_entry = tk.Entry(self.root)
-        self.task_entry.pack(pady=5)
+        task_frame = tk.Frame(self.root)
+        task_frame.pack(pady=5)
+        tk.Label(task_frame, text="CPU Task Name:").grid(row=0, column=0, sticky="w")
+        self.task_entry = tk.Entry(task_frame)
+        self.task_entry.grid(row=0, column=1, sticky="w")
+        tk.Label(task_frame, text="Virtual Duration (ms):").grid(row=0, column=2, sticky="w", padx=(15, 0))
+        self.duration_entry = tk.Entry(task_frame, width=10)
+        self.duration_entry.insert(0, "1000")
+        self.duration_entry.grid(row=0, column=3, sticky="w")
+        tk.Label(task_frame, text="ISR Entry/Exit Overhead (us):").grid(row=1, column=0, sticky="w")
+        self.overhead_entry = tk.Entry(task_frame, width=10)
+        self.overhead_entry.insert(0, "1")
+        self.overhead_entry.grid(row=1, column=1, sticky="w")
+        tk.Label(task_frame, text="Seed:").grid(row=1, column=2, sticky="w", padx=(15, 0))
+        self.seed_entry = tk.Entry(task_frame, width=10)
+        self.seed_entry.insert(0, "1")
+        self.seed_entry.grid(row=1, column=3, sticky="w")
+        tk.Label(task_frame, text="Masked Every / For (us):").grid(row=2, column=0, sticky="w")
+        self.mask_entry = tk.Entry(task_frame, width=10)
+        self.mask_entry.insert(0, "0, 0")
+        self.mask_entry.grid(row=2, column=1, sticky="w")
+        tk.Label(task_frame, text="CPU Cores:").grid(row=2, column=2, sticky="w", padx=(15, 0))
+        self.cores_entry = tk.Entry(task_frame, width=10)
+        self.cores_entry.insert(0, "1")
+        self.cores_entry.grid(row=2, column=3, sticky="w")
+        tk.Label(task_frame, text="IRQ Balancing:").grid(row=3, column=0, sticky="w")
+        self.balancing = ttk.Combobox(task_frame, state="readonly", values=BALANCING_POLICIES, width=12)
+        self.balancing.current(0)
+        self.balancing.grid(row=3, column=1, sticky="w")
+        tk.Label(task_frame, text="Migration Penalty (us):").grid(row=3, column=2, sticky="w", padx=(15, 0))
+        self.migration_entry = tk.Entry(task_frame, width=10)
+        self.migration_entry.insert(0, "2")
+        self.migration_entry.grid(row=3, column=3, sticky="w")
+        tk.Label(task_frame, text="Rebalance Period (ms):").grid(row=4, column=0, sticky="w")
+        self.rebalance_entry = tk.Entry(task_frame, width=10)
+        self.rebalance_entry.insert(0, "10")
+        self.rebalance_entry.grid(row=4, column=1, sticky="w")
+
+        irq_frame = tk.LabelFrame(self.root, text="Interrupt Line")
+        irq_frame.pack(padx=10, pady=5)
+        tk.Label(irq_frame, text="Interrupt Name:").grid(row=0, column=0, sticky="w")
+        self.interrupt_entry = tk.Entry(irq_frame)
+        self.interrupt_entry.grid(row=0, column=1, sticky="w")
+
+        tk.Label(irq_frame, text="Interrupt Priority (1-10):").grid(row=0, column=2, sticky="w", padx=(15, 0))
+        self.priority_entry = tk.Entry(irq_frame, width=10)
+        self.priority_entry.grid(row=0, column=3, sticky="w")
+
+        tk.Label(irq_frame, text="Arrival Rate (Hz):").grid(row=1, column=0, sticky="w")
+        self.rate_entry = tk.Entry(irq_frame, width=10)
+        self.rate_entry.insert(0, "10000")
+        self.rate_entry.grid(row=1, column=1, sticky="w")
+        tk.Label(irq_frame, text="Deadline (us):").grid(row=1, column=2, sticky="w", padx=(15, 0))
+        self.deadline_entry = tk.Entry(irq_frame, width=10)
+        self.deadline_entry.insert(0, "100")
+        self.deadline_entry.grid(row=1, column=3, sticky="w")
+
+        tk.Label(irq_frame, text="Service Time:").grid(row=2, column=0, sticky="w")
+        self.service_dist = ttk.Combobox(irq_frame, state="readonly", values=SERVICE_DISTRIBUTIONS, width=12)
+        self.service_dist.current(1)
+        self.service_dist.grid(row=2, column=1, sticky="w")
+        tk.Label(irq_frame, text="Mean Service (us):").grid(row=2, column=2, sticky="w", padx=(15, 0))
+        self.service_entry = tk.Entry(irq_frame, width=10)
+        self.service_entry.insert(0, "5")
+        self.service_entry.grid(row=2, column=3, sticky="w")
+        tk.Label(irq_frame, text="Softirq Work (us):").grid(row=3, column=0, sticky="w")
+        self.softirq_entry = tk.Entry(irq_frame, width=10)
+        self.softirq_entry.insert(0, "0")
+        self.softirq_entry.grid(row=3, column=1, sticky="w")
+        tk.Label(irq_frame, text="Affinity (e.g. 0-3,6):").grid(row=3, column=2, sticky="w", padx=(15, 0))
+        self.affinity_entry = tk.Entry(irq_frame, width=10)
+        self.affinity_entry.grid(row=3, column=3, sticky="w")
+        self.maskable_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(irq_frame, text="Maskable", variable=self.maskable_var).grid(row=4, column=0, sticky="w")
 
-        tk.Label(self.root, text="Interrupt Name:").pack()
-        self.interrupt_entry = tk.Entry(self.root)
-        self.interrupt_entry.pack(pady=5)
+        button_frame = tk.Frame(self.root)
+        button_frame.pack(pady=5)
+        add_btn = tk.Button(button_frame, text="Add Interrupt", command=self.add_interrupt)
+        add_btn.pack(side="left", padx=5)
 
-        tk.Label(self.root, text="Interrupt Priority (1-10):").pack()
-        self.priority_entry = tk.Entry(self.root)
-        self.priority_entry.pack(pady=5)
+        trace_btn = tk.Button(button_frame, text="Load Arrival Trace", command=self.load_trace)
+        trace_btn.pack(side="left", padx=5)
 
-        add_btn = tk.Button(self.root, text="Add Interrupt", command=self.add_interrupt)
-        add_btn.pack(pady=10)
+        clear_btn = tk.Button(button_frame, text="Clear Interrupts", command=self.clear_interrupts)
+        clear_btn.pack(side="left", padx=5)
 
-        run_btn = tk.Button(self.root, text="Run CPU Task", command=self.run_task)
-        run_btn.pack(pady=5)
+        self.run_btn = tk.Button(button_frame, text="Run CPU Task", command=self.run_task)
+        self.run_btn.pack(side="left", padx=5)
 
-        self.log_box = tk.Text(self.root, height=15, width=80, state="disabled")
+        nic_frame = tk.LabelFrame(self.root, text="Interrupt Coalescing Sweep (NIC receive path)")
+        nic_frame.pack(padx=10, pady=5)
+        self.nic_entries = {}
+        fields = [
+            ("rates", "Rates kpps (min, max, points):", "10, 1500, 12"),
+            ("per_packet_us", "Per-Packet Cost (us):", "1"),
+            ("count", "Count Threshold (packets):", "16"),
+            ("time_us", "Time Threshold (us):", "50"),
+            ("budget", "NAPI Budget (packets):", "64"),
+            ("poll_overhead_us", "Poll Round Overhead (us):", "0.5"),
+            ("duration", "Virtual Duration per Point (ms):", "50"),
+        ]
+        for i, (key, label, default) in enumerate(fields):
+            tk.Label(nic_frame, text=label).grid(row=i // 2, column=2 * (i % 2), sticky="w", padx=(5, 0))
+            entry = tk.Entry(nic_frame, width=14)
+            entry.insert(0, default)
+            entry.grid(row=i // 2, column=2 * (i % 2) + 1, sticky="w")
+            self.nic_entries[key] = entry
+        self.sweep_btn = tk.Button(nic_frame, text="Sweep Coalescing", command=self.run_sweep)
+        self.sweep_btn.grid(row=3, column=3, sticky="w", pady=5)
+        self.progress = ttk.Progressbar(nic_frame, length=300)
+        self.progress.grid(row=4, column=0, columnspan=4, pady=5)
+
+        self.log_box = tk.Text(self.root, height=18, width=104, state="disabled", font=("Courier", 9))
         self.log_box.pack(pady=10)
 
     def add_interrupt(self):
@@ -59,9 +689,45 @@ class InterruptSimulator:
             return
 
         priority = int(priority)
-        interrupt = Interrupt(name, priority)
-        self.interrupt_queue.put(interrupt)
-        self.log(f"Interrupt '{name}' with priority {priority} added.")
+        try:
+            rate = float(self.rate_entry.get())
+            service_us = float(self.service_entry.get())
+            deadline_us = float(self.deadline_entry.get())
+            softirq_us = float(self.softirq_entry.get() or 0)
+            affinity = parse_cpulist(self.affinity_entry.get())
+            if rate < 0 or service_us <= 0 or deadline_us <= 0 or softirq_us < 0 or min(affinity or [0]) < 0:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Enter a non-negative rate and softirq time, positive service time "
+                                          "and deadline, and an affinity list like 0-3,6")
+            return
+        interrupt = Interrupt(name, priority, rate, self.service_dist.get(), service_us, deadline_us,
+                              self.maskable_var.get(), self.traces.get(name), softirq_us, affinity)
+        self.interrupts.append(interrupt)
+        source = "trace" if interrupt.trace is not None else f"{rate:g} Hz Poisson"
+        self.log(f"Interrupt '{name}' with priority {priority} added ({source}, "
+                 f"{interrupt.service_dist} {service_us:g} us service, deadline {deadline_us:g} us"
+                 f"{f', {softirq_us:g} us softirq' if softirq_us else ''}"
+                 f"{'' if affinity is None else ', cores ' + self.affinity_entry.get().strip()}"
+                 f"{'' if interrupt.maskable else ', non-maskable'}).")
+
+    def load_trace(self):
+        path = filedialog.askopenfilename(title="Select Arrival Trace (<irq name> <time us> per line)")
+        if not path:
+            return
+        try:
+            self.traces = read_arrival_trace(path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        for interrupt in self.interrupts:
+            interrupt.trace = self.traces.get(interrupt.name, interrupt.trace)
+        self.log(f"Loaded arrival trace for {', '.join(sorted(self.traces))}; "
+                 f"interrupts with these names replay it instead of Poisson arrivals.")
+
+    def clear_interrupts(self):
+        self.interrupts = []
+        self.log("Interrupts cleared.")
 
     def run_task(self):
         if self.task_running:
@@ -72,24 +738,181 @@ class InterruptSimulator:
         if not task_name:
             messagebox.showerror("Error", "Enter CPU Task name")
             return
+        if not self.interrupts:
+            messagebox.showerror("Error", "Add at least one interrupt")
+            return
+        try:
+            duration = float(self.duration_entry.get()) * 1e-3
+            overhead_us = float(self.overhead_entry.get())
+            mask_period_us, mask_length_us = map(float, self.mask_entry.get().split(","))
+            seed = int(self.seed_entry.get()) if self.seed_entry.get().strip() else None
+            cores = int(self.cores_entry.get())
+            migration_us = float(self.migration_entry.get())
+            rebalance_ms = float(self.rebalance_entry.get())
+            if (duration <= 0 or overhead_us < 0 or mask_length_us > mask_period_us or cores < 1
+                    or migration_us < 0 or rebalance_ms <= 0):
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Enter a positive duration, core count and rebalance period, "
+                                          "non-negative overhead and migration penalty, "
+                                          "and a mask window no longer than its period")
+            return
+
+        self.set_running(True)
+        balancing = self.balancing.get()
+        self.log(f"Starting CPU Task: {task_name} ({duration * 1e3:g} ms virtual, "
+                 f"{cores} core{'s' if cores > 1 else ''}, {balancing} balancing)")
+        settings = (list(self.interrupts), duration, overhead_us, mask_period_us, mask_length_us, seed,
+                    cores, balancing, migration_us, rebalance_ms)
+        threading.Thread(target=self.simulation_worker, args=(task_name, settings), daemon=True).start()
+
+    def simulation_worker(self, task_name, settings):
+        # Runs off the Tk thread; results go back through self.events.
+        try:
+            started = time.perf_counter()
+            result = simulate(*settings)
+            result["wall"] = time.perf_counter() - started
+        except Exception as e:
+            self.events.put(("error", str(e)))
+            return
+        self.events.put(("simulated", (task_name, result)))
+
+    def run_sweep(self):
+        if self.task_running:
+            messagebox.showinfo("Info", "A simulation is already running")
+            return
+        try:
+            low, high, points = map(float, self.nic_entries["rates"].get().split(","))
+            params = {key: float(self.nic_entries[key].get())
+                      for key in ("per_packet_us", "time_us", "poll_overhead_us")}
+            params["count"] = int(self.nic_entries["count"].get())
+            params["budget"] = int(self.nic_entries["budget"].get())
+            params["overhead_us"] = float(self.overhead_entry.get())
+            # One seed for every run, so all policies see the same arrivals.
+            params["seed"] = int(self.seed_entry.get()) if self.seed_entry.get().strip() else None
+            duration = float(self.nic_entries["duration"].get()) * 1e-3
+            if not 0 < low <= high or points < 1 or duration <= 0 or params["per_packet_us"] <= 0 \
+                    or params["count"] < 1 or params["budget"] < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Enter 0 < min <= max rates, at least one point, a positive "
+                                          "duration and per-packet cost, and thresholds of at least 1")
+            return
+        rates = np.geomspace(low, high, int(points)) * 1e3
+        self.set_running(True)
+        self.progress.config(maximum=len(rates) * len(COALESCING_POLICIES), value=0)
+        self.log(f"Sweeping {len(rates)} rates from {low:g} to {high:g} kpps across "
+                 f"{', '.join(COALESCING_POLICIES)}")
+        threading.Thread(target=self.sweep_worker, args=(rates, duration, params), daemon=True).start()
+
+    def sweep_worker(self, rates, duration, params):
+        # Runs off the Tk thread; results go back through self.events.
+        try:
+            results = sweep_coalescing(rates, duration, progress=lambda done: self.events.put(("progress", done)),
+                                       **params)
+        except Exception as e:
+            self.events.put(("error", str(e)))
+            return
+        self.events.put(("swept", (rates, duration, results)))
+
+    def set_running(self, running):
+        self.task_running = running
+        for button in (self.run_btn, self.sweep_btn):
+            button.config(state=tk.DISABLED if running else tk.NORMAL)
 
-        self.task_running = True
-        self.log(f"Starting CPU Task: {task_name}")
-        self.root.update()
-        time.sleep(1)
-
-        # Check interrupts
-        while not self.interrupt_queue.empty():
-            interrupt = self.interrupt_queue.get()
-            self.log(f"Interrupt '{interrupt.name}' occurred (Priority {interrupt.priority})")
-            self.root.update()
-            time.sleep(1)
-            self.log(f"Handling Interrupt '{interrupt.name}' completed")
-            self.root.update()
-            time.sleep(0.5)
+    def poll_events(self):
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == "progress":
+                    self.progress.config(value=payload)
+                    continue
+                if kind == "simulated":
+                    self.show_result(*payload)
+                elif kind == "swept":
+                    self.show_sweep(*payload)
+                elif kind == "error":
+                    messagebox.showerror("Error", payload)
+                self.set_running(False)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self.poll_events)
 
+    def show_sweep(self, rates, duration, results):
+        # Per policy and rate: delivered packets/s and p99 added latency in us.
+        throughput = {policy: np.array([r["delivered"] / duration for r in runs]) for policy, runs in results.items()}
+        p99 = {policy: np.array([percentiles(r["latency"])[0][1] * 1e6 for r in runs])
+               for policy, runs in results.items()}
+
+        self.log(f"{'Offered':>10}" + "".join(f"{policy:>18}" for policy in COALESCING_POLICIES)
+                 + "   (delivered kpps / p99 us)")
+        for i, rate in enumerate(rates):
+            self.log(f"{rate / 1e3:>10.0f}" + "".join(
+                f"{throughput[policy][i] / 1e3:>9.0f} /{p99[policy][i]:>7.0f}" for policy in COALESCING_POLICIES))
+        for policy in COALESCING_POLICIES[1:]:
+            # Coalescing pays off from the rate where it starts (and keeps)
+            # delivering more than interrupting per packet.
+            behind = np.flatnonzero(throughput[policy] <= 1.02 * throughput["Per-Packet"])
+            start = behind[-1] + 1 if len(behind) else 0
+            where = f"from {rates[start] / 1e3:.0f} kpps up" if start < len(rates) else "nowhere in this range"
+            self.log(f"{policy} out-delivers per-packet interrupts {where}")
+
+        window = tk.Toplevel(self.root)
+        window.title("Interrupt Coalescing Sweep")
+        fig, (rate_ax, latency_ax, tradeoff_ax) = plt.subplots(1, 3, figsize=(14, 4.2))
+        for policy in COALESCING_POLICIES:
+            rate_ax.plot(rates / 1e3, throughput[policy] / 1e3, marker="o", markersize=3, label=policy)
+            latency_ax.plot(rates / 1e3, p99[policy], marker="o", markersize=3, label=policy)
+            tradeoff_ax.plot(p99[policy], throughput[policy] / 1e3, marker="o", markersize=3, label=policy)
+        rate_ax.plot(rates / 1e3, rates / 1e3, color="gray", linestyle=":", label="Offered")
+        rate_ax.set_xlabel("Offered load (kpps)")
+        rate_ax.set_ylabel("Delivered (kpps)")
+        rate_ax.set_title("Throughput")
+        rate_ax.legend(fontsize=8)
+        latency_ax.set_xlabel("Offered load (kpps)")
+        latency_ax.set_ylabel("p99 added latency (us)")
+        latency_ax.set_yscale("log")
+        latency_ax.set_title("Tail Latency")
+        tradeoff_ax.set_xlabel("p99 added latency (us)")
+        tradeoff_ax.set_ylabel("Delivered (kpps)")
+        tradeoff_ax.set_xscale("log")
+        tradeoff_ax.set_title("Throughput vs Latency")
+        fig.tight_layout()
+        canvas = FigureCanvasTkAgg(fig, master=window)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+
+    def show_result(self, task_name, result):
+        duration = result["duration"]
+        self.log(f"{result['events']:,} events in {result['wall']:.2f} s "
+                 f"({result['events'] / max(result['wall'], 1e-9):,.0f} events/s)")
+        header = (f"{'IRQ':<10}{'Pri':>4}{'Count':>10}"
+                  + "".join(f"{'Lat p' + format(p, 'g'):>10}" for p in PERCENTILES)
+                  + f"{'Lat max':>10}"
+                  + "".join(f"{'Resp p' + format(p, 'g'):>11}" for p in PERCENTILES)
+                  + f"{'Missed':>9}{'Migr':>9}")
+        self.log(header + "   (times in us)")
+        for line, irq in enumerate(result["irqs"]):
+            count = len(result["response"][line])
+            lat, lat_max = percentiles(result["latency"][line])
+            resp, _ = percentiles(result["response"][line])
+            self.log(f"{irq.name:<10}{irq.priority:>4}{count:>10,}"
+                     + "".join(f"{v * 1e6:>10.1f}" for v in lat) + f"{lat_max * 1e6:>10.1f}"
+                     + "".join(f"{v * 1e6:>11.1f}" for v in resp)
+                     + f"{result['missed'][line]:>9,}{result['migrations'][line]:>9,}")
+        capacity = duration * len(result["hard_busy"])
+        self.log(f"CPU time stolen from '{task_name}': {result['busy'] * 1e3:.2f} ms of "
+                 f"{capacity * 1e3:g} ms ({100 * result['busy'] / capacity:.1f}%); "
+                 f"max nesting depth {result['max_depth']}; "
+                 f"{result['unserved']:,} requests unfinished at the end")
+        if len(result["hard_busy"]) > 1 or any(result["soft_busy"]):
+            for core, (hard, soft) in enumerate(zip(result["hard_busy"], result["soft_busy"])):
+                self.log(f"  CPU{core:<3} hardirq {100 * hard / duration:5.1f}%  softirq {100 * soft / duration:5.1f}%  "
+                         f"task {100 * max(0.0, 1 - (hard + soft) / duration):5.1f}%")
+        if any(result["migrations"]):
+            self.log(f"{sum(result['migrations']):,} IRQ migrations cost "
+                     f"{result['migration_time'] * 1e3:.2f} ms of cache refill")
         self.log(f"CPU Task '{task_name}' completed")
-        self.task_running = False
 
     def log(self, message):
         self.log_box.config(state="normal")
@@ -1,14 +1,576 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import messagebox, ttk, filedialog
+import bisect
+import queue
+import random
+import threading
+import time
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+HEAP_POLICIES = ["First Fit", "Next Fit", "Best Fit", "Worst Fit"]
+HEAP_ENGINES = HEAP_POLICIES + ["Buddy", "Slab"]
+ALIGN = 16  # request sizes are rounded up to this many bytes
+SLAB_SIZE = 4096
+SLAB_CLASSES = [16, 32, 64, 96, 128, 192, 256, 512, 1024, 2048]
+SLAB_EMPTY_LIMIT = 2  # empty slabs a cache keeps before returning pages to the buddy
+TIMELINE_POINTS = 2000
+POLL_MS = 100
+
+
+# ---------------- Heap Allocator Engine ---------------- #
+
+class SortedMultiset:
+    """Sorted list split into short buckets so inserts and deletes only
+    shift one bucket; lookups bisect the bucket maxima, then one bucket."""
+
+    BUCKET = 512
+
+    def __init__(self, items=()):
+        items = sorted(items)
+        self.buckets = [items[i:i + self.BUCKET] for i in range(0, len(items), self.BUCKET)]
+        self.maxes = [bucket[-1] for bucket in self.buckets]
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self.buckets)
+
+    def max(self):
+        return self.maxes[-1] if self.maxes else None
+
+    def add(self, item):
+        b = bisect.bisect_left(self.maxes, item)
+        if b == len(self.buckets):
+            if not self.buckets or len(self.buckets[-1]) >= self.BUCKET:
+                self.buckets.append([item])
+                self.maxes.append(item)
+                return
+            b -= 1
+        bucket = self.buckets[b]
+        bisect.insort(bucket, item)
+        self.maxes[b] = bucket[-1]
+        if len(bucket) > 2 * self.BUCKET:
+            self.buckets[b:b + 1] = [bucket[:self.BUCKET], bucket[self.BUCKET:]]
+            self.maxes[b:b + 1] = [bucket[self.BUCKET - 1], bucket[-1]]
+
+    def remove(self, item):
+        b = bisect.bisect_left(self.maxes, item)
+        bucket = self.buckets[b]
+        del bucket[bisect.bisect_left(bucket, item)]
+        if bucket:
+            self.maxes[b] = bucket[-1]
+        else:
+            del self.buckets[b]
+            del self.maxes[b]
+
+    def first_at_least(self, key):
+        """Smallest item >= key, or None."""
+        b = bisect.bisect_left(self.maxes, key)
+        if b == len(self.buckets):
+            return None
+        bucket = self.buckets[b]
+        return bucket[bisect.bisect_left(bucket, key)]
+
+
+class AddressIndex:
+    """Free-block start addresses in address order.
+
+    The arena is cut into fixed address regions, each holding a short sorted
+    list of the free blocks that start inside it. A max segment tree over the
+    regions' largest block lets first and next fit jump straight to the
+    first region that can satisfy a request.
+    """
+
+    REGIONS = 1 << 12
+
+    def __init__(self, sizes, arena_size):
+        self.sizes = sizes  # shared start address -> size map
+        self.shift = max(0, (arena_size - 1).bit_length() - self.REGIONS.bit_length() + 1)
+        count = (arena_size - 1 >> self.shift) + 1
+        self.regions = [[] for _ in range(count)]
+        self.leaves = 1
+        while self.leaves < count:
+            self.leaves *= 2
+        self.tree = [0] * (2 * self.leaves)
+
+    def set_largest(self, region, value):
+        tree = self.tree
+        i = region + self.leaves
+        tree[i] = value
+        while i > 1:
+            sibling = tree[i ^ 1]
+            if sibling > value:
+                value = sibling
+            i >>= 1
+            if tree[i] == value:
+                break  # ancestors above are unchanged too
+            tree[i] = value
+
+    def add(self, addr):
+        region = addr >> self.shift
+        bisect.insort(self.regions[region], addr)
+        if self.sizes[addr] > self.tree[region + self.leaves]:
+            self.set_largest(region, self.sizes[addr])
+
+    def remove(self, addr, size):
+        region = addr >> self.shift
+        blocks = self.regions[region]
+        del blocks[bisect.bisect_left(blocks, addr)]
+        if size == self.tree[region + self.leaves]:
+            self.set_largest(region, max((self.sizes[a] for a in blocks), default=0))
+
+    def next_region(self, region, size):
+        """First region >= `region` whose largest block holds `size`, or -1."""
+        tree = self.tree
+        i = region + self.leaves
+        if tree[i] < size:
+            while True:
+                while i & 1:
+                    i >>= 1
+                if i == 0:
+                    return -1
+                i += 1
+                if tree[i] >= size:
+                    break
+        while i < self.leaves:
+            i = 2 * i if tree[2 * i] >= size else 2 * i + 1
+        return i - self.leaves
+
+    def find(self, size, start=0):
+        """Lowest free address >= start whose block holds `size`, or None."""
+        sizes = self.sizes
+        region = start >> self.shift
+        while region < len(self.regions):
+            region = self.next_region(region, size)
+            if region == -1:
+                return None
+            blocks = self.regions[region]
+            for k in range(bisect.bisect_left(blocks, start), len(blocks)):
+                if sizes[blocks[k]] >= size:
+                    return blocks[k]
+            region += 1
+        return None
+
+
+class HeapAllocator:
+    """One contiguous arena with block splitting and boundary-tag coalescing.
+
+    Free blocks are tagged at both ends: free_start maps a block's first
+    address to its size and free_end maps its end address back to its start,
+    so freeing a block finds both free neighbours in O(1). The same blocks are
+    indexed by address (first / next fit) and by (size, address) (best /
+    worst fit), and the fragmentation totals are updated on every event.
+    """
+
+    def __init__(self, arena_size, policy="First Fit", align=ALIGN):
+        self.arena_size = arena_size
+        self.policy = policy
+        self.align = align
+        self.free_start = {}
+        self.free_end = {}
+        self.by_address = AddressIndex(self.free_start, arena_size)
+        self.by_size = SortedMultiset()
+        self.allocated = {}  # block id -> (address, size)
+        self.rover = 0
+        self.total_free = arena_size
+        self.requested = 0
+        self.failures = 0
+        self.insert_free(0, arena_size)
+
+    def insert_free(self, addr, size):
+        self.free_start[addr] = size
+        self.free_end[addr + size] = addr
+        self.by_address.add(addr)
+        self.by_size.add((size, addr))
+
+    def remove_free(self, addr):
+        size = self.free_start.pop(addr)
+        del self.free_end[addr + size]
+        self.by_address.remove(addr, size)
+        return size
+
+    def find(self, size):
+        if self.policy == "First Fit":
+            return self.by_address.find(size)
+        if self.policy == "Next Fit":
+            addr = self.by_address.find(size, self.rover)
+            return addr if addr is not None else self.by_address.find(size)
+        if self.policy == "Best Fit":
+            found = self.by_size.first_at_least((size, -1))
+            return found[1] if found else None
+        largest = self.by_size.max()
+        if not largest or largest[0] < size:
+            return None
+        # Lowest address among the largest blocks, as the static Worst Fit does.
+        return self.by_size.first_at_least((largest[0], -1))[1]
+
+    def malloc(self, block_id, size):
+        """Allocate `size` bytes for `block_id`; returns the address or None."""
+        requested = size
+        size = max(self.align, -(-size // self.align) * self.align)
+        addr = self.find(size)
+        if addr is None:
+            self.failures += 1
+            return None
+        block_size = self.remove_free(addr)
+        self.by_size.remove((block_size, addr))
+        if block_size > size:
+            self.insert_free(addr + size, block_size - size)
+        self.rover = addr + size
+        self.allocated[block_id] = (addr, size, requested)
+        self.total_free -= size
+        self.requested += requested
+        return addr
+
+    def free(self, block_id):
+        addr, size, requested = self.allocated.pop(block_id)
+        self.total_free += size
+        self.requested -= requested
+        next_size = self.free_start.get(addr + size)
+        if next_size is not None:
+            self.remove_free(addr + size)
+            self.by_size.remove((next_size, addr + size))
+            size += next_size
+        prev = self.free_end.get(addr)
+        if prev is not None:
+            prev_size = self.remove_free(prev)
+            self.by_size.remove((prev_size, prev))
+            addr, size = prev, size + prev_size
+        self.insert_free(addr, size)
+
+    def largest_free(self):
+        largest = self.by_size.max()
+        return largest[0] if largest else 0
+
+    def external_fragmentation(self):
+        """1 - largest free block / total free bytes."""
+        if not self.total_free:
+            return 0.0
+        return 1 - self.largest_free() / self.total_free
+
+    def internal_fragmentation(self):
+        """Share of allocated bytes lost to rounding requests up."""
+        used = self.used
+        return 1 - self.requested / used if used else 0.0
+
+    def free_list_length(self):
+        return len(self.free_start)
+
+    @property
+    def used(self):
+        return self.arena_size - self.total_free
+
+
+class BuddyAllocator:
+    """Binary buddy allocator with one free set per order.
+
+    Blocks of order k are ALIGN << k bytes; a block's buddy is found by
+    flipping bit k of its offset, so split and merge are O(log n). The arena
+    is the largest power of two that fits in `arena_size`.
+    """
+
+    def __init__(self, arena_size, min_block=ALIGN):
+        self.min_shift = min_block.bit_length() - 1
+        self.max_order = max(0, arena_size.bit_length() - 1 - self.min_shift)
+        self.arena_size = 1 << (self.max_order + self.min_shift)
+        self.free_lists = [set() for _ in range(self.max_order + 1)]
+        self.free_lists[self.max_order].add(0)
+        self.free_count = 1
+        self.allocated = {}  # block id -> (address, order, requested)
+        self.total_free = self.arena_size
+        self.requested = 0
+        self.failures = 0
+
+    def order_for(self, size):
+        block = max(size, 1 << self.min_shift)
+        return (block - 1).bit_length() - self.min_shift
+
+    def alloc_block(self, order):
+        """Take a free block of `order`, splitting a larger one if needed."""
+        k = order
+        while k <= self.max_order and not self.free_lists[k]:
+            k += 1
+        if k > self.max_order:
+            return None
+        addr = self.free_lists[k].pop()
+        while k > order:
+            k -= 1
+            # Keep the low half, free the upper buddy.
+            self.free_lists[k].add(addr + (1 << (k + self.min_shift)))
+            self.free_count += 1
+        self.free_count -= 1
+        self.total_free -= 1 << (order + self.min_shift)
+        return addr
+
+    def free_block(self, addr, order):
+        self.total_free += 1 << (order + self.min_shift)
+        while order < self.max_order:
+            buddy = addr ^ (1 << (order + self.min_shift))
+            if buddy not in self.free_lists[order]:
+                break
+            self.free_lists[order].remove(buddy)
+            self.free_count -= 1
+            addr = min(addr, buddy)
+            order += 1
+        self.free_lists[order].add(addr)
+        self.free_count += 1
+
+    def malloc(self, block_id, size):
+        order = self.order_for(size)
+        addr = self.alloc_block(order) if order <= self.max_order else None
+        if addr is None:
+            self.failures += 1
+            return None
+        self.allocated[block_id] = (addr, order, size)
+        self.requested += size
+        return addr
+
+    def free(self, block_id):
+        addr, order, requested = self.allocated.pop(block_id)
+        self.requested -= requested
+        self.free_block(addr, order)
+
+    def largest_free(self):
+        for order in range(self.max_order, -1, -1):
+            if self.free_lists[order]:
+                return 1 << (order + self.min_shift)
+        return 0
+
+    def external_fragmentation(self):
+        if not self.total_free:
+            return 0.0
+        return 1 - self.largest_free() / self.total_free
+
+    def internal_fragmentation(self):
+        used = self.used
+        return 1 - self.requested / used if used else 0.0
+
+    def free_list_length(self):
+        return self.free_count
+
+    @property
+    def used(self):
+        return self.arena_size - self.total_free
+
+
+class Slab:
+    __slots__ = ("addr", "free", "in_use")
+
+    def __init__(self, addr, objects):
+        self.addr = addr
+        self.free = list(range(objects - 1, -1, -1))
+        self.in_use = 0
+
+
+class SlabCache:
+    """Objects of one size class, carved from SLAB_SIZE pages.
+
+    Slabs move between the partial, full and empty lists as objects are
+    handed out and returned; the dicts keep insertion order and O(1) removal.
+    """
+
+    def __init__(self, object_size):
+        self.object_size = object_size
+        self.objects = SLAB_SIZE // object_size
+        self.partial = {}
+        self.full = {}
+        self.empty = {}
+
+
+class SlabAllocator:
+    """Size-class slab caches on top of a buddy page allocator.
+
+    Requests above the largest class go straight to the buddy allocator, as
+    kmalloc does for large sizes.
+    """
+
+    def __init__(self, arena_size, classes=SLAB_CLASSES):
+        self.buddy = BuddyAllocator(arena_size)
+        self.classes = list(classes)
+        self.caches = [SlabCache(size) for size in self.classes]
+        self.slab_order = self.buddy.order_for(SLAB_SIZE)
+        self.allocated = {}  # block id -> (cache index or -1, slab or address, object, requested)
+        self.arena_size = self.buddy.arena_size
+        self.requested = 0
+        self.failures = 0
+
+    def malloc(self, block_id, size):
+        c = bisect.bisect_left(self.classes, size)
+        if c == len(self.classes):
+            addr = self.buddy.malloc(("large", block_id), size)
+            if addr is None:
+                self.failures += 1
+                return None
+            self.allocated[block_id] = (-1, addr, 0, size)
+            self.requested += size
+            return addr
+
+        cache = self.caches[c]
+        if cache.partial:
+            slab = next(iter(cache.partial.values()))
+        elif cache.empty:
+            slab = cache.empty.popitem()[1]
+            cache.partial[slab.addr] = slab
+        else:
+            addr = self.buddy.alloc_block(self.slab_order)
+            if addr is None:
+                self.failures += 1
+                return None
+            slab = Slab(addr, cache.objects)
+            cache.partial[addr] = slab
+
+        obj = slab.free.pop()
+        slab.in_use += 1
+        if not slab.free:
+            del cache.partial[slab.addr]
+            cache.full[slab.addr] = slab
+        self.allocated[block_id] = (c, slab, obj, size)
+        self.requested += size
+        return slab.addr + obj * cache.object_size
+
+    def free(self, block_id):
+        c, slab, obj, size = self.allocated.pop(block_id)
+        self.requested -= size
+        if c == -1:
+            self.buddy.free(("large", block_id))
+            return
+        cache = self.caches[c]
+        if not slab.free:
+            del cache.full[slab.addr]
+            cache.partial[slab.addr] = slab
+        slab.free.append(obj)
+        slab.in_use -= 1
+        if not slab.in_use:
+            del cache.partial[slab.addr]
+            if len(cache.empty) < SLAB_EMPTY_LIMIT:
+                cache.empty[slab.addr] = slab
+            else:
+                self.buddy.free_block(slab.addr, self.slab_order)
+
+    def largest_free(self):
+        return self.buddy.largest_free()
+
+    def external_fragmentation(self):
+        return self.buddy.external_fragmentation()
+
+    def internal_fragmentation(self):
+        """Bytes held from the buddy (slab pages, cached empty slabs, large
+        blocks) that do not back requested bytes."""
+        used = self.used
+        return 1 - self.requested / used if used else 0.0
+
+    def free_list_length(self):
+        return self.buddy.free_list_length()
+
+    @property
+    def total_free(self):
+        return self.buddy.total_free
+
+    @property
+    def used(self):
+        return self.buddy.used
+
+
+def make_allocator(engine, arena_size):
+    if engine == "Buddy":
+        return BuddyAllocator(arena_size)
+    if engine == "Slab":
+        return SlabAllocator(arena_size)
+    return HeapAllocator(arena_size, engine)
+
+
+def read_trace(path):
+    """Yield ("a", id, size) / ("f", id, 0) events from lines like
+    `a 17 4096`, `malloc 17 4096`, `f 17` or `free 17`."""
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            fields = line.replace(",", " ").split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            op = fields[0].lower()
+            try:
+                if op in ("a", "malloc", "alloc"):
+                    yield "a", fields[1], int(fields[2], 0)
+                elif op in ("f", "free"):
+                    yield "f", fields[1], 0
+                else:
+                    raise ValueError(op)
+            except (ValueError, IndexError):
+                raise ValueError(f"{path}:{line_no}: expected 'a <id> <size>' or 'f <id>'")
+
+
+def synthetic_trace(events, min_size=16, max_size=4096, target_live=1000, seed=None):
+    """Random allocate/free events that hover around `target_live` live blocks."""
+    rng = random.Random(seed)
+    live = []
+    next_id = 0
+    for _ in range(events):
+        if live and rng.random() < len(live) / (2 * target_live):
+            k = rng.randrange(len(live))
+            live[k], live[-1] = live[-1], live[k]
+            yield "f", live.pop(), 0
+        else:
+            live.append(next_id)
+            yield "a", next_id, rng.randint(min_size, max_size)
+            next_id += 1
+
+
+def replay_trace(allocator, events, total_events=None, progress=None):
+    """Feed events to `allocator`, sampling fragmentation metrics along the way.
+
+    Pass `total_events` when known so the timeline is sampled evenly;
+    otherwise the sampling interval doubles whenever the timeline fills up.
+    """
+    sample_every = max(1, (total_events or 0) // TIMELINE_POINTS)
+    timeline = {"event": [], "used": [], "largest": [], "fragmentation": [],
+                "internal": [], "free_blocks": []}
+    bad_events = 0
+    count = 0
+    start = time.perf_counter()
+    for count, (op, block_id, size) in enumerate(events, 1):
+        if op == "a":
+            if block_id in allocator.allocated:
+                bad_events += 1
+            else:
+                allocator.malloc(block_id, size)
+        elif block_id in allocator.allocated:
+            allocator.free(block_id)
+        else:
+            bad_events += 1
+        if count % sample_every == 0:
+            timeline["event"].append(count)
+            timeline["used"].append(allocator.used)
+            timeline["largest"].append(allocator.largest_free())
+            timeline["fragmentation"].append(allocator.external_fragmentation())
+            timeline["internal"].append(allocator.internal_fragmentation())
+            timeline["free_blocks"].append(allocator.free_list_length())
+            if len(timeline["event"]) >= 2 * TIMELINE_POINTS:
+                # Unknown trace length: halve the resolution to stay bounded.
+                for series in timeline.values():
+                    del series[::2]
+                sample_every *= 2
+            if progress and count % (sample_every * 50) == 0:
+                progress(count)
+    elapsed = time.perf_counter() - start
+    return {
+        "events": count,
+        "elapsed": elapsed,
+        "failures": allocator.failures,
+        "bad_events": bad_events,
+        "timeline": timeline,
+    }
 
 
 class MemoryAllocationSimulator:
     def __init__(self, root):
         self.root = root
         self.root.title("Memory Allocation Simulator")
-        self.root.geometry("700x550")
+        self.root.geometry("760x820")
+
+        self.events = queue.Queue()
+        self.worker = None
 
         self.create_widgets()
+        self.root.after(POLL_MS, self.poll_events)
 
     def create_widgets(self):
         title = tk.Label(self.root, text="Memory Allocation Simulator",
@@ -38,6 +600,55 @@ class MemoryAllocationSimulator:
                                  command=self.allocate_memory)
         allocate_btn.pack(pady=10)
 
+        # Heap Trace Replay
+        heap_frame = tk.LabelFrame(self.root, text="Heap Trace Replay")
+        heap_frame.pack(pady=5)
+
+        tk.Label(heap_frame, text="Arena Size (bytes):").grid(row=0, column=0, sticky="w")
+        self.arena_entry = tk.Entry(heap_frame)
+        self.arena_entry.insert(0, str(64 * 1024 * 1024))
+        self.arena_entry.grid(row=0, column=1)
+
+        tk.Label(heap_frame, text="Heap Engine:").grid(row=0, column=2, sticky="w", padx=(15, 0))
+        self.heap_policy = ttk.Combobox(heap_frame, state="readonly", values=HEAP_ENGINES, width=12)
+        self.heap_policy.current(0)
+        self.heap_policy.grid(row=0, column=3)
+
+        tk.Label(heap_frame, text="Trace File:").grid(row=1, column=0, sticky="w")
+        self.trace_entry = tk.Entry(heap_frame, width=45)
+        self.trace_entry.grid(row=1, column=1, columnspan=2)
+        tk.Button(heap_frame, text="Browse", command=self.browse_trace).grid(row=1, column=3)
+
+        tk.Label(heap_frame, text="Synthetic Events:").grid(row=2, column=0, sticky="w")
+        self.synthetic_entry = tk.Entry(heap_frame)
+        self.synthetic_entry.insert(0, "100000")
+        self.synthetic_entry.grid(row=2, column=1)
+
+        tk.Label(heap_frame, text="Size Range (min,max):").grid(row=2, column=2, sticky="w", padx=(15, 0))
+        self.size_range_entry = tk.Entry(heap_frame, width=15)
+        self.size_range_entry.insert(0, "16,4096")
+        self.size_range_entry.grid(row=2, column=3)
+
+        self.replay_buttons = [
+            tk.Button(heap_frame, text="Replay Trace File",
+                      command=lambda: self.start_replay(synthetic=False)),
+            tk.Button(heap_frame, text="Replay Synthetic Trace",
+                      command=lambda: self.start_replay(synthetic=True)),
+        ]
+        self.replay_buttons[0].grid(row=3, column=0, columnspan=2, pady=5)
+        self.replay_buttons[1].grid(row=3, column=2, columnspan=2, pady=5)
+
+        self.compare_synthetic = tk.BooleanVar(value=True)
+        self.replay_buttons.append(
+            tk.Button(heap_frame, text="Compare All Engines",
+                      command=lambda: self.start_replay(self.compare_synthetic.get(), compare=True)))
+        self.replay_buttons[2].grid(row=4, column=0, columnspan=2, pady=5)
+        tk.Checkbutton(heap_frame, text="Use synthetic trace for comparison",
+                       variable=self.compare_synthetic).grid(row=4, column=2, columnspan=2, sticky="w")
+
+        self.progress = ttk.Progressbar(self.root, length=400, mode="determinate")
+        self.progress.pack(pady=5)
+
         # Results Area
         self.result_text = tk.Text(self.root, height=15, width=80)
         self.result_text.pack(pady=10)
@@ -129,6 +740,176 @@ class MemoryAllocationSimulator:
                 )
 
 
+    # ---------------- Heap Trace Replay ---------------- #
+
+    def browse_trace(self):
+        path = filedialog.askopenfilename()
+        if path:
+            self.trace_entry.delete(0, tk.END)
+            self.trace_entry.insert(0, path)
+
+    def start_replay(self, synthetic, compare=False):
+        if self.worker and self.worker.is_alive():
+            return
+        try:
+            arena = int(self.arena_entry.get())
+            events = int(self.synthetic_entry.get())
+            min_size, max_size = self.parse_input(self.size_range_entry.get())
+        except (TypeError, ValueError):
+            messagebox.showerror("Invalid Input",
+                                 "Arena, event count and size range must be integers.")
+            return
+        if arena <= 0 or events <= 0 or not 0 < min_size <= max_size:
+            messagebox.showerror("Invalid Input",
+                                 "Arena and event count must be positive, and the size range "
+                                 "must satisfy 0 < min <= max.")
+            return
+        path = self.trace_entry.get().strip()
+        if not synthetic and not path:
+            messagebox.showerror("Invalid Input", "Choose a trace file to replay.")
+            return
+
+        settings = {
+            "arena": arena,
+            "policy": self.heap_policy.get(),
+            "engines": HEAP_ENGINES if compare else [self.heap_policy.get()],
+            "path": None if synthetic else path,
+            "events": events,
+            "sizes": (min_size, max_size),
+            # One seed per run so every engine in a comparison sees the same trace.
+            "seed": random.randrange(1 << 30),
+        }
+        self.result_text.delete("1.0", tk.END)
+        self.result_text.insert(tk.END, "Replaying heap trace...\n")
+        for button in self.replay_buttons:
+            button.config(state=tk.DISABLED)
+        if synthetic:
+            self.progress.config(mode="determinate", maximum=events * len(settings["engines"]), value=0)
+        else:
+            self.progress.config(mode="indeterminate")
+            self.progress.start()
+        self.worker = threading.Thread(target=self.replay_worker, args=(settings,), daemon=True)
+        self.worker.start()
+
+    def trace_events(self, settings):
+        if settings["path"]:
+            return read_trace(settings["path"]), None
+        min_size, max_size = settings["sizes"]
+        return (synthetic_trace(settings["events"], min_size, max_size, seed=settings["seed"]),
+                settings["events"])
+
+    def replay_worker(self, settings):
+        # Runs off the Tk thread; results go back through self.events.
+        runs = []
+        try:
+            for i, engine in enumerate(settings["engines"]):
+                offset = i * settings["events"]
+                events, total = self.trace_events(settings)
+                allocator = make_allocator(engine, settings["arena"])
+                result = replay_trace(
+                    allocator, events, total,
+                    progress=lambda done: self.events.put(("progress", offset + done)))
+                runs.append((engine, allocator, result))
+        except (OSError, ValueError) as err:
+            self.events.put(("error", str(err)))
+            return
+        except Exception as err:
+            self.events.put(("error", f"{type(err).__name__}: {err}"))
+            return
+        if len(runs) == 1:
+            self.events.put(("replayed", (settings, *runs[0])))
+        else:
+            self.events.put(("compared", (settings, runs)))
+
+    def poll_events(self):
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == "progress":
+                    if str(self.progress.cget("mode")) == "determinate":
+                        self.progress.config(value=payload)
+                elif kind == "replayed":
+                    self.show_replay(*payload)
+                elif kind == "compared":
+                    self.show_comparison(*payload)
+                elif kind == "error":
+                    self.finish_replay()
+                    messagebox.showerror("Heap Trace Replay", payload)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self.poll_events)
+
+    def finish_replay(self):
+        for button in self.replay_buttons:
+            button.config(state=tk.NORMAL)
+        self.progress.stop()
+        self.progress.config(mode="determinate", value=0)
+
+    def show_replay(self, settings, engine, allocator, result):
+        self.finish_replay()
+        events = result["events"]
+        rate = events / result["elapsed"] if result["elapsed"] else 0.0
+        self.result_text.insert(
+            tk.END,
+            f"Engine: {engine}, arena {allocator.arena_size} bytes\n"
+            f"Events: {events} ({rate:,.0f} events/s)\n"
+            f"Failed Allocations: {result['failures']}\n"
+            f"Ignored Events (double alloc / bad free): {result['bad_events']}\n"
+            f"Live Blocks: {len(allocator.allocated)}\n"
+            f"Used Bytes: {allocator.used}\n"
+            f"Free Bytes: {allocator.total_free}\n"
+            f"Largest Free Block: {allocator.largest_free()}\n"
+            f"Free List Length: {allocator.free_list_length()}\n"
+            f"External Fragmentation: {allocator.external_fragmentation():.3f}\n"
+            f"Internal Fragmentation: {allocator.internal_fragmentation():.3f}\n"
+        )
+        if result["timeline"]["event"]:
+            self.show_timeline(engine, result["timeline"])
+
+    def show_comparison(self, settings, runs):
+        self.finish_replay()
+        source = settings["path"] or f"synthetic trace ({settings['events']} events)"
+        self.result_text.insert(tk.END, f"Comparison on {source}\n\n")
+        self.result_text.insert(
+            tk.END,
+            f"{'Engine':<11}{'Ops/s':>11}{'Failed':>8}{'Internal':>10}{'External':>10}"
+            f"{'Largest Free':>14}{'Free Blocks':>13}\n"
+        )
+        for engine, allocator, result in runs:
+            rate = result["events"] / result["elapsed"] if result["elapsed"] else 0.0
+            self.result_text.insert(
+                tk.END,
+                f"{engine:<11}{rate:>11,.0f}{result['failures']:>8}"
+                f"{allocator.internal_fragmentation():>10.3f}{allocator.external_fragmentation():>10.3f}"
+                f"{allocator.largest_free():>14}{allocator.free_list_length():>13}\n"
+            )
+
+    def show_timeline(self, engine, timeline):
+        window = tk.Toplevel(self.root)
+        window.title(f"Fragmentation Timeline - {engine}")
+        fig, (bytes_ax, frag_ax, count_ax) = plt.subplots(3, 1, figsize=(8, 7), sharex=True)
+
+        bytes_ax.plot(timeline["event"], timeline["used"], label="Used")
+        bytes_ax.plot(timeline["event"], timeline["largest"], label="Largest free block")
+        bytes_ax.set_ylabel("Bytes")
+        bytes_ax.legend(loc="upper left")
+
+        frag_ax.plot(timeline["event"], timeline["fragmentation"], color="tab:red", label="External")
+        frag_ax.plot(timeline["event"], timeline["internal"], color="tab:purple", label="Internal")
+        frag_ax.set_ylabel("Fragmentation")
+        frag_ax.set_ylim(0, 1)
+        frag_ax.legend(loc="upper left")
+
+        count_ax.plot(timeline["event"], timeline["free_blocks"], color="tab:green")
+        count_ax.set_ylabel("Free blocks")
+        count_ax.set_xlabel("Event")
+        fig.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, master=window)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        window.protocol("WM_DELETE_WINDOW", lambda: (plt.close(fig), window.destroy()))
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = MemoryAllocationSimulator(root)
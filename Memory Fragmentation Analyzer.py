@@ -1,6 +1,308 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, ttk, filedialog
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import heapq
+import math
+import queue
+import threading
+import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+STRATEGIES = ["First Fit", "Best Fit", "Worst Fit"]
+SIZE_DISTRIBUTIONS = {
+    # name -> (parameter hint, default parameters)
+    "Uniform": ("low, high", "50, 400"),
+    "Lognormal": ("median, sigma", "150, 0.8"),
+    "Bimodal": ("small, large, large fraction", "60, 350, 0.3"),
+    "Fitted from Trace": ("(fitted from trace file)", ""),
+}
+LIFETIME_DISTRIBUTIONS = {
+    "Exponential": ("mean", "8"),
+    "Uniform": ("low, high", "1, 15"),
+    "Pareto": ("shape, minimum", "1.5, 2"),
+    "Fitted from Trace": ("(fitted from trace file)", ""),
+}
+METRICS = ["Utilization (%)", "External Fragmentation", "Failure Rate"]
+TRIALS_PER_TASK = 50
+POLL_MS = 100
+MAP_WIDTH = 512
+MAP_HEIGHT = 256
+FREE_RGB = np.array([46, 160, 67], dtype=np.float32)
+ALLOCATED_RGB = np.array([214, 39, 40], dtype=np.float32)
+BACKGROUND_RGB = np.array([220, 220, 220], dtype=np.float32)
+HISTOGRAM_BUCKETS = 48  # log2 buckets: bucket k holds free blocks of [2**k, 2**(k+1)) bytes
+EVENTS_PER_FRAME = 200
+FRAME_MS = 30
+
+
+def find_block(remaining_blocks, process, strategy):
+    """Index of the block `strategy` picks for `process`, or -1 if none fits."""
+    index = -1
+    if strategy == "First Fit":
+        for j in range(len(remaining_blocks)):
+            if remaining_blocks[j] >= process:
+                index = j
+                break
+
+    elif strategy == "Best Fit":
+        best_size = float('inf')
+        for j in range(len(remaining_blocks)):
+            if remaining_blocks[j] >= process and remaining_blocks[j] < best_size:
+                best_size = remaining_blocks[j]
+                index = j
+
+    elif strategy == "Worst Fit":
+        worst_size = -1
+        for j in range(len(remaining_blocks)):
+            if remaining_blocks[j] >= process and remaining_blocks[j] > worst_size:
+                worst_size = remaining_blocks[j]
+                index = j
+    return index
+
+
+def find_block_array(remaining_blocks, process, strategy):
+    """NumPy form of find_block for large arenas; picks the same index.
+
+    find_block stays the faster choice for the handful of blocks in a
+    Monte Carlo trial, where per-call NumPy overhead would dominate."""
+    if strategy == "First Fit":
+        fits = remaining_blocks >= process
+        index = int(fits.argmax())
+    elif strategy == "Best Fit":
+        # Blocks that are too small wrap around to huge unsigned slack.
+        index = int((remaining_blocks - process).view(np.uint64).argmin())
+    elif strategy == "Worst Fit":
+        index = int(remaining_blocks.argmax())
+    else:
+        return -1
+    return index if remaining_blocks[index] >= process else -1
+
+
+def sample_sizes(spec, count, rng):
+    name, *params = spec
+    if name == "Uniform":
+        sizes = rng.uniform(params[0], params[1], count)
+    elif name == "Lognormal":
+        sizes = rng.lognormal(math.log(params[0]), params[1], count)
+    elif name == "Bimodal":
+        small, large, large_fraction = params
+        means = np.where(rng.random(count) < large_fraction, large, small)
+        sizes = rng.normal(means, 0.1 * means)
+    else:
+        raise ValueError(f"Unknown size distribution: {name}")
+    return np.maximum(1, np.rint(sizes)).astype(np.int64)
+
+
+def sample_lifetimes(spec, count, rng):
+    """Lifetimes in arrivals: a process leaves that many arrivals after its own."""
+    name, *params = spec
+    if name == "Exponential":
+        lifetimes = rng.exponential(params[0], count)
+    elif name == "Uniform":
+        lifetimes = rng.uniform(params[0], params[1], count)
+    elif name == "Pareto":
+        lifetimes = params[1] * (1 + rng.pareto(params[0], count))
+    else:
+        raise ValueError(f"Unknown lifetime distribution: {name}")
+    return np.maximum(1, np.ceil(lifetimes)).astype(np.int64)
+
+
+def fit_trace(path):
+    """Fit a lognormal size spec and an exponential lifetime spec to a trace.
+
+    Accepts allocation traces (`a <id> <size>` / `f <id>`, as replayed by the
+    Memory Allocation Simulator) or plain files of sizes, one or more per line.
+    Lifetimes are measured in allocations between an `a` and its `f`; plain
+    size files give no lifetimes and return None for that spec."""
+    sizes = []
+    born = {}
+    lifetimes = []
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            fields = line.replace(",", " ").split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            op = fields[0].lower()
+            try:
+                if op in ("a", "malloc", "alloc"):
+                    born[fields[1]] = len(sizes)
+                    sizes.append(int(fields[2], 0))
+                elif op in ("f", "free"):
+                    if fields[1] in born:
+                        lifetimes.append(len(sizes) - born.pop(fields[1]))
+                else:
+                    sizes.extend(float(field) for field in fields)
+            except (ValueError, IndexError):
+                raise ValueError(f"{path}:{line_no}: expected a size, 'a <id> <size>' or 'f <id>'")
+    sizes = np.asarray(sizes, dtype=float)
+    sizes = sizes[sizes > 0]
+    if len(sizes) < 2:
+        raise ValueError(f"{path}: need at least two positive sizes to fit a distribution")
+    logs = np.log(sizes)
+    size_spec = ("Lognormal", float(math.exp(logs.mean())), float(logs.std()))
+    lifetime_spec = ("Exponential", float(np.mean(lifetimes))) if lifetimes else None
+    return size_spec, lifetime_spec
+
+
+def run_trial(blocks, size_spec, lifetime_spec, processes, strategy, seed):
+    """Arrive `processes` processes one per step into the fixed `blocks`.
+
+    Each arrival first releases processes whose lifetime has run out. Returns
+    (mean utilization %, mean external fragmentation, failure rate), with the
+    means taken over every arrival."""
+    rng = np.random.default_rng(seed)
+    sizes = sample_sizes(size_spec, processes, rng).tolist()
+    lifetimes = sample_lifetimes(lifetime_spec, processes, rng).tolist()
+    remaining = list(blocks)
+    total = sum(blocks)
+    used = 0
+    departures = []
+    failures = 0
+    utilization = 0.0
+    fragmentation = 0.0
+    for t in range(processes):
+        while departures and departures[0][0] <= t:
+            _, index, size = heapq.heappop(departures)
+            remaining[index] += size
+            used -= size
+        size = sizes[t]
+        index = find_block(remaining, size, strategy)
+        if index == -1:
+            failures += 1
+        else:
+            remaining[index] -= size
+            used += size
+            heapq.heappush(departures, (t + lifetimes[t], index, size))
+        free = total - used
+        utilization += used / total
+        if free:
+            fragmentation += 1 - max(remaining) / free
+    return 100 * utilization / processes, fragmentation / processes, failures / processes
+
+
+def run_trials(blocks, size_spec, lifetime_spec, processes, strategy, seeds):
+    """One ProcessPoolExecutor task: a batch of trials for one strategy."""
+    return [run_trial(blocks, size_spec, lifetime_spec, processes, strategy, seed) for seed in seeds]
+
+
+def confidence_interval(values, z=1.96):
+    """Mean and half-width of its normal-approximation 95% confidence interval."""
+    values = np.asarray(values)
+    if len(values) < 2:
+        return float(values.mean()), 0.0
+    return float(values.mean()), float(z * values.std(ddof=1) / math.sqrt(len(values)))
+
+
+def log_bucket(sizes):
+    """Histogram bucket index, floor(log2(size)), for positive sizes."""
+    return np.minimum(np.log2(np.maximum(sizes, 1)).astype(np.int64), HISTOGRAM_BUCKETS - 1)
+
+
+class FragmentationMap:
+    """Scan-line bitmap of an arena of consecutive blocks.
+
+    Each block is drawn as its allocated bytes (packed at the block start)
+    followed by its free tail. Every pixel covers `bytes_per_pixel` bytes,
+    left to right then top to bottom, and is shaded by the fraction of those
+    bytes that are allocated. allocate() only records the dirty pixel range;
+    flush() re-renders the affected scan lines and pastes them into the
+    PhotoImage, so an event costs O(changed rows) rather than a full redraw.
+    """
+
+    def __init__(self, parent):
+        frame = tk.Frame(parent)
+        frame.pack(fill="both", expand=True)
+        self.image = tk.PhotoImage(width=MAP_WIDTH, height=MAP_HEIGHT)
+        tk.Label(frame, image=self.image, borderwidth=1, relief="sunken").pack(side="left", padx=5, pady=5)
+
+        self.fig, self.hist_ax = plt.subplots(figsize=(4, 2.6))
+        self.bars = self.hist_ax.bar(range(HISTOGRAM_BUCKETS), np.zeros(HISTOGRAM_BUCKETS), width=0.9)
+        self.hist_ax.set_xlabel("Free block size (log2 bytes)")
+        self.hist_ax.set_ylabel("Blocks")
+        self.fig.tight_layout()
+        self.hist_canvas = FigureCanvasTkAgg(self.fig, master=frame)
+        self.hist_canvas.get_tk_widget().pack(side="left", fill="both", expand=True)
+
+        self.info = tk.Label(parent, anchor="w")
+        self.info.pack(fill="x", padx=5)
+        self.starts = np.zeros(1, dtype=np.int64)
+        self.sizes = np.zeros(1, dtype=np.int64)
+        self.used = np.zeros(1, dtype=np.int64)
+        self.total = 0  # arena bytes; sizes only change in reset()
+        self.bytes_per_pixel = 1
+        self.rows = 0
+        self.dirty = []
+
+    def reset(self, sizes):
+        self.sizes = np.asarray(sizes, dtype=np.int64)
+        self.starts = np.concatenate(([0], np.cumsum(self.sizes)[:-1]))
+        self.used = np.zeros(len(self.sizes), dtype=np.int64)
+        self.total = total = int(self.sizes.sum())
+        self.bytes_per_pixel = max(1, -(-total // (MAP_WIDTH * MAP_HEIGHT)))
+        self.rows = -(-total // (self.bytes_per_pixel * MAP_WIDTH))
+        self.counts = np.bincount(log_bucket(self.sizes[self.sizes > 0]), minlength=HISTOGRAM_BUCKETS)
+        self.info.config(text=f"{len(self.sizes):,} blocks, {total:,} bytes, "
+                              f"{self.bytes_per_pixel:,} bytes per pixel")
+        self.image.blank()
+        self.dirty = [(0, self.rows)]
+        self.flush()
+
+    def allocate(self, index, size):
+        if size <= 0:
+            return  # nothing is split off, so neither the map nor the histogram changes
+        start = self.starts[index] + self.used[index]
+        before = self.sizes[index] - self.used[index]
+        self.used[index] += size
+        after = before - size
+        # The block's free tail shrinks from `before` to `after` bytes.
+        self.counts[log_bucket(before)] -= 1
+        if after > 0:
+            self.counts[log_bucket(after)] += 1
+        row_bytes = self.bytes_per_pixel * MAP_WIDTH
+        self.dirty.append((start // row_bytes, (start + size - 1) // row_bytes + 1))
+
+    def flush(self):
+        if not self.dirty:
+            return
+        # Merge overlapping row ranges so each scan line is rendered once.
+        self.dirty.sort()
+        merged = [list(self.dirty[0])]
+        for first, last in self.dirty[1:]:
+            if first <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], last)
+            else:
+                merged.append([first, last])
+        self.dirty = []
+        for first, last in merged:
+            rgb = self.render_rows(first, last)
+            header = f"P6 {MAP_WIDTH} {last - first} 255 ".encode()
+            self.image.tk.call(self.image, "put", header + rgb.tobytes(),
+                               "-format", "ppm", "-to", 0, first)
+
+        for bar, count in zip(self.bars, self.counts):
+            bar.set_height(count)
+        self.hist_ax.set_ylim(0, max(1, self.counts.max()) * 1.05)
+        self.hist_canvas.draw_idle()
+
+    def render_rows(self, first, last):
+        """RGB bytes for scan lines [first, last)."""
+        edges = np.arange(first * MAP_WIDTH, last * MAP_WIDTH + 1, dtype=np.int64) * self.bytes_per_pixel
+        edges = np.minimum(edges, self.total)
+        # Allocated bytes below each pixel edge, counted from the first block in range.
+        lo = max(0, int(np.searchsorted(self.starts, edges[0], side="right")) - 1)
+        hi = int(np.searchsorted(self.starts, edges[-1], side="left"))
+        used = self.used[lo:hi + 1]
+        before = np.concatenate(([0], np.cumsum(used)))
+        block = np.clip(np.searchsorted(self.starts, edges, side="right") - 1, lo, lo + len(used) - 1) - lo
+        allocated = before[block] + np.clip(edges - self.starts[lo + block], 0, used[block])
+        covered = np.diff(edges)
+        fraction = np.diff(allocated) / np.maximum(covered, 1)
+
+        rgb = FREE_RGB + fraction[:, None] * (ALLOCATED_RGB - FREE_RGB)
+        rgb[covered == 0] = BACKGROUND_RGB
+        return rgb.astype(np.uint8).reshape(last - first, MAP_WIDTH, 3)
+
 
 class MemoryFragmentationAnalyzer:
 
@@ -18,77 +320,284 @@ class MemoryFragmentationAnalyzer:
 
         tk.Label(root, text="Allocation Strategy:").pack()
         self.strategy_var = tk.StringVar(value="First Fit")
-        tk.OptionMenu(root, self.strategy_var, 
-                      "First Fit", "Best Fit", "Worst Fit").pack()
+        tk.OptionMenu(root, self.strategy_var, *STRATEGIES).pack()
 
         tk.Button(root, text="Analyze", command=self.analyze).pack(pady=10)
 
+        self.animation = None
+
+        mc_frame = tk.LabelFrame(root, text="Monte Carlo Strategy Comparison (uses the memory blocks above)")
+        mc_frame.pack(fill="x", padx=10, pady=5)
+
+        tk.Label(mc_frame, text="Size Distribution:").grid(row=0, column=0, sticky="w")
+        self.size_dist = ttk.Combobox(mc_frame, state="readonly", values=list(SIZE_DISTRIBUTIONS), width=18)
+        self.size_dist.current(1)
+        self.size_dist.grid(row=0, column=1, sticky="w")
+        self.size_params = tk.Entry(mc_frame, width=18)
+        self.size_params.grid(row=0, column=2, sticky="w")
+        self.size_hint = tk.Label(mc_frame, fg="gray")
+        self.size_hint.grid(row=0, column=3, sticky="w")
+        self.size_dist.bind("<<ComboboxSelected>>", lambda e: self.update_hint(
+            self.size_dist, self.size_params, self.size_hint, SIZE_DISTRIBUTIONS))
+
+        tk.Label(mc_frame, text="Lifetime Distribution:").grid(row=1, column=0, sticky="w")
+        self.lifetime_dist = ttk.Combobox(mc_frame, state="readonly", values=list(LIFETIME_DISTRIBUTIONS), width=18)
+        self.lifetime_dist.current(0)
+        self.lifetime_dist.grid(row=1, column=1, sticky="w")
+        self.lifetime_params = tk.Entry(mc_frame, width=18)
+        self.lifetime_params.grid(row=1, column=2, sticky="w")
+        self.lifetime_hint = tk.Label(mc_frame, fg="gray")
+        self.lifetime_hint.grid(row=1, column=3, sticky="w")
+        self.lifetime_dist.bind("<<ComboboxSelected>>", lambda e: self.update_hint(
+            self.lifetime_dist, self.lifetime_params, self.lifetime_hint, LIFETIME_DISTRIBUTIONS))
+        self.update_hint(self.size_dist, self.size_params, self.size_hint, SIZE_DISTRIBUTIONS)
+        self.update_hint(self.lifetime_dist, self.lifetime_params, self.lifetime_hint, LIFETIME_DISTRIBUTIONS)
+
+        tk.Label(mc_frame, text="Trace File:").grid(row=2, column=0, sticky="w")
+        self.trace_entry = tk.Entry(mc_frame, width=30)
+        self.trace_entry.grid(row=2, column=1, columnspan=2, sticky="we")
+        tk.Button(mc_frame, text="Browse", command=self.browse_trace).grid(row=2, column=3, sticky="w")
+
+        tk.Label(mc_frame, text="Processes per Trial:").grid(row=3, column=0, sticky="w")
+        self.processes_entry = tk.Entry(mc_frame, width=10)
+        self.processes_entry.insert(0, "500")
+        self.processes_entry.grid(row=3, column=1, sticky="w")
+        tk.Label(mc_frame, text="Trials:").grid(row=3, column=2, sticky="e")
+        self.trials_entry = tk.Entry(mc_frame, width=10)
+        self.trials_entry.insert(0, "2000")
+        self.trials_entry.grid(row=3, column=3, sticky="w")
+        tk.Label(mc_frame, text="Seed:").grid(row=4, column=0, sticky="w")
+        self.seed_entry = tk.Entry(mc_frame, width=10)
+        self.seed_entry.insert(0, "1")
+        self.seed_entry.grid(row=4, column=1, sticky="w")
+
+        self.compare_button = tk.Button(mc_frame, text="Compare Strategies", command=self.start_comparison)
+        self.compare_button.grid(row=5, column=0, columnspan=2, pady=5)
+        self.progress = ttk.Progressbar(mc_frame, length=250)
+        self.progress.grid(row=5, column=2, columnspan=2, pady=5)
+
+        # (seed, blocks, size spec, lifetime spec, processes, trials) -> {strategy: results}
+        self.results_cache = {}
+        self.events = queue.Queue()
+        self.root.after(POLL_MS, self.poll_events)
+
+        map_frame = tk.LabelFrame(root, text="Address Space Map")
+        map_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        random_frame = tk.Frame(map_frame)
+        random_frame.pack(fill="x")
+        tk.Label(random_frame, text="Random Arena (blocks, min size, max size, processes):").pack(side="left")
+        self.random_arena_entry = tk.Entry(random_frame, width=28)
+        self.random_arena_entry.insert(0, "1000000, 64, 4096, 2000")
+        self.random_arena_entry.pack(side="left")
+        tk.Button(random_frame, text="Analyze Random Arena", command=self.analyze_random).pack(side="left", padx=5)
+        self.memory_map = FragmentationMap(map_frame)
+
     def analyze(self):
         try:
             blocks = list(map(int, self.blocks_entry.get().split(",")))
             processes = list(map(int, self.process_entry.get().split(",")))
-            strategy = self.strategy_var.get()
+            if min(blocks) < 0 or min(processes) <= 0:
+                raise ValueError("Block sizes must not be negative and process sizes must be positive.")
+            self.run_analysis(np.array(blocks, dtype=np.int64), processes)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
 
-            allocation = [-1] * len(processes)
-            remaining_blocks = blocks.copy()
+    def analyze_random(self):
+        try:
+            count, min_size, max_size, process_count = map(int, self.random_arena_entry.get().split(","))
+            if count <= 0 or process_count <= 0 or not 0 < min_size <= max_size:
+                raise ValueError("Expected positive counts and 0 < min size <= max size.")
+            rng = np.random.default_rng()
+            blocks = rng.integers(min_size, max_size + 1, count)
+            processes = rng.integers(1, max_size + 1, process_count).tolist()
+            self.run_analysis(blocks, processes)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
 
-            for i, process in enumerate(processes):
-                index = -1
+    def run_analysis(self, blocks, processes):
+        strategy = self.strategy_var.get()
 
-                if strategy == "First Fit":
-                    for j in range(len(remaining_blocks)):
-                        if remaining_blocks[j] >= process:
-                            index = j
-                            break
+        allocation = [-1] * len(processes)
+        remaining_blocks = blocks.copy()
 
-                elif strategy == "Best Fit":
-                    best_size = float('inf')
-                    for j in range(len(remaining_blocks)):
-                        if remaining_blocks[j] >= process and remaining_blocks[j] < best_size:
-                            best_size = remaining_blocks[j]
-                            index = j
+        for i, process in enumerate(processes):
+            index = find_block_array(remaining_blocks, process, strategy)
 
-                elif strategy == "Worst Fit":
-                    worst_size = -1
-                    for j in range(len(remaining_blocks)):
-                        if remaining_blocks[j] >= process and remaining_blocks[j] > worst_size:
-                            worst_size = remaining_blocks[j]
-                            index = j
+            if index != -1:
+                allocation[i] = index
+                remaining_blocks[index] -= process
 
-                if index != -1:
-                    allocation[i] = index
-                    remaining_blocks[index] -= process
+        internal_frag = int(remaining_blocks.sum())
 
-            internal_frag = sum(
-                remaining_blocks[i] for i in range(len(blocks))
-            )
+        total_memory = int(blocks.sum())
+        used_memory = sum(processes[i] for i in range(len(processes)) if allocation[i] != -1)
+        utilization = (used_memory / total_memory) * 100
 
-            total_memory = sum(blocks)
-            used_memory = sum(processes[i] for i in range(len(processes)) if allocation[i] != -1)
-            utilization = (used_memory / total_memory) * 100
+        result = f"Strategy: {strategy}\n"
+        result += f"Total Memory: {total_memory}\n"
+        result += f"Used Memory: {used_memory}\n"
+        result += f"Memory Utilization: {utilization:.2f}%\n"
+        result += f"Internal Fragmentation: {internal_frag}"
 
-            result = f"Strategy: {strategy}\n"
-            result += f"Total Memory: {total_memory}\n"
-            result += f"Used Memory: {used_memory}\n"
-            result += f"Memory Utilization: {utilization:.2f}%\n"
-            result += f"Internal Fragmentation: {internal_frag}"
+        messagebox.showinfo("Analysis Result", result)
 
-            messagebox.showinfo("Analysis Result", result)
+        self.show_map(blocks, processes, allocation)
 
-            self.plot_memory(blocks, remaining_blocks)
+    def show_map(self, blocks, processes, allocation):
+        """Replay the placements onto the address-space map a frame at a time."""
+        if self.animation is not None:
+            self.root.after_cancel(self.animation)
+        self.memory_map.reset(blocks)
+        placements = [(index, process) for index, process in zip(allocation, processes) if index != -1]
+        self.animation = self.root.after(FRAME_MS, self.animate_map, placements, 0)
 
-        except Exception as e:
+    def animate_map(self, placements, position):
+        for index, size in placements[position:position + EVENTS_PER_FRAME]:
+            self.memory_map.allocate(index, size)
+        self.memory_map.flush()
+        position += EVENTS_PER_FRAME
+        if position < len(placements):
+            self.animation = self.root.after(FRAME_MS, self.animate_map, placements, position)
+        else:
+            self.animation = None
+
+    def update_hint(self, combo, entry, hint, distributions):
+        text, default = distributions[combo.get()]
+        hint.config(text=text)
+        entry.delete(0, tk.END)
+        entry.insert(0, default)
+
+    def browse_trace(self):
+        path = filedialog.askopenfilename(title="Select Allocation Trace")
+        if path:
+            self.trace_entry.delete(0, tk.END)
+            self.trace_entry.insert(0, path)
+
+    def workload_specs(self):
+        """(size spec, lifetime spec) as hashable tuples, fitting the trace if asked."""
+        size_name, lifetime_name = self.size_dist.get(), self.lifetime_dist.get()
+        fitted = (None, None)
+        if "Fitted from Trace" in (size_name, lifetime_name):
+            if not self.trace_entry.get():
+                raise ValueError("Choose a trace file to fit a distribution from.")
+            fitted = fit_trace(self.trace_entry.get())
+
+        if size_name == "Fitted from Trace":
+            size_spec = fitted[0]
+        else:
+            params = tuple(map(float, self.size_params.get().split(",")))
+            if len(params) != len(SIZE_DISTRIBUTIONS[size_name][0].split(",")):
+                raise ValueError(f"{size_name} sizes take: {SIZE_DISTRIBUTIONS[size_name][0]}")
+            size_spec = (size_name,) + params
+
+        if lifetime_name == "Fitted from Trace":
+            if fitted[1] is None:
+                raise ValueError("The trace has no frees, so no lifetimes can be fitted.")
+            lifetime_spec = fitted[1]
+        else:
+            params = tuple(map(float, self.lifetime_params.get().split(",")))
+            if len(params) != len(LIFETIME_DISTRIBUTIONS[lifetime_name][0].split(",")):
+                raise ValueError(f"{lifetime_name} lifetimes take: {LIFETIME_DISTRIBUTIONS[lifetime_name][0]}")
+            lifetime_spec = (lifetime_name,) + params
+        return size_spec, lifetime_spec
+
+    def start_comparison(self):
+        try:
+            blocks = tuple(map(int, self.blocks_entry.get().split(",")))
+            size_spec, lifetime_spec = self.workload_specs()
+            processes = int(self.processes_entry.get())
+            trials = int(self.trials_entry.get())
+            seed = int(self.seed_entry.get())
+            if processes <= 0 or trials <= 0 or min(blocks) <= 0:
+                raise ValueError("Blocks, processes and trials must be positive.")
+        except (OSError, ValueError) as e:
             messagebox.showerror("Error", str(e))
+            return
+
+        key = (seed, blocks, size_spec, lifetime_spec, processes, trials)
+        if key in self.results_cache:
+            self.show_comparison(key, self.results_cache[key], cached=True)
+            return
+        self.compare_button.config(state=tk.DISABLED)
+        self.progress.config(maximum=trials * len(STRATEGIES), value=0)
+        threading.Thread(target=self.comparison_worker, args=(key,), daemon=True).start()
+
+    def comparison_worker(self, key):
+        # Runs off the Tk thread; results go back through self.events.
+        seed, blocks, size_spec, lifetime_spec, processes, trials = key
+        # Every strategy sees the same per-trial seeds, i.e. the same workloads,
+        # so differences between strategies are not sampling noise.
+        seeds = np.random.SeedSequence(seed).generate_state(trials).tolist()
+        batches = [seeds[i:i + TRIALS_PER_TASK] for i in range(0, trials, TRIALS_PER_TASK)]
+        results = {strategy: [None] * len(batches) for strategy in STRATEGIES}
+        done = 0
+        try:
+            with ProcessPoolExecutor() as pool:
+                futures = {
+                    pool.submit(run_trials, blocks, size_spec, lifetime_spec, processes, strategy, batch):
+                    (strategy, i)
+                    for strategy in STRATEGIES
+                    for i, batch in enumerate(batches)
+                }
+                for future in as_completed(futures):
+                    strategy, i = futures[future]
+                    results[strategy][i] = future.result()
+                    done += len(batches[i])
+                    self.events.put(("progress", done))
+        except Exception as e:
+            self.events.put(("error", str(e)))
+            return
+        results = {strategy: np.array([row for batch in parts for row in batch])
+                   for strategy, parts in results.items()}
+        self.events.put(("compared", (key, results)))
+
+    def poll_events(self):
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == "progress":
+                    self.progress.config(value=payload)
+                elif kind == "compared":
+                    key, results = payload
+                    self.results_cache[key] = results
+                    self.compare_button.config(state=tk.NORMAL)
+                    self.show_comparison(key, results)
+                elif kind == "error":
+                    self.compare_button.config(state=tk.NORMAL)
+                    messagebox.showerror("Error", payload)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self.poll_events)
+
+    def show_comparison(self, key, results, cached=False):
+        seed, blocks, size_spec, lifetime_spec, processes, trials = key
+        window = tk.Toplevel(self.root)
+        window.title("Strategy Comparison" + (" (cached)" if cached else ""))
+
+        fig, axes = plt.subplots(1, len(METRICS), figsize=(12, 4))
+        for m, (ax, metric) in enumerate(zip(axes, METRICS)):
+            ax.boxplot([results[strategy][:, m] for strategy in STRATEGIES], showfliers=False)
+            ax.set_xticks(range(1, len(STRATEGIES) + 1))
+            ax.set_xticklabels(STRATEGIES)
+            ax.set_title(metric)
+        fig.tight_layout()
+        canvas = FigureCanvasTkAgg(fig, master=window)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True)
 
-    def plot_memory(self, original, remaining):
-        plt.figure()
-        plt.bar(range(len(original)), original, label="Original")
-        plt.bar(range(len(remaining)), remaining, bottom=0, alpha=0.6, label="Remaining")
-        plt.title("Memory Blocks Visualization")
-        plt.xlabel("Block Index")
-        plt.ylabel("Memory Size")
-        plt.legend()
-        plt.show()
+        report = tk.Text(window, height=len(STRATEGIES) + 4, width=100)
+        report.pack(fill="x")
+        report.insert(tk.END, f"{trials} trials x {processes} processes, seed {seed}; "
+                              f"sizes {size_spec}, lifetimes {lifetime_spec}\n")
+        report.insert(tk.END, f"{'Strategy':<12}" + "".join(f"{metric:>30}" for metric in METRICS) + "\n")
+        for strategy in STRATEGIES:
+            cells = []
+            for m in range(len(METRICS)):
+                mean, half_width = confidence_interval(results[strategy][:, m])
+                cells.append(f"{mean:.4f} +/- {half_width:.4f}")
+            report.insert(tk.END, f"{strategy:<12}" + "".join(f"{cell:>30}" for cell in cells) + "\n")
+        report.insert(tk.END, "(mean +/- 95% confidence half-width)\n")
+        report.config(state=tk.DISABLED)
 
 
 if __name__ == "__main__":
@@ -1,76 +1,626 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from collections import defaultdict
+import json
+import os
+import queue
 import random
+import shlex
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
 
-# Memory simulation variables
-allocations = []
-memory_history = []
+# Call sites: (tag, mean size in bytes, mean lifetime in allocations, fraction never freed)
+SITES = [
+    ("http.py:118 read_request", 512, 40, 0.0),
+    ("json.py:77 decode", 256, 20, 0.0),
+    ("cache.py:52 remember", 128, 200, 0.02),
+    ("log.py:31 format_record", 96, 5, 0.0),
+    ("session.py:210 open_session", 2048, 400, 0.0),
+    ("image.py:64 thumbnail", 8192, 60, 0.01),
+]
+SAMPLE_EVERY = 1000  # events between leak-trend samples in headless mode
+LEAK_MIN_SAMPLES = 20
+LEAK_R2 = 0.8  # how much of a site's live-byte variance the trend line must explain
+HEADLESS_EVENTS = 10_000_000
+RAW_POINTS = 2000  # newest usage samples kept at full resolution
+ROLLUP_POINTS = 1000  # buckets per rollup level
+ROLLUP_FACTOR = 16  # samples (or finer buckets) folded into one bucket
+ROLLUP_LEVELS = 4  # together cover ~65M samples before the oldest is dropped
+REDRAW_MS = 150  # chart refresh throttle
+SIM_TICK_MS = 20
+PROFILE_FRAMES = 5  # traceback depth tracemalloc records per allocation
+PROFILE_TOP = 15  # growing sites reported per snapshot
+POLL_MS = 100
+
+# Runs inside the profiled interpreter: start tracemalloc, run the target as
+# __main__, and write a JSON line per snapshot to the pipe in argv[1] (an fd
+# on POSIX, an inherited OS handle on Windows).
+# The target runs in a module the agent keeps a reference to, so the final
+# snapshot still sees what it left in its globals.
+PROFILE_AGENT = r"""
+import builtins, json, os, sys, threading, time, tracemalloc, types
+fd, interval, frames, top = int(sys.argv[1]), float(sys.argv[2]), int(sys.argv[3]), int(sys.argv[4])
+sys.argv = sys.argv[5:]
+if os.name == "nt":
+    import msvcrt
+    fd = msvcrt.open_osfhandle(fd, os.O_WRONLY)
+# The agent sits below every target frame; leave room for it.
+tracemalloc.start(frames + 2)
+out = os.fdopen(fd, "w", buffering=1)
+lock = threading.Lock()
+ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<string>"),
+          tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+          tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>")]
+hidden = ("<string>",)
+start = time.monotonic()
+baseline = tracemalloc.take_snapshot().filter_traces(ignore)
+
+def report(final=False):
+    snapshot = tracemalloc.take_snapshot().filter_traces(ignore)
+    current, peak = tracemalloc.get_traced_memory()
+    growing = [stat for stat in snapshot.compare_to(baseline, "traceback") if stat.size_diff > 0]
+    growing.sort(key=lambda stat: -stat.size_diff)
+    sites = [[[f"{frame.filename}:{frame.lineno}" for frame in stat.traceback if frame.filename not in hidden],
+              stat.size, stat.size_diff, stat.count] for stat in growing[:top]]
+    message = {"time": time.monotonic() - start, "current": current, "peak": peak, "final": final, "sites": sites}
+    with lock:
+        out.write(json.dumps(message) + "\n")
+
+def sampler():
+    while True:
+        time.sleep(interval)
+        report()
+
+main = types.ModuleType("__main__")
+main.__file__, main.__builtins__ = sys.argv[0], builtins
+sys.modules["__main__"] = main
+with open(sys.argv[0], "rb") as source:
+    code = compile(source.read(), sys.argv[0], "exec")
+threading.Thread(target=sampler, daemon=True).start()
+try:
+    exec(code, main.__dict__)
+finally:
+    report(final=True)
+"""
+
+# -----------------------------
+# Allocation tracking engine
+# -----------------------------
+class SiteTrend:
+    """Online least-squares line through (event, live bytes) samples of one call site.
+
+    Means and co-moments are updated Welford-style, so each sample is O(1)
+    and the fit stays stable over millions of events."""
+
+    __slots__ = ("n", "mean_x", "mean_y", "m2_x", "m2_y", "c_xy")
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = self.mean_y = 0.0
+        self.m2_x = self.m2_y = self.c_xy = 0.0
+
+    def update(self, x, y):
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def slope(self):
+        return self.c_xy / self.m2_x if self.m2_x else 0.0
+
+    def r_squared(self):
+        if not self.m2_x or not self.m2_y:
+            return 0.0
+        return self.c_xy * self.c_xy / (self.m2_x * self.m2_y)
+
+    def is_leaking(self):
+        # A leak is live bytes that keep climbing: a positive slope that
+        # explains most of the variance, not noise around a plateau.
+        return self.n >= LEAK_MIN_SAMPLES and self.slope() > 0 and self.r_squared() >= LEAK_R2
+
+
+class AllocationTracker:
+    """Live allocations keyed by id, with running totals per call site.
+
+    `live` maps id -> (size, timestamp, site); timestamps count events.
+    Every allocate/free is O(1) dict work plus O(1) total updates; trends
+    are sampled every `sample_every` events at O(sites) each."""
+
+    def __init__(self, sample_every=1):
+        self.live = {}
+        self.site_bytes = defaultdict(int)
+        self.site_counts = defaultdict(int)
+        self.trends = defaultdict(SiteTrend)
+        self.total_bytes = 0
+        self.clock = 0
+        self.next_id = 0
+        self.oldest_id = 0
+        self.sample_every = sample_every
+
+    def allocate(self, size, site):
+        key = self.next_id
+        self.next_id += 1
+        self.live[key] = (size, self.clock, site)
+        self.site_bytes[site] += size
+        self.site_counts[site] += 1
+        self.total_bytes += size
+        self.tick()
+        return key
+
+    def free(self, key):
+        size, _, site = self.live.pop(key)
+        self.site_bytes[site] -= size
+        self.site_counts[site] -= 1
+        self.total_bytes -= size
+        self.tick()
+
+    def free_oldest(self):
+        # Ids are handed out in order, so the oldest live id is the first one
+        # at or past oldest_id; each id is skipped at most once.
+        if not self.live:
+            return False
+        while self.oldest_id not in self.live:
+            self.oldest_id += 1
+        self.free(self.oldest_id)
+        return True
+
+    def tick(self):
+        self.clock += 1
+        if self.clock % self.sample_every == 0:
+            self.sample()
+
+    def sample(self):
+        for site, live_bytes in self.site_bytes.items():
+            self.trends[site].update(self.clock, live_bytes)
+
+    def run(self, chunks):
+        """Apply event chunks of parallel (ops, ids, sizes, sites) lists, where
+        op is True for an allocation; sizes and sites are only read for
+        allocations. Samples trends after every chunk and moves next_id past
+        every id seen, so later allocate() calls cannot reuse a live id.
+        Returns the number of events."""
+        live, site_bytes, site_counts = self.live, self.site_bytes, self.site_counts
+        total, clock = self.total_bytes, self.clock
+        for ops, ids, sizes, sites in chunks:
+            for op, key, size, site in zip(ops, ids, sizes, sites):
+                if op:
+                    live[key] = (size, clock, site)
+                    site_bytes[site] += size
+                    site_counts[site] += 1
+                    total += size
+                else:
+                    size, _, site = live.pop(key)
+                    site_bytes[site] -= size
+                    site_counts[site] -= 1
+                    total -= size
+                clock += 1
+            self.clock = clock
+            if ids:
+                self.next_id = max(self.next_id, max(ids) + 1)
+            self.sample()
+        self.total_bytes = total
+        return clock
+
+    def leaks(self):
+        """Flagged sites, fastest-growing first, as (site, bytes per event, r^2)."""
+        flagged = [(site, trend.slope(), trend.r_squared())
+                   for site, trend in self.trends.items() if trend.is_leaking()]
+        return sorted(flagged, key=lambda leak: -leak[1])
+
+
+class UsageHistory:
+    """Memory-usage samples at several resolutions in fixed-size ring buffers.
+
+    The newest RAW_POINTS samples are kept as-is. Every sample is also folded
+    into level 0, whose buckets hold the min, max and mean of ROLLUP_FACTOR
+    samples; full level-L buckets fold into level L+1 the same way. Each level
+    keeps its newest ROLLUP_POINTS buckets, so memory and plotting cost stay
+    constant however long the run. Samples are indexed by arrival order."""
+
+    def __init__(self):
+        self.raw = np.zeros(RAW_POINTS)
+        self.low = np.zeros((ROLLUP_LEVELS, ROLLUP_POINTS))
+        self.high = np.zeros((ROLLUP_LEVELS, ROLLUP_POINTS))
+        self.mean = np.zeros((ROLLUP_LEVELS, ROLLUP_POINTS))
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.buckets = [0] * ROLLUP_LEVELS  # buckets completed per level
+        # Partially filled bucket per level: [low, high, sum, n]
+        self.pending = [[0.0, 0.0, 0.0, 0] for _ in range(ROLLUP_LEVELS)]
+
+    def __len__(self):
+        return self.count
+
+    def append(self, value):
+        self.raw[self.count % RAW_POINTS] = value
+        self.count += 1
+        self.fold(0, value, value, value)
+
+    def fold(self, level, low, high, mean):
+        pending = self.pending[level]
+        if pending[3]:
+            pending[0] = min(pending[0], low)
+            pending[1] = max(pending[1], high)
+            pending[2] += mean
+        else:
+            pending[:3] = low, high, mean
+        pending[3] += 1
+        if pending[3] == ROLLUP_FACTOR:
+            slot = self.buckets[level] % ROLLUP_POINTS
+            self.low[level, slot], self.high[level, slot] = pending[0], pending[1]
+            self.mean[level, slot] = pending[2] / ROLLUP_FACTOR
+            self.buckets[level] += 1
+            pending[3] = 0
+            if level + 1 < ROLLUP_LEVELS:
+                self.fold(level + 1, low=pending[0], high=pending[1], mean=self.mean[level, slot])
+
+    def series(self):
+        """(x, low, high, mean) from oldest to newest, each span drawn from the
+        finest resolution that still holds it."""
+        kept = min(self.count, RAW_POINTS)
+        first = self.count - kept
+        x = np.arange(first, self.count, dtype=float)
+        raw = np.roll(self.raw, -(self.count % RAW_POINTS))[-kept:] if self.count > RAW_POINTS else self.raw[:kept]
+        parts = [(x, raw, raw, raw)]
+        for level in range(ROLLUP_LEVELS):
+            span = ROLLUP_FACTOR ** (level + 1)
+            done = self.buckets[level]
+            # Buckets that end before the finer data starts, newest ROLLUP_POINTS at most.
+            last = min(done, first // span)
+            start = max(0, done - ROLLUP_POINTS)
+            if last <= start:
+                continue
+            slots = np.arange(start, last) % ROLLUP_POINTS
+            parts.append((np.arange(start, last, dtype=float) * span,
+                          self.low[level, slots], self.high[level, slots], self.mean[level, slots]))
+            first = start * span
+        parts.reverse()
+        return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+class LiveChart:
+    """Embedded usage chart redrawn on a throttled after() timer.
+
+    Lines are animated artists: a refresh restores the cached background and
+    blits just the lines, falling back to a full draw only when the data
+    outgrows the axis limits (which are then extended with headroom)."""
+
+    def __init__(self, master, history):
+        self.history = history
+        self.fig, self.ax = plt.subplots(figsize=(7, 2.6))
+        self.ax.set_title("Memory Usage Over Time")
+        self.ax.set_xlabel("Sample")
+        self.ax.set_ylabel("Allocated Memory (bytes)")
+        self.ax.set_xlim(0, 100)
+        self.ax.set_ylim(0, 1000)
+        self.range_lines = [self.ax.plot([], [], color="lightsteelblue", linewidth=0.8, animated=True)[0]
+                            for _ in range(2)]
+        self.mean_line, = self.ax.plot([], [], color="blue", linewidth=1.2, animated=True)
+        self.fig.tight_layout()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=master)
+        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=5)
+        self.background = None
+        self.canvas.mpl_connect("draw_event", self.on_draw)
+        self.dirty = False
+        self.canvas.draw()
+        master.after(REDRAW_MS, self.refresh, master)
+
+    def on_draw(self, event):
+        # Full draws skip animated artists; cache the empty axes and add them back.
+        self.background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self.draw_lines()
+
+    def draw_lines(self):
+        for line in self.range_lines + [self.mean_line]:
+            self.ax.draw_artist(line)
+
+    def refresh(self, master):
+        if self.dirty and len(self.history):
+            self.dirty = False
+            x, low, high, mean = self.history.series()
+            self.range_lines[0].set_data(x, low)
+            self.range_lines[1].set_data(x, high)
+            self.mean_line.set_data(x, mean)
+            x_max, y_max = x[-1], high.max()
+            _, x_limit = self.ax.get_xlim()
+            _, y_limit = self.ax.get_ylim()
+            if x_max > x_limit or y_max > y_limit or y_max < y_limit / 4:
+                self.ax.set_xlim(0, max(100, x_max * 1.5))
+                self.ax.set_ylim(0, max(1000, y_max * 1.25))
+                self.canvas.draw()
+            elif self.background is not None:
+                self.canvas.restore_region(self.background)
+                self.draw_lines()
+                self.canvas.blit(self.ax.bbox)
+        master.after(REDRAW_MS, self.refresh, master)
+
+
+def synthetic_events(total_events, chunk=SAMPLE_EVERY, seed=None, start=0):
+    """Yield (ops, ids, sizes, sites) chunks of about `chunk` events from SITES.
+
+    Allocation ids count up from `start`, one allocation per tick, with
+    exponential sizes and lifetimes;
+    a site's leak fraction of allocations is never freed. Each chunk is
+    generated with NumPy, leaving only the dict updates to the tracker."""
+    rng = np.random.default_rng(seed)
+    means = np.array([site[1] for site in SITES], dtype=float)
+    lifetimes = np.array([site[2] for site in SITES], dtype=float)
+    leak = np.array([site[3] for site in SITES])
+    pending_time = np.empty(0)
+    pending_id = np.empty(0, dtype=np.int64)
+    now = start
+    emitted = 0
+    # Roughly one free per allocation once warm, so `chunk` events span chunk/2 ticks.
+    ticks = max(1, chunk // 2)
+    while emitted < total_events:
+        ids = np.arange(now, now + ticks)
+        sites = rng.integers(0, len(SITES), ticks)
+        sizes = (16 + rng.exponential(means[sites])).astype(np.int64)
+        free_time = ids + rng.exponential(lifetimes[sites]) + 0.5
+        free_time[rng.random(ticks) < leak[sites]] = np.inf
+        pending_time = np.concatenate((pending_time, free_time))
+        pending_id = np.concatenate((pending_id, ids))
+        now += ticks
+
+        due = pending_time < now
+        event_time = np.concatenate((ids.astype(float), pending_time[due]))
+        order = np.argsort(event_time, kind="stable")[:total_events - emitted]
+        ops = np.concatenate((np.ones(ticks, bool), np.zeros(due.sum(), bool)))[order]
+        event_ids = np.concatenate((ids, pending_id[due]))[order]
+        event_sizes = np.concatenate((sizes, np.zeros(due.sum(), np.int64)))[order]
+        event_sites = np.concatenate((sites, np.zeros(due.sum(), np.int64)))[order]
+        pending_time, pending_id = pending_time[~due], pending_id[~due]
+        emitted += len(order)
+        yield ops.tolist(), event_ids.tolist(), event_sizes.tolist(), event_sites.tolist()
+
+
+def run_headless(events=HEADLESS_EVENTS, seed=None):
+    tracker = AllocationTracker()
+    start = time.perf_counter()
+    tracker.run(synthetic_events(events, seed=seed))
+    elapsed = time.perf_counter() - start
+    print(f"{tracker.clock:,} events in {elapsed:.2f} s ({tracker.clock / elapsed:,.0f} events/s)")
+    print(f"Live: {len(tracker.live):,} allocations, {tracker.total_bytes:,} bytes")
+    for site, slope, r2 in tracker.leaks():
+        print(f"LEAK {SITES[site][0]}: +{slope * 1e6:,.0f} bytes per 1M events (r^2 {r2:.2f}), "
+              f"{tracker.site_counts[site]:,} live allocations")
+    return tracker
+
+# -----------------------------
+# Profile a real Python target
+# -----------------------------
+def start_profile():
+    global profile_process
+    path = target_entry.get()
+    if not path:
+        messagebox.showwarning("No Target", "Choose a Python script to profile.")
+        return
+    if profile_process and profile_process.poll() is None:
+        messagebox.showwarning("Profiling", "A target is already running.")
+        return
+    read_fd, write_fd = os.pipe()
+    try:
+        interval = float(interval_entry.get())
+        if interval <= 0:
+            raise ValueError("Enter a positive snapshot interval")
+        if os.name == "nt":
+            # Windows has no pass_fds: hand the child the pipe's OS handle instead.
+            import msvcrt
+            channel = msvcrt.get_osfhandle(write_fd)
+            os.set_handle_inheritable(channel, True)
+            inherit = {"close_fds": False}
+        else:
+            channel = write_fd
+            inherit = {"pass_fds": (write_fd,)}
+        profile_process = subprocess.Popen(
+            [sys.executable, "-c", PROFILE_AGENT, str(channel), str(interval), str(PROFILE_FRAMES),
+             str(PROFILE_TOP), os.path.abspath(path), *shlex.split(args_entry.get())],
+            cwd=os.path.dirname(os.path.abspath(path)), **inherit)
+    except (OSError, ValueError) as e:
+        os.close(read_fd)
+        messagebox.showerror("Error", str(e))
+        return
+    finally:
+        # Only the child writes; closing our copy lets the reader see EOF when it exits.
+        os.close(write_fd)
+    profile_trends.clear()
+    profile_growth.clear()
+    memory_history.clear()
+    chart.dirty = True
+    threading.Thread(target=read_profile, args=(read_fd, profile_process), daemon=True).start()
+
+def stop_profile():
+    if profile_process and profile_process.poll() is None:
+        profile_process.terminate()
+
+def read_profile(read_fd, process):
+    # Worker thread: forward snapshots from the pipe to the Tk thread.
+    with os.fdopen(read_fd) as pipe:
+        for line in pipe:
+            profile_events.put(("snapshot", json.loads(line)))
+    profile_events.put(("exited", process.wait()))
+
+def poll_profile():
+    try:
+        while True:
+            kind, payload = profile_events.get_nowait()
+            if kind == "snapshot":
+                show_snapshot(payload)
+            else:
+                sites_text.insert(tk.END, f"\nTarget exited with code {payload}\n")
+    except queue.Empty:
+        pass
+    root.after(POLL_MS, poll_profile)
+
+def show_snapshot(snapshot):
+    """Diff the snapshot's growing sites against the previous one and list them."""
+    record_usage(snapshot["current"])
+    memory_text.delete("1.0", tk.END)
+    memory_text.insert(tk.END, f"Target traced memory: {snapshot['current']:,} bytes "
+                               f"(peak {snapshot['peak']:,}) at {snapshot['time']:.1f} s\n")
+
+    sites_text.delete("1.0", tk.END)
+    sites_text.insert(tk.END, f"{'Growth':>12} {'Since last':>11} {'Rate/s':>10} {'Blocks':>8}  Site\n")
+    for frames, size, growth, count in snapshot["sites"]:
+        if not frames:
+            continue
+        key = tuple(frames)
+        trend = profile_trends[key]
+        trend.update(snapshot["time"], size)
+        delta = growth - profile_growth.get(key, 0)
+        profile_growth[key] = growth
+        flag = "LEAK " if trend.is_leaking() else ""
+        sites_text.insert(tk.END, f"{growth:>12,} {delta:>+11,} {trend.slope():>10,.0f} {count:>8,}  "
+                                  f"{flag}{frames[-1]}\n")
+        for frame in reversed(frames[:-1]):
+            sites_text.insert(tk.END, f"{'':>45}  called from {frame}\n")
+
+def browse_target():
+    path = filedialog.askopenfilename(title="Select Python Script", filetypes=[("Python", "*.py"), ("All", "*")])
+    if path:
+        target_entry.delete(0, tk.END)
+        target_entry.insert(0, path)
 
 # -----------------------------
 # Simulate memory allocation
 # -----------------------------
 def allocate_memory():
-    # Allocate random bytes (simulate memory usage)
+    # Allocate random bytes (simulate memory usage) from a random call site
     mem = random.randint(10, 100)  # bytes
-    allocations.append(mem)
+    tracker.allocate(mem, random.randrange(len(SITES)))
     update_memory_history()
     
 # -----------------------------
 # Simulate memory deallocation
 # -----------------------------
 def deallocate_memory():
-    if allocations:
-        allocations.pop(0)  # Free oldest allocation
+    tracker.free_oldest()  # Free oldest allocation
     update_memory_history()
 
+# -----------------------------
+# Continuous simulation
+# -----------------------------
+def toggle_simulation():
+    global simulation
+    if simulation is None:
+        # Manual allocations would collide with the generator's ids while it runs;
+        # starting past next_id keeps earlier live blocks intact.
+        simulation = synthetic_events(sys.maxsize, start=tracker.next_id)
+        for button in manual_buttons:
+            button.config(state=tk.DISABLED)
+        simulate_button.config(text="Stop Simulation")
+        root.after(SIM_TICK_MS, simulate_tick)
+    else:
+        simulation = None
+        for button in manual_buttons:
+            button.config(state=tk.NORMAL)
+        simulate_button.config(text="Run Simulation")
+
+def simulate_tick():
+    if simulation is None:
+        return
+    tracker.run([next(simulation)])
+    update_memory_history()
+    root.after(SIM_TICK_MS, simulate_tick)
+
 # -----------------------------
 # Update memory usage history
 # -----------------------------
-def update_memory_history():
-    total_mem = sum(allocations)
+def record_usage(total_mem):
+    # O(1): the chart picks up new samples on its next timer tick.
     memory_history.append(total_mem)
+    chart.dirty = True
+
+def update_memory_history():
+    total_mem = tracker.total_bytes
+    record_usage(total_mem)
     memory_text.delete("1.0", tk.END)
     memory_text.insert(tk.END, f"Current Allocated Memory: {total_mem} bytes\n")
-    memory_text.insert(tk.END, f"Number of allocations: {len(allocations)}\n")
+    memory_text.insert(tk.END, f"Number of allocations: {len(tracker.live)}\n")
+    for site, slope, r2 in tracker.leaks():
+        memory_text.insert(tk.END, f"Possible leak: {SITES[site][0]} "
+                                   f"(+{slope:.1f} bytes/event, r^2 {r2:.2f})\n")
 
-# -----------------------------
-# Plot memory usage
-# -----------------------------
-def plot_memory():
-    if not memory_history:
-        messagebox.showwarning("No Data", "No memory usage data to plot.")
-        return
-    fig, ax = plt.subplots(figsize=(5,3))
-    ax.plot(memory_history, marker='o', linestyle='-', color='blue')
-    ax.set_title("Memory Usage Over Time")
-    ax.set_xlabel("Simulation Step")
-    ax.set_ylabel("Allocated Memory (bytes)")
-    plt.show()
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    # python "Memory Leak Detector Simulator.py" --headless [events]
+    args = sys.argv[sys.argv.index("--headless") + 1:]
+    run_headless(int(args[0]) if args else HEADLESS_EVENTS)
+    sys.exit()
+
+# Memory simulation variables
+tracker = AllocationTracker()
+memory_history = UsageHistory()
+simulation = None  # synthetic_events generator while the simulation runs
+profile_process = None
+profile_events = queue.Queue()
+profile_trends = defaultdict(SiteTrend)  # traceback -> trend of its live bytes over seconds
+profile_growth = {}  # traceback -> growth since start at the previous snapshot
 
 # -----------------------------
 # GUI Setup
 # -----------------------------
 root = tk.Tk()
 root.title("Memory Leak Detector Simulator")
-root.geometry("550x400")
+root.geometry("800x1000")
 
 tk.Label(root, text="Memory Leak Detector Simulator",
          font=("Arial", 16, "bold")).pack(pady=10)
 
-tk.Button(root, text="Allocate Memory", command=allocate_memory,
-          bg="green", fg="white", width=20).pack(pady=5)
-
-tk.Button(root, text="Deallocate Memory", command=deallocate_memory,
-          bg="red", fg="white", width=20).pack(pady=5)
-
-tk.Button(root, text="Plot Memory Usage", command=plot_memory,
-          bg="blue", fg="white", width=20).pack(pady=5)
+button_frame = tk.Frame(root)
+button_frame.pack(pady=5)
+manual_buttons = [
+    tk.Button(button_frame, text="Allocate Memory", command=allocate_memory,
+              bg="green", fg="white", width=20),
+    tk.Button(button_frame, text="Deallocate Memory", command=deallocate_memory,
+              bg="red", fg="white", width=20),
+]
+simulate_button = tk.Button(button_frame, text="Run Simulation", command=toggle_simulation,
+                            bg="blue", fg="white", width=20)
+for button in manual_buttons + [simulate_button]:
+    button.pack(side="left", padx=5)
 
 tk.Label(root, text="Memory Status:", font=("Arial", 12, "bold")).pack(pady=5)
 
-memory_text = tk.Text(root, height=8, width=60, bg="#f4f4f4")
+memory_text = tk.Text(root, height=6, width=60, bg="#f4f4f4")
 memory_text.pack(padx=10, pady=5)
 
+chart = LiveChart(root, memory_history)
+
+profile_frame = tk.LabelFrame(root, text="Profile a Python Script (tracemalloc)")
+profile_frame.pack(fill="both", expand=True, padx=10, pady=5)
+
+tk.Label(profile_frame, text="Script:").grid(row=0, column=0, sticky="w")
+target_entry = tk.Entry(profile_frame, width=50)
+target_entry.grid(row=0, column=1, columnspan=2, sticky="we")
+tk.Button(profile_frame, text="Browse", command=browse_target).grid(row=0, column=3)
+
+tk.Label(profile_frame, text="Arguments:").grid(row=1, column=0, sticky="w")
+args_entry = tk.Entry(profile_frame, width=50)
+args_entry.grid(row=1, column=1, columnspan=2, sticky="we")
+
+tk.Label(profile_frame, text="Snapshot Interval (s):").grid(row=2, column=0, sticky="w")
+interval_entry = tk.Entry(profile_frame, width=8)
+interval_entry.insert(0, "1.0")
+interval_entry.grid(row=2, column=1, sticky="w")
+tk.Button(profile_frame, text="Start Profiling", command=start_profile,
+          bg="purple", fg="white").grid(row=2, column=2, sticky="e")
+tk.Button(profile_frame, text="Stop", command=stop_profile).grid(row=2, column=3)
+
+sites_text = tk.Text(profile_frame, height=10, width=90, bg="#f4f4f4", font=("Courier", 9))
+sites_text.grid(row=3, column=0, columnspan=4, sticky="nsew", pady=5)
+profile_frame.columnconfigure(1, weight=1)
+profile_frame.rowconfigure(3, weight=1)
+
+root.after(POLL_MS, poll_profile)
 root.mainloop()
\ No newline at end of file
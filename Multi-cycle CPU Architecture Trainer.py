@@ -1,5 +1,6 @@
 import tkinter as tk
-import time
+from tkinter import messagebox
+import re
 
 CYCLES = [
     "Fetch Instruction",
@@ -8,28 +9,143 @@ CYCLES = [
     "Memory Access",
     "Write Back"
 ]
+STAGE_PS = [200, 100, 200, 200, 100]  # datapath latency of each step above, in picoseconds
+
+# Opcode class -> indices into CYCLES that the multi-cycle datapath steps through
+CLASS_STEPS = {
+    "LOAD": [0, 1, 2, 3, 4],
+    "STORE": [0, 1, 2, 3],
+    "R-type": [0, 1, 2, 4],
+    "BRANCH": [0, 1, 2],
+    "JUMP": [0, 1, 2],
+}
+OPCODE_CLASSES = {
+    "LW": "LOAD", "LOAD": "LOAD", "LB": "LOAD", "LH": "LOAD",
+    "SW": "STORE", "STORE": "STORE", "SB": "STORE", "SH": "STORE",
+    "BEQ": "BRANCH", "BNE": "BRANCH", "BLT": "BRANCH", "BGE": "BRANCH",
+    "J": "JUMP", "JAL": "JUMP", "JR": "JUMP", "JMP": "JUMP",
+}  # anything else (ADD, SUB, AND, OR, SLT, ADDI, ...) is R-type
+PIPELINE_DEPTH = len(CYCLES)
+LOAD_USE_STALL = 1  # bubble when the next instruction reads a load's result, even with forwarding
+CONTROL_PENALTY = 1  # bubble after each branch or jump, resolved in decode
+ANIMATE_LIMIT = 200  # larger programs report totals without animating
+REGISTER_TOKEN = re.compile(r"(?<![#\w])[A-Z_$][\w$]*")  # operands starting with a letter; #4, 8(R2) offset are not
+
+animation = None  # after() id of the next animation step, or None when idle
+
+def classify(line):
+    """(opcode class, destination register or None, registers read) for one instruction."""
+    opcode, _, operands = line.strip().partition(" ")
+    kind = OPCODE_CLASSES.get(opcode.upper(), "R-type")
+    registers = REGISTER_TOKEN.findall(operands.upper())
+    if kind in ("STORE", "BRANCH", "JUMP"):
+        return kind, None, registers
+    return kind, registers[0] if registers else None, registers[1:]
+
+def compare_datapaths(instructions):
+    """Single-cycle, multi-cycle and 5-stage pipelined cost of one program, in one pass.
+
+    Single-cycle: every instruction takes one clock as long as the slowest
+    instruction class. Multi-cycle: per-class cycle counts at a clock as long
+    as the slowest step. Pipelined: same short clock, PIPELINE_DEPTH - 1 fill
+    cycles, then one instruction per cycle plus load-use and control bubbles."""
+    counts = dict.fromkeys(CLASS_STEPS, 0)
+    multi_cycles = load_use = control = 0
+    previous_load = None  # destination of the previous instruction if it was a load
+    for line in instructions:
+        kind, dest, sources = classify(line)
+        counts[kind] += 1
+        multi_cycles += len(CLASS_STEPS[kind])
+        if previous_load is not None and previous_load in sources:
+            load_use += 1
+        if kind in ("BRANCH", "JUMP"):
+            control += 1
+        previous_load = dest if kind == "LOAD" else None
+    n = len(instructions)
+    single_period = max(sum(STAGE_PS[step] for step in steps) for steps in CLASS_STEPS.values())
+    step_period = max(STAGE_PS)
+    pipe_cycles = (n + PIPELINE_DEPTH - 1 + LOAD_USE_STALL * load_use + CONTROL_PENALTY * control) if n else 0
+    return {
+        "instructions": n,
+        "counts": counts,
+        "single": (n, single_period),
+        "multi": (multi_cycles, step_period),
+        "pipelined": (pipe_cycles, step_period),
+        "load_use": load_use,
+        "control": control,
+    }
+
+def report(result):
+    n = result["instructions"]
+    output_box.insert(tk.END, f"\nInstructions: {n:,}  ("
+                      + ", ".join(f"{kind} {count:,}" for kind, count in result["counts"].items() if count)
+                      + ")\n")
+    output_box.insert(tk.END, f"{'Datapath':<14}{'Clock (ps)':>11}{'Cycles':>12}{'CPI':>7}{'Time (ns)':>13}{'Speedup':>9}\n")
+    single_time = result["single"][0] * result["single"][1]
+    for name, key in (("Single-cycle", "single"), ("Multi-cycle", "multi"), ("Pipelined", "pipelined")):
+        cycles, period = result[key]
+        time_ps = cycles * period
+        output_box.insert(tk.END, f"{name:<14}{period:>11,}{cycles:>12,}{cycles / max(n, 1):>7.2f}"
+                                  f"{time_ps / 1000:>13,.1f}{single_time / max(time_ps, 1):>9.2f}\n")
+    output_box.insert(tk.END, f"Pipeline bubbles: {result['load_use']:,} load-use, "
+                              f"{result['control']:,} control\n")
+    output_box.see(tk.END)
+
+def animation_steps(instructions):
+    # One item per multi-cycle step: the text to show for it.
+    for instr in instructions:
+        kind, _, _ = classify(instr)
+        yield f"\nInstruction: {instr}  [{kind}, {len(CLASS_STEPS[kind])} cycles]\n"
+        for step in CLASS_STEPS[kind]:
+            yield f"  → {CYCLES[step]}\n"
 
 def run_trainer():
+    stop_animation()
     output_box.delete("1.0", tk.END)
-    instructions = instruction_box.get("1.0", tk.END).strip().split("\n")
+    instructions = [line for line in instruction_box.get("1.0", tk.END).split("\n") if line.strip()]
+    if not instructions:
+        messagebox.showerror("Error", "Enter at least one instruction")
+        return
+    try:
+        delay_ms = max(1, int(delay_var.get() * 1000))
+    except (tk.TclError, ValueError):
+        messagebox.showerror("Error", "Enter a numeric cycle delay")
+        return
 
-    cycle_delay = delay_var.get()
-    total_cycles = 0
+    result = compare_datapaths(instructions)
+    if len(instructions) > ANIMATE_LIMIT:
+        output_box.insert(tk.END, f"{len(instructions):,} instructions: animation skipped "
+                                  f"(limit {ANIMATE_LIMIT}).\n")
+        report(result)
+        return
+    stop_button.config(state=tk.NORMAL)
+    step(animation_steps(instructions), delay_ms, result)
 
-    for instr in instructions:
-        output_box.insert(tk.END, f"\nInstruction: {instr}\n")
-        for cycle in CYCLES:
-            output_box.insert(tk.END, f"  → {cycle}\n")
-            output_box.update()
-            time.sleep(cycle_delay)
-            total_cycles += 1
+def step(steps, delay_ms, result):
+    global animation
+    text = next(steps, None)
+    if text is None:
+        animation = None
+        stop_button.config(state=tk.DISABLED)
+        report(result)
+        return
+    output_box.insert(tk.END, text)
+    output_box.see(tk.END)
+    # Instruction headers are not cycles, so show the next step at once.
+    animation = root.after(0 if text.startswith("\n") else delay_ms, step, steps, delay_ms, result)
 
-    output_box.insert(tk.END, f"\nTotal Cycles Executed: {total_cycles}")
+def stop_animation():
+    global animation
+    if animation is not None:
+        root.after_cancel(animation)
+        animation = None
+        output_box.insert(tk.END, "\nAnimation stopped.\n")
+    stop_button.config(state=tk.DISABLED)
 
 # GUI Setup
 root = tk.Tk()
 root.title("Multi-cycle CPU Architecture Trainer")
-root.geometry("650x500")
+root.geometry("700x560")
 
 tk.Label(root, text="Enter Instructions (one per line):").pack(pady=5)
 
@@ -40,10 +156,14 @@ delay_var = tk.DoubleVar(value=0.7)
 tk.Label(root, text="Cycle Delay (seconds):").pack()
 tk.Entry(root, textvariable=delay_var).pack()
 
-tk.Button(root, text="Run Multi-cycle Execution", command=run_trainer).pack(pady=10)
+button_frame = tk.Frame(root)
+button_frame.pack(pady=10)
+tk.Button(button_frame, text="Run Multi-cycle Execution", command=run_trainer).pack(side=tk.LEFT, padx=5)
+stop_button = tk.Button(button_frame, text="Stop", command=stop_animation, state=tk.DISABLED)
+stop_button.pack(side=tk.LEFT, padx=5)
 
 tk.Label(root, text="Execution Cycles:").pack()
-output_box = tk.Text(root, height=18, width=70)
+output_box = tk.Text(root, height=20, width=84, font=("Courier", 9))
 output_box.pack()
 
 root.mainloop()
@@ -1,15 +1,506 @@
 import tkinter as tk
-from tkinter import ttk
-import random
+from tkinter import ttk, messagebox, filedialog
+import glob
+import math
+import os
+import queue
+import re
+import threading
 import time
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+CHUNK_SIZE = 1 << 22  # accesses generated per block; bounds peak memory
+MIGRATION_SCAN = 1 << 16  # accesses between AutoNUMA-style scans
+MIGRATION_NS = 5000  # cost charged for copying one page to another node
+SLIT_LOCAL = 10  # SLIT distances are normalised so that local == 10
+POLL_MS = 100
+POLICIES = ["Uniform random", "First-touch", "Interleave", "Preferred node"]
+CONTENTION_MODELS = ["Off", "M/D/1", "Measured curve"]
+LINE_BYTES = 64  # every access moves one cache line
+RHO_CAP = 0.99  # M/D/1 wait is evaluated below this; the rest shows up as backlog
+SATURATION_UTIL = 0.95
+MAX_OUTSTANDING = 10  # misses in flight per thread (line fill buffers) before it stalls
+PAGE_SHIFT = 12
+MAX_DENSE_PAGES = 1 << 22  # larger page-number spans are compacted first
+DENSE_SPAN_PER_ACCESS = 2  # ...as are spans much wider than the trace itself
+HEATMAP_BINS = 64
+TOP_PAGES = 10
+
+
+# ---------- Topology ----------
+
+def synthetic_latency(nodes, local_ns, remote_ns):
+    """Two-level latency matrix: local_ns on the diagonal, remote_ns elsewhere."""
+    latency = np.full((nodes, nodes), float(remote_ns))
+    np.fill_diagonal(latency, local_ns)
+    return latency
+
+
+def read_node_distances(sysfs_root="/sys/devices/system/node"):
+    """SLIT distance matrix from node*/distance, or None if it cannot be read."""
+    paths = glob.glob(os.path.join(sysfs_root, "node[0-9]*", "distance"))
+    paths.sort(key=lambda path: int(re.search(r"node(\d+)", path).group(1)))
+    rows = []
+    for path in paths:
+        try:
+            with open(path) as f:
+                rows.append([int(x) for x in f.read().split()])
+        except (OSError, ValueError):
+            return None
+    if not rows or any(len(row) != len(rows) for row in rows):
+        return None
+    return np.array(rows)
+
+
+def distances_to_latency(distances, local_ns):
+    return distances * (local_ns / SLIT_LOCAL)
+
+
+def parse_matrix(text):
+    rows = [[float(x) for x in line.replace(",", " ").split()]
+            for line in text.strip().splitlines() if line.strip()]
+    if not rows or any(len(row) != len(rows) for row in rows):
+        raise ValueError("Latency matrix must be square (one row per node).")
+    return np.array(rows)
+
+
+def format_matrix(latency):
+    return "\n".join(" ".join(f"{v:g}" for v in row) for row in latency)
+
+
+# ---------- Simulation engine ----------
+
+def node_dtype(nodes):
+    return np.uint8 if nodes <= 256 else np.uint16
+
+
+def simulate_uniform(latency, accesses, rng=None, chunk_size=CHUNK_SIZE, progress=None):
+    """Uniform random placement, generated and scored in fixed-size blocks.
+
+    Returns (local_count, remote_count, total_latency_ns).
+    """
+    rng = rng or np.random.default_rng()
+    nodes = len(latency)
+    dtype = node_dtype(nodes)
+    pair_counts = np.zeros(nodes * nodes, dtype=np.int64)
+    done = 0
+    while done < accesses:
+        size = min(chunk_size, accesses - done)
+        accessing = rng.integers(0, nodes, size=size, dtype=dtype)
+        memory = rng.integers(0, nodes, size=size, dtype=dtype)
+        pair = accessing.astype(np.intp) * nodes + memory
+        pair_counts += np.bincount(pair, minlength=nodes * nodes)
+        done += size
+        if progress:
+            progress(done, accesses)
+    local_count = int(np.trace(pair_counts.reshape(nodes, nodes)))
+    total_latency = float(pair_counts @ latency.ravel())
+    return local_count, accesses - local_count, total_latency
+
+
+def expected_uniform(latency, accesses):
+    """Closed-form expectation for uniform placement.
+
+    An access is local with probability 1/nodes, so the local count is
+    Binomial(accesses, 1/nodes), and every (thread node, memory node) pair
+    is equally likely. Returns (expected_local, local_stddev,
+    expected_avg_latency_ns).
+    """
+    p_local = 1 / len(latency)
+    expected_local = accesses * p_local
+    local_stddev = math.sqrt(accesses * p_local * (1 - p_local))
+    return expected_local, local_stddev, float(latency.mean())
+
+
+# ---------- Bandwidth contention ----------
+
+def parse_curve(text):
+    """'util:extra_ns, ...' pairs for a measured latency-vs-utilisation curve."""
+    points = sorted((float(u), float(ns)) for u, ns in
+                    (item.split(":") for item in text.replace(" ", "").split(",") if item))
+    if len(points) < 2:
+        raise ValueError("A measured curve needs at least two util:ns points.")
+    return np.array([u for u, _ in points]), np.array([ns for _, ns in points])
+
+
+def queue_delays(demand, capacity, slice_ns, backlog, backlog_cap, curve=None):
+    """Queueing delay per slice for independent resources (controllers or links).
+
+    `demand` is bytes requested, shaped (slices, resources); `capacity` is the
+    bytes each resource can move in one slice. Demand that does not fit carries
+    over as backlog, and its drain time is added to every access of the next
+    slice. The backlog never exceeds `backlog_cap`, the bytes all threads can
+    have in flight; past that the threads stall instead of issuing more. Below
+    saturation the wait is M/D/1 with one cache line as the fixed service
+    time, or read off a measured `curve` of (utilisation, extra ns).
+    Returns (delay_ns, offered load / capacity, backlog).
+    """
+    util = np.empty(demand.shape)
+    drain = np.empty(demand.shape)
+    for s in range(demand.shape[0]):
+        offered = demand[s] + backlog
+        util[s] = offered / capacity
+        backlog = np.minimum(np.maximum(offered - capacity, 0.0), backlog_cap)
+        drain[s] = backlog * slice_ns / capacity
+    if curve is None:
+        service_ns = LINE_BYTES * slice_ns / capacity
+        rho = np.minimum(util, RHO_CAP)
+        wait = rho * service_ns / (2 * (1 - rho))
+    else:
+        wait = np.interp(util, curve[0], curve[1])
+    return wait + drain, util, backlog
+
+
+class LoadTracker:
+    """Running utilisation statistics for one set of resources.
+
+    util_sum accumulates the fraction of capacity actually used; util_peak is
+    the highest offered load seen, which exceeds 1 when demand outruns supply.
+    """
+
+    def __init__(self, resources):
+        self.backlog = np.zeros(resources)
+        self.util_sum = np.zeros(resources)
+        self.util_peak = np.zeros(resources)
+        self.saturated = np.zeros(resources, dtype=np.int64)
+        self.first_saturated = np.full(resources, -1, dtype=np.int64)
+
+    def update(self, util, first_slice):
+        self.util_sum += np.minimum(util, 1.0).sum(axis=0)
+        self.util_peak = np.maximum(self.util_peak, util.max(axis=0))
+        hot = util >= SATURATION_UTIL
+        self.saturated += hot.sum(axis=0)
+        first = np.where(hot.any(axis=0), hot.argmax(axis=0) + first_slice, -1)
+        fresh = (self.first_saturated < 0) & (first >= 0)
+        self.first_saturated[fresh] = first[fresh]
+
+
+def round_robin_affinity(threads, nodes):
+    return np.arange(threads) % nodes
+
+
+def initial_placement(policy, pages, nodes, preferred_node=0, init_node=None):
+    """Page -> node array; -1 marks pages still waiting for their first touch."""
+    if policy == "Interleave":
+        return (np.arange(pages) % nodes).astype(np.int32)
+    if policy == "Preferred node":
+        return np.full(pages, preferred_node, dtype=np.int32)
+    if init_node is not None:
+        # A single thread initialises everything, so first touch lands on its node.
+        return np.full(pages, init_node, dtype=np.int32)
+    return np.full(pages, -1, dtype=np.int32)
+
+
+def generate_accesses(rng, size, threads, pages, share_fraction):
+    """Each thread mostly touches its own slice of pages, sometimes any page."""
+    thread = rng.integers(0, threads, size=size)
+    pages_per_thread = max(pages // threads, 1)
+    own = thread * pages_per_thread + rng.integers(0, pages_per_thread, size=size)
+    shared = rng.random(size) < share_fraction
+    page = np.where(shared, rng.integers(0, pages, size=size), np.minimum(own, pages - 1))
+    return thread, page
+
+
+def simulate_placement(latency, affinity, pages, accesses, policy,
+                       share_fraction=0.1, preferred_node=0, serial_init=False,
+                       migrate_after=0, contention=None, rng=None, progress=None):
+    """Threads pinned to nodes by `affinity` access pages placed by `policy`.
+
+    With migrate_after=K > 0, pages are scanned every MIGRATION_SCAN accesses
+    and any page with K or more remote accesses since its last move migrates to
+    the node that accessed it most.
+
+    `contention` (keys node_gbps, link_gbps, slice_ns, per_slice, curve) splits
+    the stream into time slices of `per_slice` accesses and adds queueing delay
+    at each node's memory controller and on each directed interconnect link.
+    """
+    rng = rng or np.random.default_rng()
+    nodes = len(latency)
+    affinity = np.asarray(affinity)
+    threads = len(affinity)
+    page_node = initial_placement(policy, pages, nodes, preferred_node,
+                                  affinity[0] if serial_init else None)
+    if migrate_after:
+        fault_counts = np.zeros((pages, nodes), dtype=np.int32)
+    chunk_size = MIGRATION_SCAN if migrate_after else CHUNK_SIZE
+    if contention:
+        # Keep chunks a whole number of slices so slice boundaries line up.
+        per_slice = contention["per_slice"]
+        chunk_size = per_slice * max(1, chunk_size // per_slice)
+        slice_ns = contention["slice_ns"]
+        node_capacity = contention["node_gbps"] * slice_ns  # GB/s == bytes/ns
+        link_capacity = contention["link_gbps"] * slice_ns
+        backlog_cap = threads * MAX_OUTSTANDING * LINE_BYTES
+        node_load = LoadTracker(nodes)
+        link_load = LoadTracker(nodes * nodes)
+        queue_latency = 0.0
+
+    node_accesses = np.zeros(nodes, dtype=np.int64)
+    node_local = np.zeros(nodes, dtype=np.int64)
+    node_latency = np.zeros(nodes)
+    migrations = 0
+    done = 0
+    while done < accesses:
+        size = min(chunk_size, accesses - done)
+        thread, page = generate_accesses(rng, size, threads, pages, share_fraction)
+        thread_node = affinity[thread]
+
+        unplaced = page_node[page] < 0
+        if unplaced.any():
+            # First touch: the earliest access to a page in this block places it.
+            first_pages, first_index = np.unique(page[unplaced], return_index=True)
+            page_node[first_pages] = thread_node[unplaced][first_index]
+
+        memory_node = page_node[page]
+        access_latency = latency[thread_node, memory_node]
+        local = thread_node == memory_node
+        if contention:
+            slice_index = np.arange(size) // per_slice
+            slices = int(slice_index[-1]) + 1
+            first_slice = done // per_slice
+            node_demand = np.bincount(slice_index * nodes + memory_node,
+                                      minlength=slices * nodes).reshape(slices, nodes)
+            node_delay, node_util, node_load.backlog = queue_delays(
+                node_demand * LINE_BYTES, node_capacity, slice_ns,
+                node_load.backlog, backlog_cap, contention["curve"])
+            node_load.update(node_util, first_slice)
+
+            remote = ~local
+            link = thread_node * nodes + memory_node
+            link_demand = np.bincount(slice_index[remote] * nodes * nodes + link[remote],
+                                      minlength=slices * nodes * nodes).reshape(slices, nodes * nodes)
+            link_delay, link_util, link_load.backlog = queue_delays(
+                link_demand * LINE_BYTES, link_capacity, slice_ns,
+                link_load.backlog, backlog_cap, contention["curve"])
+            link_load.update(link_util, first_slice)
+
+            extra = node_delay[slice_index, memory_node]
+            extra[remote] += link_delay[slice_index[remote], link[remote]]
+            queue_latency += float(extra.sum())
+            access_latency = access_latency + extra
+        node_accesses += np.bincount(thread_node, minlength=nodes)
+        node_local += np.bincount(thread_node[local], minlength=nodes)
+        node_latency += np.bincount(thread_node, weights=access_latency, minlength=nodes)
+
+        if migrate_after:
+            remote = ~local
+            keys, counts = np.unique(page[remote] * nodes + thread_node[remote],
+                                     return_counts=True)
+            fault_counts.reshape(-1)[keys] += counts.astype(np.int32)
+            candidates = np.unique(keys // nodes)
+            ready = candidates[fault_counts[candidates].sum(axis=1) >= migrate_after]
+            target = fault_counts[ready].argmax(axis=1)
+            changed = target != page_node[ready]
+            page_node[ready[changed]] = target[changed]
+            fault_counts[ready] = 0
+            migrations += int(changed.sum())
+
+        done += size
+        if progress:
+            progress(done, accesses)
+
+    total_latency = float(node_latency.sum()) + migrations * MIGRATION_NS
+    result = {
+        "node_accesses": node_accesses,
+        "node_local": node_local,
+        "node_latency": node_latency,
+        "migrations": migrations,
+        "total_latency": total_latency,
+        "pages_per_node": np.bincount(page_node[page_node >= 0], minlength=nodes),
+    }
+    if contention:
+        result["slices"] = -(-accesses // per_slice)
+        result["node_load"] = node_load
+        result["link_load"] = link_load
+        result["queue_latency"] = queue_latency
+    return result
+
+
+# ---------- Trace replay ----------
+
+def load_trace(path):
+    """Return (thread, address, is_write) arrays.
+
+    .npz files hold `thread`, `address` and `write` arrays. Text files have
+    one `thread, address, R|W` record per line; addresses may be hex (0x...)
+    and lines starting with # are ignored.
+    """
+    if path.endswith(".npz"):
+        data = np.load(path)
+        address = data["address"]
+        if address.dtype.kind not in "iu" or (address.dtype.kind == "i" and address.size and address.min() < 0):
+            raise ValueError(f"{path}: addresses must be non-negative integers.")
+        return (data["thread"].astype(np.int64), address.astype(np.uint64),
+                data["write"].astype(bool))
+    threads, addresses, writes = [], [], []
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            fields = line.replace(",", " ").split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            try:
+                thread, address = int(fields[0], 0), int(fields[1], 0)
+                write = fields[2].upper().startswith("W") if len(fields) > 2 else False
+            except (ValueError, IndexError):
+                if line_no == 1:
+                    continue  # header row
+                raise ValueError(f"{path}:{line_no}: expected 'thread, address, R|W'")
+            if not 0 <= address < 1 << 64:
+                raise ValueError(f"{path}:{line_no}: address {fields[1]} is outside 0..2^64-1")
+            if not -(1 << 63) <= thread < 1 << 63:
+                raise ValueError(f"{path}:{line_no}: thread id {fields[0]} does not fit in 64 bits")
+            threads.append(thread)
+            addresses.append(address)
+            writes.append(write)
+    if not threads:
+        raise ValueError(f"{path} contains no trace records.")
+    return (np.array(threads, dtype=np.int64), np.array(addresses, dtype=np.uint64),
+            np.array(writes, dtype=bool))
+
+
+def load_page_mapping(path):
+    """(page_numbers, nodes) from a text file of `page node` pairs."""
+    pages, nodes = [], []
+    with open(path) as f:
+        for line_no, line in enumerate(f, 1):
+            fields = line.replace(",", " ").split()
+            if not fields or fields[0].startswith("#"):
+                continue
+            try:
+                page, node = int(fields[0], 0), int(fields[1], 0)
+            except (ValueError, IndexError):
+                raise ValueError(f"{path}:{line_no}: expected 'page node'")
+            if page < 0 or node < 0:
+                raise ValueError(f"{path}:{line_no}: page and node numbers must not be negative")
+            pages.append(page)
+            nodes.append(node)
+    return np.array(pages, dtype=np.uint64), np.array(nodes, dtype=np.int32)
+
+
+def index_pages(page_number):
+    """Map page numbers to indices into a page-number-indexed table.
+
+    The table is dense (index = page - lowest page) unless the span of page
+    numbers is too large or too sparse for the trace, in which case only
+    touched pages get a slot.
+    Returns (index per access, page number per table slot).
+    """
+    base = int(page_number.min())
+    span = int(page_number.max()) - base + 1
+    if span <= min(MAX_DENSE_PAGES, DENSE_SPAN_PER_ACCESS * page_number.size):
+        return (page_number - np.uint64(base)).astype(np.intp), np.arange(base, base + span, dtype=np.uint64)
+    table_pages, index = np.unique(page_number, return_inverse=True)
+    return index.astype(np.intp), table_pages
+
+
+def trace_placement(policy, table_pages, page_index, thread_node, nodes,
+                    preferred_node=0, mapping=None, rng=None):
+    """Node for every page-table slot; -1 for slots the trace never touches."""
+    rng = rng or np.random.default_rng()
+    page_node = np.full(table_pages.size, -1, dtype=np.int32)
+    touched, first_index = np.unique(page_index, return_index=True)
+    if policy == "First-touch":
+        page_node[touched] = thread_node[first_index]
+    elif policy == "Interleave":
+        page_node[touched] = (table_pages[touched] % np.uint64(nodes)).astype(np.int32)
+    elif policy == "Preferred node":
+        page_node[touched] = preferred_node
+    else:
+        page_node[touched] = rng.integers(0, nodes, size=touched.size)
+    if mapping is not None:
+        mapped_pages, mapped_nodes = mapping
+        slots = np.searchsorted(table_pages, mapped_pages)
+        found = (slots < table_pages.size) & (table_pages[np.minimum(slots, table_pages.size - 1)] == mapped_pages)
+        slots, mapped_nodes = slots[found], mapped_nodes[found]
+        keep = page_node[slots] >= 0
+        page_node[slots[keep]] = mapped_nodes[keep]
+    return page_node
+
+
+def replay_trace(trace, latency, policy, affinity=None, preferred_node=0, mapping=None,
+                 page_shift=PAGE_SHIFT, chunk_size=CHUNK_SIZE, progress=None):
+    """Replay recorded (thread, address, R/W) accesses against a page -> node mapping.
+
+    Threads are numbered in sorted order of their trace ids and pinned with
+    `affinity` (round-robin over nodes when omitted).
+    """
+    trace_thread, address, is_write = trace
+    nodes = len(latency)
+    thread_ids, thread = np.unique(trace_thread, return_inverse=True)
+    threads = thread_ids.size
+    if affinity is None:
+        affinity = round_robin_affinity(threads, nodes)
+    affinity = np.asarray(affinity)
+    if affinity.size < threads:
+        raise ValueError(f"Trace has {threads} threads but only {affinity.size} affinities were given.")
+    thread_node = affinity[thread]
+
+    page_index, table_pages = index_pages(address >> np.uint64(page_shift))
+    page_node = trace_placement(policy, table_pages, page_index, thread_node, nodes,
+                                preferred_node, mapping)
+    if page_node.max(initial=-1) >= nodes:
+        raise ValueError("Page mapping refers to a node outside the latency matrix.")
+    pages = table_pages.size
+    bins = min(HEATMAP_BINS, pages)
+
+    thread_nodes = np.zeros((threads, nodes), dtype=np.int64)
+    thread_latency = np.zeros(threads)
+    remote_writes = 0
+    remote_all = np.empty(thread.size, dtype=bool)
+    region_remote = np.zeros((bins, threads), dtype=np.int64)
+    total = thread.size
+    for start in range(0, total, chunk_size):
+        part = slice(start, min(start + chunk_size, total))
+        t, idx, cpu = thread[part], page_index[part], thread_node[part]
+        memory_node = page_node[idx]
+        remote = cpu != memory_node
+        remote_all[part] = remote
+        thread_nodes += np.bincount(t * nodes + memory_node,
+                                    minlength=threads * nodes).reshape(threads, nodes)
+        thread_latency += np.bincount(t, weights=latency[cpu, memory_node], minlength=threads)
+        remote_writes += int(np.count_nonzero(remote & is_write[part]))
+        region = idx[remote] * bins // pages
+        region_remote += np.bincount(region * threads + t[remote],
+                                     minlength=bins * threads).reshape(bins, threads)
+        if progress:
+            progress(part.stop, total)
+
+    # Per-page totals are counted once here; a per-chunk bincount would
+    # touch the whole page table for every chunk.
+    page_accesses = np.bincount(page_index, minlength=pages)
+    page_remote = np.bincount(page_index[remote_all], minlength=pages)
+    local = thread_nodes[np.arange(threads), affinity[:threads]]
+    return {
+        "thread_ids": thread_ids,
+        "affinity": affinity[:threads],
+        "thread_nodes": thread_nodes,
+        "thread_local": local,
+        "thread_latency": thread_latency,
+        "writes": int(is_write.sum()),
+        "remote_writes": remote_writes,
+        "table_pages": table_pages,
+        "page_node": page_node,
+        "page_accesses": page_accesses,
+        "page_remote": page_remote,
+        "region_remote": region_remote,
+        "total_latency": float(thread_latency.sum()),
+        "accesses": total,
+    }
+
 
 class NUMASimulator:
     def __init__(self, root):
         self.root = root
         self.root.title("NUMA (Non-Uniform Memory Access) Simulator")
-        self.root.geometry("700x500")
+        self.root.geometry("820x980")
+
+        self.events = queue.Queue()
+        self.worker = None
 
         self.create_widgets()
+        self.root.after(POLL_MS, self.poll_events)
 
     def create_widgets(self):
         title = tk.Label(self.root, text="NUMA Simulator",
@@ -40,11 +531,123 @@ class NUMASimulator:
         self.access_entry.insert(0, "100000")
         self.access_entry.grid(row=3, column=1)
 
+        # Placement configuration
+        tk.Label(frame, text="Placement Policy:").grid(row=0, column=2, sticky="w", padx=(20, 0))
+        self.policy = tk.StringVar(value=POLICIES[0])
+        ttk.Combobox(frame, textvariable=self.policy, values=POLICIES,
+                     state="readonly", width=17).grid(row=0, column=3)
+
+        tk.Label(frame, text="Threads:").grid(row=1, column=2, sticky="w", padx=(20, 0))
+        self.thread_entry = tk.Entry(frame)
+        self.thread_entry.insert(0, "4")
+        self.thread_entry.grid(row=1, column=3)
+
+        tk.Label(frame, text="Thread Affinity (nodes):").grid(row=2, column=2, sticky="w", padx=(20, 0))
+        self.affinity_entry = tk.Entry(frame)
+        self.affinity_entry.grid(row=2, column=3)
+
+        tk.Label(frame, text="Pages:").grid(row=3, column=2, sticky="w", padx=(20, 0))
+        self.pages_entry = tk.Entry(frame)
+        self.pages_entry.insert(0, "4096")
+        self.pages_entry.grid(row=3, column=3)
+
+        tk.Label(frame, text="Shared Access Fraction:").grid(row=4, column=2, sticky="w", padx=(20, 0))
+        self.share_entry = tk.Entry(frame)
+        self.share_entry.insert(0, "0.1")
+        self.share_entry.grid(row=4, column=3)
+
+        tk.Label(frame, text="Preferred Node:").grid(row=5, column=2, sticky="w", padx=(20, 0))
+        self.preferred_entry = tk.Entry(frame)
+        self.preferred_entry.insert(0, "0")
+        self.preferred_entry.grid(row=5, column=3)
+
+        tk.Label(frame, text="Migrate After K Remote (0 = off):").grid(row=6, column=2, sticky="w", padx=(20, 0))
+        self.migrate_entry = tk.Entry(frame)
+        self.migrate_entry.insert(0, "0")
+        self.migrate_entry.grid(row=6, column=3)
+
+        self.serial_init = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame, text="Serial init (thread 0 touches all pages first)",
+                       variable=self.serial_init).grid(row=7, column=2, columnspan=2, sticky="w", padx=(20, 0))
+
+        # Latency matrix
+        tk.Label(frame, text="Latency Matrix (ns, row = CPU node):").grid(row=4, column=0, columnspan=2, sticky="w")
+        self.matrix_text = tk.Text(frame, height=5, width=36)
+        self.matrix_text.grid(row=5, column=0, columnspan=2, rowspan=3)
+        self.matrix_text.insert(tk.END, format_matrix(synthetic_latency(2, 80, 150)))
+
+        # Bandwidth contention
+        load_frame = tk.LabelFrame(self.root, text="Bandwidth Contention")
+        load_frame.pack(pady=5)
+
+        tk.Label(load_frame, text="Model:").grid(row=0, column=0, sticky="w")
+        self.contention_model = tk.StringVar(value=CONTENTION_MODELS[0])
+        ttk.Combobox(load_frame, textvariable=self.contention_model, values=CONTENTION_MODELS,
+                     state="readonly", width=17).grid(row=0, column=1)
+
+        tk.Label(load_frame, text="Controller BW per Node (GB/s):").grid(row=1, column=0, sticky="w")
+        self.node_bw_entry = tk.Entry(load_frame)
+        self.node_bw_entry.insert(0, "20")
+        self.node_bw_entry.grid(row=1, column=1)
+
+        tk.Label(load_frame, text="Interconnect Link BW (GB/s):").grid(row=2, column=0, sticky="w")
+        self.link_bw_entry = tk.Entry(load_frame)
+        self.link_bw_entry.insert(0, "10")
+        self.link_bw_entry.grid(row=2, column=1)
+
+        tk.Label(load_frame, text="Accesses per Thread per Slice:").grid(row=0, column=2, sticky="w", padx=(20, 0))
+        self.rate_entry = tk.Entry(load_frame)
+        self.rate_entry.insert(0, "100")
+        self.rate_entry.grid(row=0, column=3)
+
+        tk.Label(load_frame, text="Time Slice (ns):").grid(row=1, column=2, sticky="w", padx=(20, 0))
+        self.slice_entry = tk.Entry(load_frame)
+        self.slice_entry.insert(0, "1000")
+        self.slice_entry.grid(row=1, column=3)
+
+        tk.Label(load_frame, text="Measured Curve (util:ns, ...):").grid(row=2, column=2, sticky="w", padx=(20, 0))
+        self.curve_entry = tk.Entry(load_frame)
+        self.curve_entry.insert(0, "0:0, 0.5:8, 0.8:30, 0.95:120, 1:250")
+        self.curve_entry.grid(row=2, column=3)
+
+        tk.Label(load_frame, text="Contention needs pages, so it is not available with Uniform random.",
+                 fg="gray").grid(row=3, column=0, columnspan=4, sticky="w")
+
+        # Trace replay
+        trace_frame = tk.LabelFrame(self.root, text="Trace Replay")
+        trace_frame.pack(pady=5)
+
+        tk.Label(trace_frame, text="Trace (thread, address, R/W):").grid(row=0, column=0, sticky="w")
+        self.trace_entry = tk.Entry(trace_frame, width=45)
+        self.trace_entry.grid(row=0, column=1)
+        tk.Button(trace_frame, text="Browse",
+                  command=lambda: self.browse(self.trace_entry)).grid(row=0, column=2, padx=5)
+
+        tk.Label(trace_frame, text="Page Mapping (optional):").grid(row=1, column=0, sticky="w")
+        self.mapping_entry = tk.Entry(trace_frame, width=45)
+        self.mapping_entry.grid(row=1, column=1)
+        tk.Button(trace_frame, text="Browse",
+                  command=lambda: self.browse(self.mapping_entry)).grid(row=1, column=2, padx=5)
+
         btn_frame = tk.Frame(self.root)
         btn_frame.pack(pady=10)
 
-        tk.Button(btn_frame, text="Run Simulation",
-                  command=self.run_simulation, width=20).pack()
+        tk.Button(btn_frame, text="Build Matrix",
+                  command=self.build_matrix, width=20).grid(row=0, column=0, padx=5)
+        tk.Button(btn_frame, text="Load Host Distances",
+                  command=self.load_host_distances, width=20).grid(row=0, column=1, padx=5)
+        self.run_button = tk.Button(btn_frame, text="Run Simulation",
+                                    command=self.run_simulation, width=20)
+        self.run_button.grid(row=0, column=2, padx=5)
+        self.compare_button = tk.Button(btn_frame, text="Compare Policies",
+                                        command=self.compare_policies, width=20)
+        self.compare_button.grid(row=0, column=3, padx=5)
+        self.replay_button = tk.Button(btn_frame, text="Replay Trace",
+                                       command=self.replay, width=20)
+        self.replay_button.grid(row=1, column=1, columnspan=2, pady=5)
+
+        self.progress = ttk.Progressbar(self.root, length=400, mode="determinate")
+        self.progress.pack(pady=5)
 
         self.output = tk.Text(self.root, height=15, width=80)
         self.output.pack(pady=10)
@@ -53,31 +656,215 @@ class NUMASimulator:
         self.output.insert(tk.END, message + "\n")
         self.output.see(tk.END)
 
-    def run_simulation(self):
-        self.output.delete(1.0, tk.END)
+    def set_matrix(self, latency):
+        self.matrix_text.delete(1.0, tk.END)
+        self.matrix_text.insert(tk.END, format_matrix(latency))
+        self.node_entry.delete(0, tk.END)
+        self.node_entry.insert(0, str(len(latency)))
+
+    def build_matrix(self):
+        try:
+            nodes = int(self.node_entry.get())
+            local_ns = int(self.local_latency.get())
+            remote_ns = int(self.remote_latency.get())
+        except ValueError:
+            messagebox.showerror("Invalid input", "Nodes and latencies must be integers.")
+            return
+        self.set_matrix(synthetic_latency(nodes, local_ns, remote_ns))
+
+    def load_host_distances(self):
+        distances = read_node_distances()
+        if distances is None:
+            messagebox.showerror("Host topology", "Could not read /sys/devices/system/node/*/distance.")
+            return
+        self.set_matrix(distances_to_latency(distances, int(self.local_latency.get())))
 
-        nodes = int(self.node_entry.get())
-        local_ns = int(self.local_latency.get())
-        remote_ns = int(self.remote_latency.get())
-        accesses = int(self.access_entry.get())
+    def browse(self, entry):
+        path = filedialog.askopenfilename()
+        if path:
+            entry.delete(0, tk.END)
+            entry.insert(0, path)
 
+    def read_settings(self):
+        latency = parse_matrix(self.matrix_text.get(1.0, tk.END))
+        nodes = len(latency)
+        threads = int(self.thread_entry.get())
+        affinity_text = self.affinity_entry.get().replace(",", " ").split()
+        if affinity_text:
+            affinity = np.array([int(x) for x in affinity_text])
+        else:
+            affinity = round_robin_affinity(threads, nodes)
+        settings = {
+            "explicit_affinity": bool(affinity_text),
+            "latency": latency,
+            "accesses": int(self.access_entry.get()),
+            "policy": self.policy.get(),
+            "affinity": affinity,
+            "pages": int(self.pages_entry.get()),
+            "share_fraction": float(self.share_entry.get()),
+            "preferred_node": int(self.preferred_entry.get()),
+            "migrate_after": int(self.migrate_entry.get()),
+            "serial_init": self.serial_init.get(),
+        }
+        if settings["accesses"] < 1 or settings["pages"] < 1 or len(affinity) < 1:
+            raise ValueError("Accesses, pages and threads must be positive.")
+        if affinity.min() < 0 or affinity.max() >= nodes or not 0 <= settings["preferred_node"] < nodes:
+            raise ValueError(f"Node numbers must be between 0 and {nodes - 1}.")
+
+        model = self.contention_model.get()
+        settings["contention"] = None
+        if model != "Off":
+            settings["contention"] = {
+                "node_gbps": float(self.node_bw_entry.get()),
+                "link_gbps": float(self.link_bw_entry.get()),
+                "slice_ns": float(self.slice_entry.get()),
+                "per_slice": int(self.rate_entry.get()) * len(affinity),
+                "curve": parse_curve(self.curve_entry.get()) if model == "Measured curve" else None,
+            }
+            if min(settings["contention"]["node_gbps"], settings["contention"]["link_gbps"],
+                   settings["contention"]["slice_ns"], settings["contention"]["per_slice"]) <= 0:
+                raise ValueError("Bandwidths, slice length and access rate must be positive.")
+        return settings
+
+    def start_worker(self, target, settings, total):
+        if self.worker and self.worker.is_alive():
+            return
+        self.output.delete(1.0, tk.END)
         self.log("Starting NUMA Simulation...\n")
+        self.run_button.config(state=tk.DISABLED)
+        self.compare_button.config(state=tk.DISABLED)
+        self.replay_button.config(state=tk.DISABLED)
+        self.progress.config(maximum=total, value=0)
+        self.worker = threading.Thread(target=target, args=(settings,), daemon=True)
+        self.worker.start()
+
+    def run_simulation(self):
+        try:
+            settings = self.read_settings()
+        except ValueError as err:
+            messagebox.showerror("Invalid input", str(err))
+            return
+        if settings["policy"] == "Uniform random" and settings["contention"]:
+            messagebox.showerror("Invalid input", "Bandwidth contention is not modelled for Uniform random; "
+                                                  "set the contention model to Off or pick a placement policy.")
+            return
+        self.start_worker(self.simulation_worker, settings, settings["accesses"])
 
-        total_latency = 0
-        local_count = 0
-        remote_count = 0
+    def compare_policies(self):
+        try:
+            settings = self.read_settings()
+        except ValueError as err:
+            messagebox.showerror("Invalid input", str(err))
+            return
+        self.start_worker(self.compare_worker, settings, settings["accesses"] * (len(POLICIES) - 1))
 
-        for _ in range(accesses):
-            accessing_node = random.randint(0, nodes - 1)
-            memory_node = random.randint(0, nodes - 1)
+    def replay(self):
+        try:
+            settings = self.read_settings()
+        except ValueError as err:
+            messagebox.showerror("Invalid input", str(err))
+            return
+        settings["trace_path"] = self.trace_entry.get().strip()
+        settings["mapping_path"] = self.mapping_entry.get().strip()
+        if not settings["trace_path"]:
+            messagebox.showerror("Invalid input", "Choose a trace file to replay.")
+            return
+        self.start_worker(self.replay_worker, settings, 1)
 
-            if accessing_node == memory_node:
-                total_latency += local_ns
-                local_count += 1
-            else:
-                total_latency += remote_ns
-                remote_count += 1
+    # Workers run off the Tk thread; results go back through self.events.
+
+    def run_policy(self, settings, policy, progress):
+        if policy == "Uniform random":
+            return simulate_uniform(settings["latency"], settings["accesses"], progress=progress)
+        return simulate_placement(
+            settings["latency"], settings["affinity"], settings["pages"],
+            settings["accesses"], policy,
+            share_fraction=settings["share_fraction"],
+            preferred_node=settings["preferred_node"],
+            serial_init=settings["serial_init"],
+            migrate_after=settings["migrate_after"],
+            contention=settings["contention"],
+            progress=progress)
+
+    def simulation_worker(self, settings):
+        def progress(done, total):
+            self.events.put(("progress", done))
 
+        try:
+            start = time.perf_counter()
+            result = self.run_policy(settings, settings["policy"], progress)
+            elapsed = time.perf_counter() - start
+        except Exception as err:
+            self.events.put(("error", ("Simulation", f"{type(err).__name__}: {err}")))
+            return
+        self.events.put(("done", (settings, result, elapsed)))
+
+    def compare_worker(self, settings):
+        results = []
+        try:
+            for i, policy in enumerate(POLICIES[1:]):
+                offset = i * settings["accesses"]
+                results.append((policy, self.run_policy(
+                    settings, policy, lambda done, total: self.events.put(("progress", offset + done)))))
+        except Exception as err:
+            self.events.put(("error", ("Compare policies", f"{type(err).__name__}: {err}")))
+            return
+        self.events.put(("compared", (settings, results)))
+
+    def replay_worker(self, settings):
+        try:
+            trace = load_trace(settings["trace_path"])
+            mapping = load_page_mapping(settings["mapping_path"]) if settings["mapping_path"] else None
+            self.events.put(("progress_max", trace[0].size))
+            start = time.perf_counter()
+            result = replay_trace(
+                trace, settings["latency"], settings["policy"],
+                affinity=settings["affinity"] if settings["explicit_affinity"] else None,
+                preferred_node=settings["preferred_node"], mapping=mapping,
+                progress=lambda done, total: self.events.put(("progress", done)))
+            elapsed = time.perf_counter() - start
+        except Exception as err:
+            self.events.put(("error", ("Trace replay", f"{type(err).__name__}: {err}")))
+            return
+        self.events.put(("replayed", (settings, result, elapsed)))
+
+    def poll_events(self):
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == "progress":
+                    self.progress.config(value=payload)
+                elif kind == "done":
+                    self.show_results(*payload)
+                elif kind == "compared":
+                    self.show_comparison(*payload)
+                elif kind == "progress_max":
+                    self.progress.config(maximum=payload)
+                elif kind == "replayed":
+                    self.show_replay(*payload)
+                elif kind == "error":
+                    self.finish_run()
+                    messagebox.showerror(*payload)
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self.poll_events)
+
+    def finish_run(self):
+        self.run_button.config(state=tk.NORMAL)
+        self.compare_button.config(state=tk.NORMAL)
+        self.replay_button.config(state=tk.NORMAL)
+
+    def show_results(self, settings, result, elapsed):
+        self.finish_run()
+        accesses = settings["accesses"]
+        if settings["policy"] == "Uniform random":
+            self.show_uniform(settings["latency"], accesses, result)
+        else:
+            self.show_placement(settings, result)
+        self.log(f"\nSimulated {accesses / elapsed / 1e6:.1f}M accesses/s in {elapsed:.2f} s")
+
+    def show_uniform(self, latency, accesses, result):
+        local_count, remote_count, total_latency = result
         avg_latency = total_latency / accesses
 
         self.log(f"Total Memory Accesses: {accesses}")
@@ -86,6 +873,145 @@ class NUMASimulator:
         self.log(f"Total Simulated Latency: {total_latency / 1e6:.2f} ms")
         self.log(f"Average Access Latency: {avg_latency:.2f} ns")
 
+        expected_local, local_stddev, expected_avg = expected_uniform(latency, accesses)
+        z = (local_count - expected_local) / local_stddev if local_stddev else 0.0
+        self.log("\nClosed-form check (uniform placement):")
+        self.log(f"Expected Local Accesses: {expected_local:.0f} +/- {local_stddev:.0f}")
+        self.log(f"Expected Average Latency: {expected_avg:.2f} ns")
+        self.log(f"Deviation: {z:+.2f} standard deviations")
+
+    def show_placement(self, settings, result):
+        accesses = settings["accesses"]
+        local_count = int(result["node_local"].sum())
+        self.log(f"Policy: {settings['policy']}"
+                 + (" (serial init)" if settings["serial_init"] and settings["policy"] == "First-touch" else ""))
+        self.log(f"Total Memory Accesses: {accesses}")
+        self.log(f"Local Accesses: {local_count}")
+        self.log(f"Remote Accesses: {accesses - local_count}")
+        self.log(f"Page Migrations: {result['migrations']} "
+                 f"({result['migrations'] * MIGRATION_NS / 1e6:.2f} ms copy cost)")
+        self.log(f"Total Simulated Latency: {result['total_latency'] / 1e6:.2f} ms")
+        self.log(f"Average Access Latency: {result['total_latency'] / accesses:.2f} ns")
+
+        self.log(f"\n{'Node':<6}{'Accesses':>12}{'Local %':>10}{'Avg ns':>10}{'Pages':>10}")
+        for node in range(len(settings["latency"])):
+            count = result["node_accesses"][node]
+            ratio = result["node_local"][node] / count if count else 0.0
+            avg = result["node_latency"][node] / count if count else 0.0
+            self.log(f"{node:<6}{count:>12}{ratio:>10.1%}{avg:>10.2f}{result['pages_per_node'][node]:>10}")
+
+        if "node_load" in result:
+            self.show_contention(settings, result)
+
+    def show_contention(self, settings, result):
+        nodes = len(settings["latency"])
+        slices = result["slices"]
+        node_load, link_load = result["node_load"], result["link_load"]
+        self.log(f"\nQueueing Delay: {result['queue_latency'] / settings['accesses']:.2f} ns per access "
+                 f"over {slices} slices of {settings['contention']['slice_ns']:g} ns")
+        self.log(f"{'Controller':<12}{'Mean util':>10}{'Peak load':>11}{'Saturated':>12}{'First at':>10}")
+        for node in range(nodes):
+            self.log(self.load_row(f"node {node}", node_load, node, slices))
+        links = [k for k in range(nodes * nodes) if link_load.util_peak[k] > 0]
+        if links:
+            self.log(f"{'Link':<12}{'Mean util':>10}{'Peak load':>11}{'Saturated':>12}{'First at':>10}")
+            for k in links:
+                self.log(self.load_row(f"{k % nodes}->{k // nodes}", link_load, k, slices))
+        saturated = [f"node {n}" for n in range(nodes) if node_load.saturated[n]]
+        saturated += [f"link {k % nodes}->{k // nodes}" for k in links if link_load.saturated[k]]
+        if saturated:
+            self.log("SATURATED: " + ", ".join(saturated))
+
+    def load_row(self, label, load, index, slices):
+        first = load.first_saturated[index]
+        return (f"{label:<12}{load.util_sum[index] / slices:>10.1%}{load.util_peak[index]:>11.0%}"
+                f"{load.saturated[index] / slices:>12.1%}{'-' if first < 0 else first:>10}")
+
+    def show_comparison(self, settings, results):
+        self.finish_run()
+        accesses = settings["accesses"]
+        self.log(f"{'Policy':<16}{'Local %':>9}{'Avg ns':>10}{'Queue ns':>10}{'Peak load':>11}{'Saturated':>11}")
+        for policy, result in results:
+            local = result["node_local"].sum() / accesses
+            avg = result["total_latency"] / accesses
+            if "node_load" in result:
+                queue_ns = f"{result['queue_latency'] / accesses:.2f}"
+                peak = f"{result['node_load'].util_peak.max():.0%}"
+                hot = result["node_load"].saturated.sum() + result["link_load"].saturated.sum()
+                saturated = "yes" if hot else "no"
+            else:
+                queue_ns = peak = saturated = "-"
+            self.log(f"{policy:<16}{local:>9.1%}{avg:>10.2f}{queue_ns:>10}{peak:>11}{saturated:>11}")
+
+    def show_replay(self, settings, result, elapsed):
+        self.finish_run()
+        accesses = result["accesses"]
+        local_count = int(result["thread_local"].sum())
+        mapping = " + mapping file" if settings["mapping_path"] else ""
+        self.log(f"Trace: {settings['trace_path']}")
+        self.log(f"Placement: {settings['policy']}{mapping}")
+        self.log(f"Accesses: {accesses} ({result['writes']} writes), "
+                 f"{int((result['page_accesses'] > 0).sum())} pages, {result['thread_ids'].size} threads")
+        self.log(f"Remote Accesses: {accesses - local_count} ({result['remote_writes']} writes)")
+        self.log(f"Average Access Latency: {result['total_latency'] / accesses:.2f} ns")
+
+        self.log(f"\n{'Thread':<10}{'Node':>6}{'Accesses':>12}{'Remote %':>10}{'Avg ns':>10}")
+        for i, thread_id in enumerate(result["thread_ids"]):
+            count = result["thread_nodes"][i].sum()
+            remote = 1 - result["thread_local"][i] / count
+            self.log(f"{thread_id:<10}{result['affinity'][i]:>6}{count:>12}{remote:>10.1%}"
+                     f"{result['thread_latency'][i] / count:>10.2f}")
+
+        self.log("\nTop remote pages:")
+        self.log(f"{'Page':<20}{'Node':>6}{'Accesses':>12}{'Remote':>10}")
+        for slot in np.argsort(result["page_remote"])[::-1][:TOP_PAGES]:
+            if result["page_remote"][slot] == 0:
+                break
+            address = int(result["table_pages"][slot]) << PAGE_SHIFT
+            self.log(f"{address:<#20x}{result['page_node'][slot]:>6}"
+                     f"{result['page_accesses'][slot]:>12}{result['page_remote'][slot]:>10}")
+        self.log(f"\nReplayed {accesses / elapsed / 1e6:.1f}M accesses/s in {elapsed:.2f} s")
+        self.show_heatmaps(result)
+
+    def show_heatmaps(self, result):
+        window = tk.Toplevel(self.root)
+        window.title("Remote Access Heatmaps")
+        fig, (thread_ax, page_ax) = plt.subplots(1, 2, figsize=(11, 4.5))
+
+        thread_nodes = result["thread_nodes"].astype(float)
+        thread_nodes[np.arange(len(thread_nodes)), result["affinity"]] = np.nan  # hide local cells
+        image = thread_ax.imshow(thread_nodes, aspect="auto", cmap="Reds")
+        thread_ax.set_title("Remote accesses: thread x memory node")
+        thread_ax.set_xlabel("Memory node")
+        thread_ax.set_ylabel("Thread")
+        thread_ax.set_yticks(range(len(result["thread_ids"])))
+        thread_ax.set_yticklabels(result["thread_ids"])
+        fig.colorbar(image, ax=thread_ax)
+
+        regions = result["region_remote"]
+        table_pages = result["table_pages"]
+        bins, pages = len(regions), table_pages.size
+        image = page_ax.imshow(regions, aspect="auto", cmap="Reds")
+        # Rows are equal slices of page-table slots, which are not evenly
+        # spaced addresses once a sparse trace is compacted, so each tick
+        # shows the address of the first page in its row.
+        rows = np.unique(np.linspace(0, bins - 1, min(bins, 8)).astype(int))
+        page_ax.set_yticks(rows)
+        page_ax.set_yticklabels([f"{int(table_pages[-(-row * pages // bins)]) << PAGE_SHIFT:#x}"
+                                 for row in rows])
+        page_ax.set_title("Remote accesses: address region x thread")
+        page_ax.set_xlabel("Thread")
+        page_ax.set_ylabel("Address")
+        page_ax.set_xticks(range(len(result["thread_ids"])))
+        page_ax.set_xticklabels(result["thread_ids"])
+        fig.colorbar(image, ax=page_ax)
+        fig.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, master=window)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill="both", expand=True)
+        window.protocol("WM_DELETE_WINDOW", lambda: (plt.close(fig), window.destroy()))
+
 if __name__ == "__main__":
     root = tk.Tk()
     app = NUMASimulator(root)
@@ -1,64 +1,476 @@
 import tkinter as tk
+from tkinter import messagebox, ttk
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import asyncio
+import operator
+import os
+import random
+import re
+import queue
 import threading
 import time
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-def execute_instruction(instr, output_box):
-    time.sleep(delay_var.get())
-    output_box.insert(tk.END, f"Executed: {instr}\n")
-    output_box.see(tk.END)
+BACKENDS = ["Threads", "Processes", "Asyncio + Executor"]
+ALU_OPS = {"ADD": operator.add, "SUB": operator.sub, "MUL": operator.mul,
+           "AND": operator.and_, "OR": operator.or_, "XOR": operator.xor}
+VECTOR_OPS = {"VADD": np.add, "VSUB": np.subtract, "VMUL": np.multiply, "VDIV": np.divide}
+MATRIX_OPS = {"MATMUL": np.matmul}
+WORD_MASK = 0xFFFFFFFF
+VECTOR_PASSES = 20  # passes over a `work`-element vector per vector instruction
+MATRIX_SIZE = 96
+POLL_MS = 100
+DEPENDENCY_KINDS = ["RAW", "WAR", "WAW"]
+PROGRESS_WAVES = 2000  # waves between progress messages while scheduling
+REGISTER_TOKEN = re.compile(r"(?<![#\w])[A-Z_]\w*")  # operands starting with a letter; #4 and 12 are immediates
+DEFAULT_PROGRAM = "ADD R1, R2, R3\nMUL R4, R1, R5\nXOR R6, R4, R2\nVADD V1, V2, V3\nVMUL V4, V1, V2\nMATMUL M1, M2, M3\nSUB R7, R6, R1\nAND R8, R7, R3"
+
+def execute_instruction(instr, work):
+    """Run the CPU-bound kernel for one instruction and return its opcode and seconds taken.
+
+    ALU opcodes spin a pure-Python loop (holding the GIL); vector and matrix
+    opcodes run NumPy kernels, which release it while they compute."""
+    opcode = instr.split()[0].upper()
+    start = time.perf_counter()
+    if opcode in ALU_OPS:
+        op = ALU_OPS[opcode]
+        acc = 1
+        for i in range(work):
+            acc = op(acc, i | 1) & WORD_MASK
+    elif opcode in VECTOR_OPS:
+        a = np.arange(1, work + 1, dtype=float)
+        b = np.full(work, 1.0001)
+        for _ in range(VECTOR_PASSES):
+            a = VECTOR_OPS[opcode](a, b)
+    elif opcode in MATRIX_OPS:
+        m = np.full((MATRIX_SIZE, MATRIX_SIZE), 1.0 / MATRIX_SIZE)
+        for _ in range(max(1, work // (MATRIX_SIZE * MATRIX_SIZE))):
+            m = MATRIX_OPS[opcode](m, m)
+    else:
+        raise ValueError(f"Unknown opcode {opcode!r}; use one of "
+                         f"{', '.join(list(ALU_OPS) + list(VECTOR_OPS) + list(MATRIX_OPS))}")
+    return opcode, time.perf_counter() - start
+
+def run_backend(backend, instructions, work, workers, pool):
+    """Execute all instructions once on `backend` and return the wall time.
+
+    `pool` is an already-started executor with `workers` workers, so pool
+    start-up is not charged to the run."""
+    return run_waves(backend, [instructions], work, workers, pool)
+
+def run_waves(backend, waves, work, workers, pool, progress=None):
+    """Execute each wave to completion before starting the next; return the wall time.
+
+    The asyncio backend keeps one event loop for all waves. `progress(w)` is
+    called after every PROGRESS_WAVES waves."""
+    start = time.perf_counter()
+    if backend == "Sequential":
+        for wave in waves:
+            for instr in wave:
+                execute_instruction(instr, work)
+    elif backend == "Asyncio + Executor":
+        async def gather():
+            loop = asyncio.get_running_loop()
+            for w, wave in enumerate(waves, 1):
+                await asyncio.gather(*(loop.run_in_executor(pool, execute_instruction, instr, work)
+                                       for instr in wave))
+                if progress and w % PROGRESS_WAVES == 0:
+                    progress(w)
+        asyncio.run(gather())
+    else:
+        for w, wave in enumerate(waves, 1):
+            list(pool.map(execute_instruction, wave, [work] * len(wave),
+                          chunksize=max(1, len(wave) // (4 * workers))))
+            if progress and w % PROGRESS_WAVES == 0:
+                progress(w)
+    return time.perf_counter() - start
+
+def make_pool(backend, workers):
+    if backend == "Processes":
+        pool = ProcessPoolExecutor(workers)
+        # Start every worker now so process creation stays out of the timings.
+        list(pool.map(abs, range(workers)))
+        return pool
+    return ThreadPoolExecutor(workers)
+
+def fit_serial_fraction(workers, speedup, scaled=False):
+    """Least-squares serial fraction s from measured speedups.
+
+    Amdahl: 1/S = s + (1 - s)/n. Gustafson (scaled workload): S = n - s(n - 1)."""
+    n = np.asarray(workers, dtype=float)
+    speedup = np.asarray(speedup, dtype=float)
+    keep = n > 1
+    if not keep.any():
+        return 0.0
+    n, speedup = n[keep], speedup[keep]
+    if scaled:
+        s = np.sum((n - speedup) * (n - 1)) / np.sum((n - 1) ** 2)
+    else:
+        x = 1 / n
+        s = np.sum((1 / speedup - x) * (1 - x)) / np.sum((1 - x) ** 2)
+    return float(np.clip(s, 0.0, 1.0))
+
+def benchmark(instructions, work, max_workers, repeats, weak_scaling, post):
+    """Time every backend at 1..max_workers workers; progress and results go through `post`.
+
+    Strong scaling runs the same program at every worker count. Weak scaling
+    replicates it n times for n workers, so scaled speedup is n * T1 / Tn."""
+    def best_of(backend, program, workers, pool):
+        return min(run_backend(backend, program, work, workers, pool) for _ in range(repeats))
+
+    for instr in set(instructions):
+        execute_instruction(instr, 1)  # reject bad opcodes before timing anything
+    sequential = best_of("Sequential", instructions, 1, None)
+    post(("progress", f"Sequential: {sequential:.3f} s for {len(instructions)} instructions"))
+    workers = list(range(1, max_workers + 1))
+    strong = {backend: [] for backend in BACKENDS}
+    weak = {backend: [] for backend in BACKENDS}
+    for backend in BACKENDS:
+        for n in workers:
+            pool = make_pool(backend, n)
+            try:
+                strong[backend].append(best_of(backend, instructions, n, pool))
+                if weak_scaling:
+                    weak[backend].append(best_of(backend, instructions * n, n, pool))
+            finally:
+                pool.shutdown()
+            post(("progress", f"{backend} x{n}: {strong[backend][-1]:.3f} s"
+                              + (f", {n}x work {weak[backend][-1]:.3f} s" if weak_scaling else "")))
+    post(("result", (len(instructions), sequential, workers, strong, weak if weak_scaling else None)))
+
+def parse_program(lines):
+    """Split `OP DEST, SRC, SRC` lines into (opcode, destinations, sources).
+
+    The first operand is written and the rest are read; immediates such as
+    #4 or 12 are not registers and carry no dependency."""
+    program = []
+    for line in lines:
+        opcode, _, operands = line.strip().partition(" ")
+        registers = REGISTER_TOKEN.findall(operands.upper())
+        program.append((opcode.upper(), registers[:1], registers[1:]))
+    return program
 
-def sequential_execution():
+def build_dag(program):
+    """Dependency DAG of `program` in one pass over last-writer/last-reader tables.
+
+    Returns (predecessors, level, raw_level, counts): predecessors[i] lists
+    (j, kind) edges into instruction i, level[i] is its topological wave
+    (1 + the deepest predecessor, so waves fall out of the same pass), and
+    raw_level is the wave with only true RAW edges, i.e. after register
+    renaming removes WAR and WAW. Each read is consumed by at most one later
+    write, so the pass is O(instructions + operands)."""
+    last_writer = {}
+    readers = {}  # register -> instructions that read it since its last write
+    predecessors = []
+    level = []
+    raw_level = []
+    raw = war = waw = 0
+    for i, (_, dests, srcs) in enumerate(program):
+        edges = []
+        depth = raw_depth = 0
+        for reg in srcs:
+            j = last_writer.get(reg)
+            if j is not None:
+                edges.append((j, "RAW"))
+                raw += 1
+                depth = max(depth, level[j])
+                raw_depth = max(raw_depth, raw_level[j])
+            readers.setdefault(reg, []).append(i)
+        for reg in dests:
+            for j in readers.get(reg, ()):
+                if j != i:
+                    edges.append((j, "WAR"))
+                    war += 1
+                    depth = max(depth, level[j])
+            j = last_writer.get(reg)
+            if j is not None:
+                edges.append((j, "WAW"))
+                waw += 1
+                depth = max(depth, level[j])
+            last_writer[reg] = i
+            readers[reg] = []
+        predecessors.append(edges)
+        level.append(depth + 1)
+        raw_level.append(raw_depth + 1)
+    return predecessors, level, raw_level, dict(zip(DEPENDENCY_KINDS, (raw, war, waw)))
+
+def random_program(count, registers=16, seed=None):
+    """`count` random ALU instructions over R0..R<registers-1>."""
+    rng = random.Random(seed)
+    ops = list(ALU_OPS)
+    return [f"{rng.choice(ops)} R{rng.randrange(registers)}, R{rng.randrange(registers)}, "
+            f"R{rng.randrange(registers)}" for _ in range(count)]
+
+def schedule_waves(instructions, work, units, backend, post):
+    """Execute `instructions` wave by wave on `units` workers and post the ILP report.
+
+    Every instruction in a wave depends only on earlier waves, so a wave is
+    handed to the pool as one batch and the next starts when it finishes."""
+    started = time.perf_counter()
+    program = parse_program(instructions)
+    predecessors, level, raw_level, counts = build_dag(program)
+    analysed = time.perf_counter() - started
+    depth = max(level)
+    waves = [[] for _ in range(depth)]
+    for i, wave in enumerate(level):
+        waves[wave - 1].append(instructions[i])
+    widths = [len(wave) for wave in waves]
+    post(("progress", f"DAG of {len(program):,} instructions built in {analysed:.2f} s: "
+                      + ", ".join(f"{counts[kind]:,} {kind}" for kind in DEPENDENCY_KINDS)
+                      + f"; {depth:,} waves"))
+
+    sequential = run_backend("Sequential", instructions, work, 1, None)
+    post(("progress", f"Sequential: {sequential:.3f} s"))
+    pool = make_pool(backend, units)
+    try:
+        parallel = run_waves(backend, waves, work, units, pool,
+                             lambda w: post(("progress", f"  wave {w:,}/{depth:,}")))
+    finally:
+        pool.shutdown()
+    post(("scheduled", {
+        "instructions": len(program),
+        "counts": counts,
+        "critical_path": depth,
+        "renamed_path": max(raw_level),
+        "widths": widths,
+        "rounds": sum(-(-width // units) for width in widths),
+        "units": units,
+        "backend": backend,
+        "sequential": sequential,
+        "parallel": parallel,
+    }))
+
+def start_benchmark():
+    global benchmark_running
+    if benchmark_running:
+        messagebox.showinfo("Info", "A benchmark is already running")
+        return
+    instructions = [line.strip() for line in instruction_box.get("1.0", tk.END).split("\n") if line.strip()]
+    try:
+        work = int(work_var.get())
+        max_workers = int(workers_var.get())
+        repeats = int(repeats_var.get())
+        if not instructions or work < 1 or max_workers < 1 or repeats < 1:
+            raise ValueError
+    except (ValueError, tk.TclError):
+        messagebox.showerror("Error", "Enter instructions and positive work, worker and repeat counts")
+        return
+    weak = weak_var.get()
+    benchmark_running = True
+    run_button.config(state=tk.DISABLED)
+    schedule_button.config(state=tk.DISABLED)
     output_box.delete("1.0", tk.END)
-    instructions = instruction_box.get("1.0", tk.END).strip().split("\n")
+    output_box.insert(tk.END, f"Benchmarking {len(instructions)} instructions x {work:,} iterations "
+                              f"on 1..{max_workers} workers ({os.cpu_count()} CPUs)\n")
+
+    def worker():
+        # Off the Tk thread: everything reaches the GUI through benchmark_events.
+        try:
+            benchmark(instructions, work, max_workers, repeats, weak, benchmark_events.put)
+        except Exception as e:
+            benchmark_events.put(("error", str(e)))
 
-    start = time.time()
-    for instr in instructions:
-        execute_instruction(instr, output_box)
-    end = time.time()
+    threading.Thread(target=worker, daemon=True).start()
 
-    output_box.insert(tk.END, f"\nSequential Execution Time: {round(end-start,2)} sec\n")
+def poll_benchmark():
+    global benchmark_running
+    try:
+        while True:
+            kind, payload = benchmark_events.get_nowait()
+            if kind == "progress":
+                output_box.insert(tk.END, payload + "\n")
+                output_box.see(tk.END)
+                continue
+            if kind == "result":
+                show_scaling(*payload)
+            elif kind == "scheduled":
+                show_schedule(payload)
+            elif kind == "error":
+                messagebox.showerror("Error", payload)
+            benchmark_running = False
+            run_button.config(state=tk.NORMAL)
+            schedule_button.config(state=tk.NORMAL)
+    except queue.Empty:
+        pass
+    root.after(POLL_MS, poll_benchmark)
 
-def parallel_execution():
+def show_scaling(count, sequential, workers, strong, weak):
+    n = np.array(workers, dtype=float)
+    output_box.insert(tk.END, f"\n{'Backend':<20}" + "".join(f"{'x' + str(w):>8}" for w in workers)
+                      + f"{'Serial':>9}\n")
+    serial = {}
+    for backend in BACKENDS:
+        speedup = sequential / np.array(strong[backend])
+        serial[backend] = fit_serial_fraction(workers, speedup)
+        output_box.insert(tk.END, f"{backend:<20}" + "".join(f"{s:>8.2f}" for s in speedup)
+                          + f"{100 * serial[backend]:>8.1f}%\n")
+    output_box.insert(tk.END, "(speedup over sequential; serial = Amdahl serial fraction fitted to the curve)\n")
+    output_box.see(tk.END)
+
+    window = tk.Toplevel(root)
+    window.title("Parallel Scaling")
+    panels = 2 if weak is not None else 1
+    fig, axes = plt.subplots(1, panels, figsize=(5.5 * panels, 4.2), squeeze=False)
+    ax = axes[0][0]
+    ax.plot(n, n, "k:", label="Ideal")
+    for backend in BACKENDS:
+        line, = ax.plot(n, sequential / np.array(strong[backend]), "o-", label=backend)
+        s = serial[backend]
+        ax.plot(n, 1 / (s + (1 - s) / n), "--", color=line.get_color(), alpha=0.6,
+                label=f"Amdahl s={100 * s:.0f}%")
+    ax.set_title(f"Strong Scaling ({count} instructions)")
+    ax.set_xlabel("Workers")
+    ax.set_ylabel("Speedup")
+    ax.legend(fontsize=7)
+    if weak is not None:
+        ax = axes[0][1]
+        ax.plot(n, n, "k:", label="Ideal")
+        for backend in BACKENDS:
+            scaled = n * sequential / np.array(weak[backend])
+            s = fit_serial_fraction(workers, scaled, scaled=True)
+            line, = ax.plot(n, scaled, "o-", label=backend)
+            ax.plot(n, n - s * (n - 1), "--", color=line.get_color(), alpha=0.6,
+                    label=f"Gustafson s={100 * s:.0f}%")
+        ax.set_title("Weak Scaling (n x instructions)")
+        ax.set_xlabel("Workers")
+        ax.set_ylabel("Scaled Speedup")
+        ax.legend(fontsize=7)
+    fig.tight_layout()
+    canvas = FigureCanvasTkAgg(fig, master=window)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill="both", expand=True)
+
+def generate_program():
+    try:
+        count = int(program_size_var.get())
+        registers = int(registers_var.get())
+        if count < 1 or registers < 1:
+            raise ValueError
+    except ValueError:
+        messagebox.showerror("Error", "Enter a positive instruction and register count")
+        return
+    instruction_box.delete("1.0", tk.END)
+    instruction_box.insert("1.0", "\n".join(random_program(count, registers)))
+
+def start_schedule():
+    global benchmark_running
+    if benchmark_running:
+        messagebox.showinfo("Info", "A benchmark is already running")
+        return
+    instructions = [line.strip() for line in instruction_box.get("1.0", tk.END).split("\n") if line.strip()]
+    try:
+        work = int(work_var.get())
+        units = int(units_var.get())
+        if not instructions or work < 1 or units < 1:
+            raise ValueError
+    except ValueError:
+        messagebox.showerror("Error", "Enter instructions and positive work and unit counts")
+        return
+    benchmark_running = True
+    run_button.config(state=tk.DISABLED)
+    schedule_button.config(state=tk.DISABLED)
     output_box.delete("1.0", tk.END)
-    instructions = instruction_box.get("1.0", tk.END).strip().split("\n")
+    backend = schedule_backend.get()
 
-    threads = []
-    start = time.time()
+    def worker():
+        try:
+            schedule_waves(instructions, work, units, backend, benchmark_events.put)
+        except Exception as e:
+            benchmark_events.put(("error", str(e)))
+
+    threading.Thread(target=worker, daemon=True).start()
+
+def show_schedule(report):
+    n = report["instructions"]
+    path = report["critical_path"]
+    output_box.insert(tk.END,
+        f"\nInstructions:            {n:,}\n"
+        f"Critical path:           {path:,} waves\n"
+        f"Available ILP:           {n / path:.2f} (renamed, RAW only: {n / report['renamed_path']:.2f})\n"
+        f"Widest wave:             {max(report['widths']):,}\n"
+        f"Schedule on {report['units']} units:     {report['rounds']:,} steps "
+        f"(ideal speedup {n / report['rounds']:.2f})\n"
+        f"Achieved speedup:        {report['sequential'] / report['parallel']:.2f} "
+        f"({report['backend']}, {report['sequential']:.3f} s -> {report['parallel']:.3f} s)\n")
+    output_box.see(tk.END)
 
-    for instr in instructions:
-        t = threading.Thread(target=execute_instruction, args=(instr, output_box))
-        threads.append(t)
-        t.start()
+    window = tk.Toplevel(root)
+    window.title("Parallelism Profile")
+    fig, ax = plt.subplots(figsize=(7, 3.5))
+    widths = np.array(report["widths"])
+    ax.plot(np.arange(1, len(widths) + 1), widths, linewidth=0.8, label="Instructions per wave")
+    ax.axhline(report["units"], color="red", linestyle="--", label=f"{report['units']} units")
+    ax.set_xlabel("Wave")
+    ax.set_ylabel("Ready Instructions")
+    ax.set_title(f"Parallelism Profile (ILP {n / path:.2f})")
+    ax.legend(fontsize=8)
+    fig.tight_layout()
+    canvas = FigureCanvasTkAgg(fig, master=window)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill="both", expand=True)
 
-    for t in threads:
-        t.join()
+# GUI. Kept under the main guard so process-pool workers that re-import
+# this file (spawn start method) do not open windows of their own.
+if __name__ == "__main__":
+    benchmark_events = queue.Queue()
+    benchmark_running = False
 
-    end = time.time()
-    output_box.insert(tk.END, f"\nParallel Execution Time: {round(end-start,2)} sec\n")
+    root = tk.Tk()
+    root.title("Parallel Instruction Execution Demonstrator")
+    root.geometry("720x760")
 
-# GUI
-root = tk.Tk()
-root.title("Parallel Instruction Execution Demonstrator")
-root.geometry("650x500")
+    tk.Label(root, text="Enter Instructions (one per line):").pack(pady=5)
 
-tk.Label(root, text="Enter Instructions (one per line):").pack(pady=5)
+    instruction_box = tk.Text(root, height=8, width=70)
+    instruction_box.insert("1.0", DEFAULT_PROGRAM)
+    instruction_box.pack()
 
-instruction_box = tk.Text(root, height=8, width=70)
-instruction_box.pack()
+    settings_frame = tk.Frame(root)
+    settings_frame.pack(pady=5)
+    work_var = tk.StringVar(value="200000")
+    workers_var = tk.StringVar(value=str(min(8, os.cpu_count() or 1)))
+    repeats_var = tk.StringVar(value="1")
+    weak_var = tk.BooleanVar(value=True)
+    tk.Label(settings_frame, text="Work per Instruction (iterations):").grid(row=0, column=0, sticky="w")
+    tk.Entry(settings_frame, textvariable=work_var, width=10).grid(row=0, column=1, sticky="w")
+    tk.Label(settings_frame, text="Max Workers:").grid(row=0, column=2, sticky="w", padx=(10, 0))
+    tk.Entry(settings_frame, textvariable=workers_var, width=6).grid(row=0, column=3, sticky="w")
+    tk.Label(settings_frame, text="Repeats (best of):").grid(row=1, column=0, sticky="w")
+    tk.Entry(settings_frame, textvariable=repeats_var, width=10).grid(row=1, column=1, sticky="w")
+    tk.Checkbutton(settings_frame, text="Weak scaling (Gustafson)", variable=weak_var).grid(
+        row=1, column=2, columnspan=2, sticky="w", padx=(10, 0))
 
-delay_var = tk.DoubleVar(value=1.0)
-tk.Label(root, text="Execution Delay (seconds):").pack()
-tk.Entry(root, textvariable=delay_var).pack()
+    btn_frame = tk.Frame(root)
+    btn_frame.pack(pady=10)
 
-btn_frame = tk.Frame(root)
-btn_frame.pack(pady=10)
+    run_button = tk.Button(btn_frame, text="Measure Scaling", command=start_benchmark)
+    run_button.pack(side=tk.LEFT, padx=10)
 
-tk.Button(btn_frame, text="Sequential Execution", command=sequential_execution).pack(side=tk.LEFT, padx=10)
-tk.Button(btn_frame, text="Parallel Execution", command=parallel_execution).pack(side=tk.LEFT, padx=10)
+    dag_frame = tk.LabelFrame(root, text="Dependency Scheduling (RAW/WAR/WAW waves)")
+    dag_frame.pack(padx=10, pady=5)
+    units_var = tk.StringVar(value="4")
+    program_size_var = tk.StringVar(value="100000")
+    registers_var = tk.StringVar(value="16")
+    tk.Label(dag_frame, text="Execution Units (K):").grid(row=0, column=0, sticky="w")
+    tk.Entry(dag_frame, textvariable=units_var, width=6).grid(row=0, column=1, sticky="w")
+    tk.Label(dag_frame, text="Backend:").grid(row=0, column=2, sticky="w", padx=(10, 0))
+    schedule_backend = ttk.Combobox(dag_frame, state="readonly", values=BACKENDS, width=18)
+    schedule_backend.current(0)
+    schedule_backend.grid(row=0, column=3, sticky="w")
+    schedule_button = tk.Button(dag_frame, text="Schedule Waves", command=start_schedule)
+    schedule_button.grid(row=0, column=4, padx=10, pady=5)
+    tk.Label(dag_frame, text="Random Program Size:").grid(row=1, column=0, sticky="w")
+    tk.Entry(dag_frame, textvariable=program_size_var, width=8).grid(row=1, column=1, sticky="w")
+    tk.Label(dag_frame, text="Registers:").grid(row=1, column=2, sticky="w", padx=(10, 0))
+    tk.Entry(dag_frame, textvariable=registers_var, width=6).grid(row=1, column=3, sticky="w")
+    tk.Button(dag_frame, text="Generate Program", command=generate_program).grid(row=1, column=4, padx=10, pady=5)
 
-tk.Label(root, text="Execution Output:").pack()
+    tk.Label(root, text="Execution Output:").pack()
 
-output_box = tk.Text(root, height=15, width=70)
-output_box.pack()
+    output_box = tk.Text(root, height=18, width=84, font=("Courier", 9))
+    output_box.pack()
 
-root.mainloop()
+    root.after(POLL_MS, poll_benchmark)
+    root.mainloop()
@@ -1,16 +1,515 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, filedialog, messagebox
+import glob
+import json
+import mmap
+import os
+import platform
+import queue
+import threading
 import time
-import random
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
+CHASE_STEPS = 1_000_000
+CHASE_UNROLL = 8
+BASELINE_ELEMENTS = 512  # 4 KB of indices, stays resident in L1
+DEFAULT_LLC_BYTES = 32 * 1024 * 1024
+STREAM_LLC_MULTIPLE = 4
+STREAM_SCALAR = 3.0
+STREAM_REPEATS = 5
+# Bytes counted per element, following the STREAM reporting convention.
+STREAM_BYTES = {"Copy": 16, "Scale": 16, "Add": 24, "Triad": 24}
+PAGE_SIZE = mmap.PAGESIZE
+SWEEP_STRIDES = [2 ** k for k in range(3, 17)]          # 8 B .. 64 KB
+SWEEP_WORKING_SETS = [2 ** k for k in range(12, 33)]    # 4 KB .. 4 GB
+SWEEP_STEPS = 200_000
+SWEEP_MAX_NODES = 256 * 1024
+SWEEP_LLC_MULTIPLE = 4
+SWEEP_MIN_DEFAULT_BYTES = 256 * 1024 * 1024
+SWEEP_MEMORY_FRACTION = 0.5  # largest share of available memory one sweep buffer may take
+KNEE_RATIO = 1.4
+DEFAULT_WARMUP = 1
+DEFAULT_REPETITIONS = 10
+REGRESSION_TOLERANCE = 0.10
+REGRESSION_MIN_NS = 2.0
+POLL_MS = 100
+
+
+# ---------- Buffers ----------
+
+def allocate_buffer(num_bytes, dtype=np.float64, huge_pages=False, prefault=False):
+    """Plain np.zeros buffer, or an anonymous mmap advised for transparent huge pages."""
+    dtype = np.dtype(dtype)
+    num_elements = num_bytes // dtype.itemsize
+    if huge_pages:
+        length = max(num_elements * dtype.itemsize, PAGE_SIZE)
+        region = mmap.mmap(-1, length, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+        if hasattr(mmap, "MADV_HUGEPAGE"):
+            region.madvise(mmap.MADV_HUGEPAGE)
+        # The array keeps the mapping alive through its base.
+        arr = np.frombuffer(region, dtype=dtype, count=num_elements)
+    else:
+        arr = np.zeros(num_elements, dtype=dtype)
+    if prefault:
+        # One write per 4 KB page is enough to fault the whole buffer in.
+        arr.view(np.uint8)[::PAGE_SIZE] = 0
+    return arr
+
+
+# ---------- Benchmark kernels ----------
+
+def build_cycle(num_elements, rng=None, out=None):
+    """Return a next-index table that visits every element in one single cycle.
+
+    With `out` (an intp array of num_elements) the table is written into it,
+    so the chase walks that buffer's pages rather than a fresh allocation.
+    """
+    rng = rng or np.random.default_rng()
+    order = rng.permutation(num_elements).astype(np.intp)
+    nxt = np.empty(num_elements, dtype=np.intp) if out is None else out
+    nxt[order] = np.roll(order, -1)
+    return nxt
+
+
+def chase(nxt, steps, start_index=0):
+    """Follow the chain for `steps` dependent loads. Returns (elapsed_ns, loads)."""
+    item = nxt.item
+    p = start_index
+    rounds = max(1, steps // CHASE_UNROLL)
+    start = time.perf_counter_ns()
+    for _ in range(rounds):
+        # Unrolled so the loop bookkeeping is amortised over several loads;
+        # each load depends on the previous one, so none can overlap.
+        p = item(p)
+        p = item(p)
+        p = item(p)
+        p = item(p)
+        p = item(p)
+        p = item(p)
+        p = item(p)
+        p = item(p)
+    end = time.perf_counter_ns()
+    return end - start, rounds * CHASE_UNROLL
+
+
+def chase_latency(nxt, steps=CHASE_STEPS):
+    """ns per dependent load with the interpreter cost of a cached chase subtracted."""
+    elapsed, loads = chase(nxt, steps)
+    base_elapsed, base_loads = chase(build_cycle(BASELINE_ELEMENTS), steps)
+    raw = elapsed / loads
+    baseline = base_elapsed / base_loads
+    return max(raw - baseline, 0.0), raw, baseline
+
+
+def timed(fn):
+    start = time.perf_counter_ns()
+    fn()
+    return time.perf_counter_ns() - start
+
+
+def bulk_kernel(fn, small_fn, num_elements, bytes_per_element):
+    """Time one bulk NumPy call, minus the dispatch cost measured on a tiny buffer."""
+    small_fn()
+    overhead = min(timed(small_fn) for _ in range(5))
+    elapsed = max(timed(fn) - overhead, 1)
+    return {
+        "ns_per_access": elapsed / num_elements,
+        "gb_per_s": num_elements * bytes_per_element / elapsed,
+        "total_ms": elapsed / 1e6,
+    }
+
+
+def sequential_kernels(arr):
+    n = arr.size
+    scratch = np.empty_like(arr)
+    small = np.zeros(BASELINE_ELEMENTS, dtype=arr.dtype)
+    small_scratch = np.empty_like(small)
+    # Fault every page in before timing anything.
+    np.add(arr, 1, out=arr)
+    np.copyto(scratch, arr)
+
+    item_size = arr.itemsize
+    return {
+        "add": bulk_kernel(lambda: np.add(arr, 1, out=arr),
+                           lambda: np.add(small, 1, out=small),
+                           n, 2 * item_size),
+        "copy": bulk_kernel(lambda: np.copyto(scratch, arr),
+                            lambda: np.copyto(small_scratch, small),
+                            n, 2 * item_size),
+    }
+
+
+def random_kernels(arr, rng=None):
+    rng = rng or np.random.default_rng()
+    n = arr.size
+    # The chase runs through arr itself, so it sees the same page size and
+    # pre-faulting as the other kernels.
+    nxt = build_cycle(n, rng, out=arr)
+    idx = rng.permutation(n).astype(np.intp)
+    scratch = np.empty_like(arr)
+    small = np.zeros(BASELINE_ELEMENTS, dtype=arr.dtype)
+    small_idx = rng.permutation(BASELINE_ELEMENTS).astype(np.intp)
+    small_scratch = np.empty_like(small)
+    np.take(arr, idx, out=scratch)
+
+    latency, raw, baseline = chase_latency(nxt, min(CHASE_STEPS, 4 * n))
+    # Gather reads an index, reads the element it points at and writes it out.
+    gather = bulk_kernel(lambda: np.take(arr, idx, out=scratch),
+                         lambda: np.take(small, small_idx, out=small_scratch),
+                         n, idx.itemsize + 2 * arr.itemsize)
+    return {
+        "chase": {"ns_per_access": latency, "raw_ns": raw, "baseline_ns": baseline},
+        "gather": gather,
+    }
+
+
+# ---------- STREAM bandwidth ----------
+
+def parse_cache_size(text):
+    text = text.strip().upper()
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    if text and text[-1] in units:
+        return int(text[:-1]) * units[text[-1]]
+    return int(text)
+
+
+def detect_llc_bytes(sysfs_root="/sys/devices/system/cpu"):
+    """Size of the highest cache level reported for cpu0, or a default."""
+    best_level, best_size = 0, DEFAULT_LLC_BYTES
+    for index in glob.glob(os.path.join(sysfs_root, "cpu0", "cache", "index*")):
+        try:
+            with open(os.path.join(index, "level")) as f:
+                level = int(f.read())
+            with open(os.path.join(index, "size")) as f:
+                size = parse_cache_size(f.read())
+        except (OSError, ValueError):
+            continue
+        if level > best_level or (level == best_level and size > best_size):
+            best_level, best_size = level, size
+    return best_size
+
+
+def default_sweep_bytes(llc_bytes, available_bytes=None):
+    """4x the LLC (at least 256 MB) rounded up to a power of two, within the memory cap."""
+    target = max(SWEEP_LLC_MULTIPLE * llc_bytes, SWEEP_MIN_DEFAULT_BYTES)
+    size = 1 << (target - 1).bit_length()
+    if available_bytes is not None:
+        while size > 2 ** 20 and size > available_bytes * SWEEP_MEMORY_FRACTION:
+            size //= 2
+    return size
+
+
+def available_memory_bytes():
+    """MemAvailable from /proc/meminfo, or free physical pages elsewhere; None if unknown."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * PAGE_SIZE
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def stream_elements(llc_bytes, min_bytes=0):
+    """Elements per STREAM array so each array is at least 4x the LLC."""
+    return max(STREAM_LLC_MULTIPLE * llc_bytes, min_bytes) // 8
+
+
+def stream_slices(num_elements, threads):
+    bounds = np.linspace(0, num_elements, threads + 1).astype(int)
+    return [slice(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def stream_kernel(name, a, b, c, part):
+    s = STREAM_SCALAR
+    if name == "Copy":
+        np.copyto(c[part], a[part])
+    elif name == "Scale":
+        np.multiply(c[part], s, out=b[part])
+    elif name == "Add":
+        np.add(a[part], b[part], out=c[part])
+    else:
+        # Triad in two passes over the slice; bytes are still counted as STREAM does.
+        np.multiply(c[part], s, out=a[part])
+        np.add(a[part], b[part], out=a[part])
+
+
+def run_stream(a, b, c, threads, pool, repeats=STREAM_REPEATS):
+    """Best-of-N GB/s for each STREAM kernel with `threads` workers, each on its own slice."""
+    parts = stream_slices(a.size, threads)
+    results = {}
+    for name, bytes_per_element in STREAM_BYTES.items():
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter_ns()
+            futures = [pool.submit(stream_kernel, name, a, b, c, part) for part in parts]
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter_ns() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = a.size * bytes_per_element / best
+    return results
+
+
+def stream_scaling(max_threads, num_elements, repeats=STREAM_REPEATS, huge_pages=False):
+    """Run STREAM for 1..max_threads workers. Returns [(threads, {kernel: GB/s})]."""
+    a, b, c = (allocate_buffer(num_elements * 8, huge_pages=huge_pages) for _ in range(3))
+    a.fill(1.0)
+    b.fill(2.0)
+    c.fill(0.0)
+    curve = []
+    with ThreadPoolExecutor(max_workers=max_threads) as pool:
+        for threads in range(1, max_threads + 1):
+            curve.append((threads, run_stream(a, b, c, threads, pool, repeats)))
+    return curve
+
+
+# ---------- Stride / working-set sweep ----------
+
+def strided_chain(buf, working_set, stride, rng):
+    """Link a random single cycle through `stride`-spaced slots of the first `working_set` bytes.
+
+    Returns the index of the first slot, or None if fewer than two slots fit.
+    Very large working sets are sampled down to SWEEP_MAX_NODES slots spread
+    over the whole range, which keeps the same page and TLB footprint per load.
+    """
+    step = stride // buf.itemsize
+    total = min(working_set, buf.nbytes) // stride
+    if total < 2:
+        return None
+    if total > SWEEP_MAX_NODES:
+        slots = rng.choice(total, SWEEP_MAX_NODES, replace=False)
+    else:
+        slots = rng.permutation(total)
+    positions = slots.astype(np.intp) * step
+    buf[positions] = np.roll(positions, -1)
+    return int(positions[0])
+
+
+def stride_sweep(buf, strides=SWEEP_STRIDES, working_sets=SWEEP_WORKING_SETS,
+                 steps=SWEEP_STEPS, rng=None, progress=None):
+    """Latency surface in ns, shaped (len(working_sets), len(strides)); NaN where no chain fits."""
+    rng = rng or np.random.default_rng()
+    _, raw, baseline = chase_latency(build_cycle(BASELINE_ELEMENTS), steps)
+    surface = np.full((len(working_sets), len(strides)), np.nan)
+    for i, working_set in enumerate(working_sets):
+        if working_set > buf.nbytes:
+            break
+        for j, stride in enumerate(strides):
+            if stride < buf.itemsize:
+                continue
+            start_index = strided_chain(buf, working_set, stride, rng)
+            if start_index is None:
+                continue
+            elapsed, loads = chase(buf, steps, start_index)
+            surface[i, j] = max(elapsed / loads - baseline, 0.0)
+        if progress:
+            progress(i + 1, len(working_sets))
+    return surface
+
+
+def latency_knees(values, labels, ratio=KNEE_RATIO):
+    """Labels where latency jumps by more than `ratio` over the previous point."""
+    knees = []
+    previous = None
+    for value, label in zip(values, labels):
+        if np.isnan(value):
+            continue
+        if previous is not None and value > max(previous, 1.0) * ratio:
+            knees.append(label)
+        previous = value
+    return knees
+
+
+def format_bytes(num_bytes):
+    for unit in ("B", "K", "M", "G"):
+        if num_bytes < 1024 or unit == "G":
+            return f"{num_bytes:g}{unit}"
+        num_bytes /= 1024
+
+
+# ---------- Benchmark metrics ----------
+# Metric names ending in "_ns" are latencies (lower is better); the rest
+# are bandwidths in GB/s (higher is better).
+
+def sequential_metrics(arr):
+    results = sequential_kernels(arr)
+    return {
+        "seq_add_ns": results["add"]["ns_per_access"],
+        "seq_add_gbps": results["add"]["gb_per_s"],
+        "seq_copy_ns": results["copy"]["ns_per_access"],
+        "seq_copy_gbps": results["copy"]["gb_per_s"],
+    }
+
+
+def random_metrics(arr):
+    results = random_kernels(arr)
+    return {
+        "chase_ns": results["chase"]["ns_per_access"],
+        "gather_ns": results["gather"]["ns_per_access"],
+        "gather_gbps": results["gather"]["gb_per_s"],
+    }
+
+
+def stream_metric(kernel, threads):
+    return f"stream_{kernel.lower()}_{threads}t_gbps"
+
+
+def stream_metrics(max_threads, num_elements, huge_pages=False):
+    # The harness repeats the whole curve, so each point is timed once here.
+    metrics = {}
+    for threads, results in stream_scaling(max_threads, num_elements, 1, huge_pages):
+        for kernel, gb_per_s in results.items():
+            metrics[stream_metric(kernel, threads)] = gb_per_s
+    return metrics
+
+
+def sweep_metric(working_set, stride):
+    return f"sweep_{format_bytes(working_set)}_{format_bytes(stride)}_ns"
+
+
+def sweep_metrics(buf, working_sets, progress=None):
+    surface = stride_sweep(buf, working_sets=working_sets, progress=progress)
+    metrics = {}
+    for i, working_set in enumerate(working_sets):
+        for j, stride in enumerate(SWEEP_STRIDES):
+            if not np.isnan(surface[i, j]):
+                metrics[sweep_metric(working_set, stride)] = float(surface[i, j])
+    return metrics
+
+
+# ---------- Benchmark harness ----------
+
+def summarize(samples):
+    """Median, IQR and a distribution-free 95% confidence interval for the median."""
+    values = np.sort(np.asarray(samples, dtype=float))
+    n = values.size
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    # Order-statistic interval: ranks n/2 -/+ 1.96 * sqrt(n) / 2.
+    half_width = 1.96 * np.sqrt(n) / 2
+    lo = max(int(np.floor(n / 2 - half_width)), 0)
+    hi = min(int(np.ceil(n / 2 + half_width)), n - 1)
+    return {
+        "median": float(median),
+        "q1": float(q1),
+        "q3": float(q3),
+        "iqr": float(q3 - q1),
+        "ci_low": float(values[lo]),
+        "ci_high": float(values[hi]),
+        "samples": values.tolist(),
+    }
+
+
+def run_harness(measure, warmup, repetitions, post):
+    """Call `measure` for warmup + repetitions runs and summarise every metric it returns.
+
+    `post(kind, payload)` receives ("progress", (done, total, phase)) events.
+    Warmup runs are discarded.
+    """
+    total = warmup + repetitions
+    samples = {}
+    for run in range(total):
+        phase = "warmup" if run < warmup else "repetition"
+        post("progress", (run, total, phase))
+        result = measure()
+        if run >= warmup:
+            for metric, value in result.items():
+                samples.setdefault(metric, []).append(value)
+    post("progress", (total, total, "done"))
+    return {metric: summarize(values) for metric, values in samples.items()}
+
+
+def lower_is_better(metric):
+    return metric.endswith("_ns")
+
+
+def find_regressions(metrics, baseline_metrics, tolerance=REGRESSION_TOLERANCE):
+    """Metrics whose median is worse than the baseline by more than `tolerance`
+    and whose confidence interval no longer overlaps the baseline's.
+
+    Returns [(metric, current_median, baseline_median, relative_change)].
+    """
+    regressions = []
+    for metric, current in metrics.items():
+        base = baseline_metrics.get(metric)
+        if not base or base["median"] <= 0:
+            continue
+        change = (current["median"] - base["median"]) / base["median"]
+        if lower_is_better(metric):
+            worse = (change > tolerance
+                     and current["ci_low"] > base["ci_high"]
+                     and current["median"] - base["median"] > REGRESSION_MIN_NS)
+        else:
+            worse = -change > tolerance and current["ci_high"] < base["ci_low"]
+        if worse:
+            regressions.append((metric, current["median"], base["median"], change))
+    return regressions
+
+
+def read_first_line(path, default=""):
+    try:
+        with open(path) as f:
+            return f.readline().strip()
+    except OSError:
+        return default
+
+
+def cpu_model():
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor()
+
+
+def host_info():
+    return {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "cpu": cpu_model(),
+        "cpus": os.cpu_count(),
+        "llc_bytes": detect_llc_bytes(),
+        "thp": read_first_line("/sys/kernel/mm/transparent_hugepage/enabled"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+    }
+
+
+def save_baseline(path, result):
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+
+
+def load_baseline(path):
+    with open(path) as f:
+        baseline = json.load(f)
+    if "benchmark" not in baseline or "metrics" not in baseline:
+        raise ValueError(f"{path} is not a RAM latency baseline.")
+    return baseline
+
+
 class RAMLatencyApp:
     def __init__(self, root):
         self.root = root
         self.root.title("RAM Latency Measurement Tool")
-        self.root.geometry("600x450")
+        self.root.geometry("860x720")
+
+        self.events = queue.Queue()
+        self.worker = None
+        self.last_result = None
+        self.baseline = None
 
         self.create_widgets()
+        self.root.after(POLL_MS, self.poll_events)
 
     def create_widgets(self):
         title = tk.Label(self.root, text="RAM Latency Measurement Tool",
@@ -26,63 +525,288 @@ class RAMLatencyApp:
         self.size_entry.insert(0, "50")
         self.size_entry.grid(row=0, column=1)
 
+        tk.Label(frame, text="Max Threads: ").grid(row=1, column=0)
+        self.threads_entry = tk.Entry(frame)
+        self.threads_entry.insert(0, str(os.cpu_count() or 1))
+        self.threads_entry.grid(row=1, column=1)
+
+        tk.Label(frame, text="Sweep Max Working Set (MB): ").grid(row=2, column=0)
+        self.sweep_entry = tk.Entry(frame)
+        self.sweep_entry.insert(0, str(default_sweep_bytes(detect_llc_bytes(),
+                                                        available_memory_bytes()) // 2 ** 20))
+        self.sweep_entry.grid(row=2, column=1)
+
+        tk.Label(frame, text="Warmup Runs: ").grid(row=0, column=2)
+        self.warmup_entry = tk.Entry(frame, width=8)
+        self.warmup_entry.insert(0, str(DEFAULT_WARMUP))
+        self.warmup_entry.grid(row=0, column=3)
+
+        tk.Label(frame, text="Repetitions: ").grid(row=1, column=2)
+        self.reps_entry = tk.Entry(frame, width=8)
+        self.reps_entry.insert(0, str(DEFAULT_REPETITIONS))
+        self.reps_entry.grid(row=1, column=3)
+
+        self.huge_pages = tk.BooleanVar(value=False)
+        tk.Checkbutton(frame, text="Huge pages (mmap + MADV_HUGEPAGE)",
+                       variable=self.huge_pages).grid(row=3, column=0, sticky="w")
+        self.prefault = tk.BooleanVar(value=True)
+        tk.Checkbutton(frame, text="Pre-fault buffer",
+                       variable=self.prefault).grid(row=3, column=1, sticky="w")
+
         # Buttons
         btn_frame = tk.Frame(self.root)
         btn_frame.pack(pady=10)
 
-        tk.Button(btn_frame, text="Sequential Access Test",
-                  command=self.sequential_test, width=25).grid(row=0, column=0, padx=5)
+        self.run_buttons = [
+            tk.Button(btn_frame, text="Sequential Access Test",
+                      command=lambda: self.start_job("sequential"), width=25),
+            tk.Button(btn_frame, text="Random Access Test",
+                      command=lambda: self.start_job("random"), width=25),
+            tk.Button(btn_frame, text="STREAM Bandwidth Test",
+                      command=lambda: self.start_job("stream"), width=25),
+            tk.Button(btn_frame, text="Stride / Working-Set Sweep",
+                      command=lambda: self.start_job("sweep"), width=25),
+        ]
+        for i, button in enumerate(self.run_buttons):
+            button.grid(row=i // 2, column=i % 2, padx=5, pady=5)
 
-        tk.Button(btn_frame, text="Random Access Test",
-                  command=self.random_test, width=25).grid(row=0, column=1, padx=5)
+        tk.Button(btn_frame, text="Save Baseline",
+                  command=self.save_baseline, width=25).grid(row=0, column=2, padx=5, pady=5)
+        tk.Button(btn_frame, text="Load Baseline",
+                  command=self.load_baseline, width=25).grid(row=1, column=2, padx=5, pady=5)
+
+        # Progress
+        self.status = tk.Label(self.root, text="Idle")
+        self.status.pack()
+        self.progress = ttk.Progressbar(self.root, length=400, mode="determinate")
+        self.progress.pack(pady=5)
 
         # Output Box
-        self.output = tk.Text(self.root, height=15, width=70)
+        self.output = tk.Text(self.root, height=22, width=100)
         self.output.pack(pady=10)
 
     def log(self, message):
         self.output.insert(tk.END, message + "\n")
         self.output.see(tk.END)
 
-    def create_array(self):
-        size_mb = int(self.size_entry.get())
-        num_elements = (size_mb * 1024 * 1024) // 8
-        return np.zeros(num_elements, dtype=np.float64)
+    def read_config(self):
+        return {
+            "size_mb": int(self.size_entry.get()),
+            "max_threads": max(1, int(self.threads_entry.get())),
+            "sweep_max_mb": int(self.sweep_entry.get()),
+            "huge_pages": self.huge_pages.get(),
+            "prefault": self.prefault.get(),
+            "warmup": max(0, int(self.warmup_entry.get())),
+            "repetitions": max(1, int(self.reps_entry.get())),
+        }
 
-    def sequential_test(self):
-        self.output.delete(1.0, tk.END)
-        arr = self.create_array()
-        self.log("Running Sequential Access Test...")
+    def page_mode(self, config):
+        return "THP (MADV_HUGEPAGE)" if config["huge_pages"] else "4 KB pages"
+
+    def create_array(self, config, size_mb=None, dtype=np.float64):
+        if size_mb is None:
+            size_mb = config["size_mb"]
+        return allocate_buffer(size_mb * 1024 * 1024, dtype,
+                               huge_pages=config["huge_pages"],
+                               prefault=config["prefault"])
 
-        start = time.perf_counter_ns()
-        for i in range(len(arr)):
-            arr[i] += 1
-        end = time.perf_counter_ns()
+    # ---------- Worker thread ----------
+    # Everything below runs off the Tk thread and only talks to the GUI
+    # through self.events, which poll_events drains from after().
 
-        total_time = end - start
-        avg_latency = total_time / len(arr)
+    def post(self, kind, payload):
+        self.events.put((kind, payload))
 
-        self.log(f"Total Time: {total_time / 1e6:.2f} ms")
-        self.log(f"Average Access Latency: {avg_latency:.2f} ns")
+    def build_measure(self, benchmark, config):
+        if benchmark == "sequential":
+            arr = self.create_array(config)
+            return lambda: sequential_metrics(arr)
+        if benchmark == "random":
+            arr = self.create_array(config, dtype=np.intp)
+            return lambda: random_metrics(arr)
+        if benchmark == "stream":
+            llc = detect_llc_bytes()
+            n = stream_elements(llc, config["size_mb"] * 1024 * 1024)
+            self.post("log", f"STREAM with 3 x {n * 8 / 2**20:.0f} MB arrays "
+                             f"(LLC {llc / 2**20:.1f} MB), 1..{config['max_threads']} threads")
+            return lambda: stream_metrics(config["max_threads"], n, config["huge_pages"])
+
+        working_sets = self.sweep_working_sets(config)
+        buf = self.create_array(config, config["sweep_max_mb"], dtype=np.intp)
+        self.post("log", f"Stride sweep up to {format_bytes(buf.nbytes)}")
+
+        def progress(done, total):
+            self.post("status", f"Sweep row {done}/{total}")
+
+        return lambda: sweep_metrics(buf, working_sets, progress)
+
+    def sweep_working_sets(self, config):
+        return [ws for ws in SWEEP_WORKING_SETS if ws <= config["sweep_max_mb"] * 2 ** 20]
+
+    def job_worker(self, benchmark, config):
+        try:
+            measure = self.build_measure(benchmark, config)
+            metrics = run_harness(measure, config["warmup"], config["repetitions"], self.post)
+            result = {
+                "benchmark": benchmark,
+                "created": datetime.now().isoformat(timespec="seconds"),
+                "host": host_info(),
+                "config": config,
+                "metrics": metrics,
+            }
+            self.post("done", result)
+        except Exception as exc:
+            self.post("error", f"{type(exc).__name__}: {exc}")
+
+    # ---------- GUI thread ----------
+
+    def start_job(self, benchmark):
+        if self.worker and self.worker.is_alive():
+            return
+        try:
+            config = self.read_config()
+        except ValueError:
+            messagebox.showerror("Invalid input", "All numeric fields must be integers.")
+            return
+        if benchmark == "sweep" and not self.sweep_working_sets(config):
+            messagebox.showerror("Invalid input", "Sweep needs a working set of at least 1 MB.")
+            return
+        available = available_memory_bytes()
+        if benchmark == "sweep" and available is not None:
+            limit_mb = int(available * SWEEP_MEMORY_FRACTION) // 2 ** 20
+            if config["sweep_max_mb"] > limit_mb:
+                messagebox.showerror("Invalid input",
+                                     f"Sweep max working set must be at most {limit_mb} MB "
+                                     f"(half of the {available // 2 ** 20} MB currently available).")
+                return
 
-    def random_test(self):
         self.output.delete(1.0, tk.END)
-        arr = self.create_array()
-        self.log("Running Random Access Test...")
+        self.log(f"Running {benchmark} benchmark with {self.page_mode(config)}: "
+                 f"{config['warmup']} warmup + {config['repetitions']} repetitions...")
+        for button in self.run_buttons:
+            button.config(state=tk.DISABLED)
+        self.worker = threading.Thread(target=self.job_worker, args=(benchmark, config), daemon=True)
+        self.worker.start()
+
+    def poll_events(self):
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == "progress":
+                    done, total, phase = payload
+                    self.progress.config(maximum=total, value=done)
+                    self.status.config(text=f"{phase} {min(done + 1, total)}/{total}")
+                elif kind == "status":
+                    self.status.config(text=payload)
+                elif kind == "log":
+                    self.log(payload)
+                elif kind == "done":
+                    self.finish_job(payload)
+                elif kind == "error":
+                    self.finish_job(None)
+                    self.log(f"Benchmark failed: {payload}")
+        except queue.Empty:
+            pass
+        self.root.after(POLL_MS, self.poll_events)
+
+    def finish_job(self, result):
+        for button in self.run_buttons:
+            button.config(state=tk.NORMAL)
+        self.status.config(text="Idle")
+        if result is None:
+            return
+        self.last_result = result
+        if result["benchmark"] == "stream":
+            self.show_stream(result)
+        elif result["benchmark"] == "sweep":
+            self.show_sweep(result)
+        else:
+            self.show_summary(result["metrics"])
+        self.show_regressions(result)
+
+    def show_summary(self, metrics):
+        self.log(f"{'Metric':<24}{'Median':>10}{'IQR':>10}{'95% CI':>22}")
+        for metric, summary in metrics.items():
+            ci = f"[{summary['ci_low']:.2f}, {summary['ci_high']:.2f}]"
+            self.log(f"{metric:<24}{summary['median']:>10.2f}{summary['iqr']:>10.2f}{ci:>22}")
+        self.log("(_ns metrics in ns per access, _gbps metrics in GB/s)")
+
+    def show_stream(self, result):
+        metrics = result["metrics"]
+        names = list(STREAM_BYTES)
+        self.log("Threads " + "".join(f"{name:>10}" for name in names) + "   Triad scaling")
+        base = metrics[stream_metric("Triad", 1)]["median"]
+        for threads in range(1, result["config"]["max_threads"] + 1):
+            row = "".join(f"{metrics[stream_metric(name, threads)]['median']:>10.2f}" for name in names)
+            speedup = metrics[stream_metric("Triad", threads)]["median"] / base
+            self.log(f"{threads:>7} {row}   {speedup:4.2f}x {'#' * round(speedup * 10)}")
+        self.log("(median GB/s)")
+
+    def show_sweep(self, result):
+        metrics = result["metrics"]
+        working_sets = self.sweep_working_sets(result["config"])
+        surface = np.full((len(working_sets), len(SWEEP_STRIDES)), np.nan)
+        for i, working_set in enumerate(working_sets):
+            for j, stride in enumerate(SWEEP_STRIDES):
+                summary = metrics.get(sweep_metric(working_set, stride))
+                if summary:
+                    surface[i, j] = summary["median"]
+
+        self.log("  WS / stride" + "".join(f"{format_bytes(s):>6}" for s in SWEEP_STRIDES))
+        for ws, row in zip(working_sets, surface):
+            cells = "".join("     -" if np.isnan(v) else f"{v:6.1f}" for v in row)
+            self.log(f"{format_bytes(ws):>11}{cells}")
+        self.log("(median ns per dependent load above the L1 loop baseline)")
 
-        indices = list(range(len(arr)))
-        random.shuffle(indices)
+        line_col = SWEEP_STRIDES.index(64)
+        ws_labels = [format_bytes(ws) for ws in working_sets]
+        stride_labels = [format_bytes(s) for s in SWEEP_STRIDES]
+        self.log("Capacity steps at 64 B stride (cache / TLB reach): "
+                 + (", ".join(latency_knees(surface[:, line_col], ws_labels)) or "none"))
+        self.log(f"Stride steps at {ws_labels[-1]} (line / page boundaries): "
+                 + (", ".join(latency_knees(surface[-1], stride_labels)) or "none"))
 
-        start = time.perf_counter_ns()
-        for i in indices:
-            arr[i] += 1
-        end = time.perf_counter_ns()
+    def show_regressions(self, result):
+        if not self.baseline or self.baseline["benchmark"] != result["benchmark"]:
+            return
+        self.log("")
+        base_host = self.baseline.get("host", {})
+        self.log(f"Against baseline from {base_host.get('hostname', '?')} "
+                 f"({self.baseline.get('created', '?')}):")
+        for key in ("cpu", "thp", "llc_bytes"):
+            if base_host.get(key) != result["host"].get(key):
+                self.log(f"  note: host {key} differs "
+                         f"({base_host.get(key)} -> {result['host'].get(key)})")
+        if self.baseline.get("config") != result["config"]:
+            self.log("  note: benchmark settings differ from the baseline run")
+        regressions = find_regressions(result["metrics"], self.baseline["metrics"])
+        if not regressions:
+            self.log("  No regressions.")
+        for metric, current, base, change in regressions:
+            self.log(f"  REGRESSION {metric}: {current:.2f} vs {base:.2f} ({change:+.1%})")
 
-        total_time = end - start
-        avg_latency = total_time / len(arr)
+    def save_baseline(self):
+        if not self.last_result:
+            messagebox.showinfo("Save Baseline", "Run a benchmark first.")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            save_baseline(path, self.last_result)
+            self.log(f"Saved baseline to {path}")
 
-        self.log(f"Total Time: {total_time / 1e6:.2f} ms")
-        self.log(f"Average Access Latency: {avg_latency:.2f} ns")
+    def load_baseline(self):
+        path = filedialog.askopenfilename(filetypes=[("JSON", "*.json")])
+        if not path:
+            return
+        try:
+            self.baseline = load_baseline(path)
+        except (OSError, ValueError) as err:
+            messagebox.showerror("Load Baseline", str(err))
+            return
+        self.log(f"Loaded {self.baseline['benchmark']} baseline from {path}")
+        if self.last_result:
+            self.show_regressions(self.last_result)
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,47 +1,228 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
+from collections import deque
+import queue
+import random
+import re
+import threading
+import time
+
+FUNCTIONAL_UNITS = {"ALU": 2, "MUL": 1, "LSU": 1}  # default pool: unit type -> count
+# opcode -> (unit type, result latency in cycles, cycles the unit stays busy)
+OPCODE_TIMING = {
+    "ADD": ("ALU", 1, 1), "SUB": ("ALU", 1, 1), "AND": ("ALU", 1, 1), "OR": ("ALU", 1, 1),
+    "XOR": ("ALU", 1, 1), "SLT": ("ALU", 1, 1), "ADDI": ("ALU", 1, 1), "MOV": ("ALU", 1, 1),
+    "BEQ": ("ALU", 1, 1), "BNE": ("ALU", 1, 1), "J": ("ALU", 1, 1), "NOP": ("ALU", 1, 1),
+    "MUL": ("MUL", 3, 1), "DIV": ("MUL", 12, 12),
+    "LW": ("LSU", 2, 1), "LOAD": ("LSU", 2, 1), "SW": ("LSU", 1, 1), "STORE": ("LSU", 1, 1),
+}
+NO_DESTINATION = {"SW", "STORE", "BEQ", "BNE", "J", "NOP"}  # every register operand is read
+STALL_REASONS = ["RAW", "WAW", "Structural", "Front-end", "Drain"]
+RANDOM_MIX = [("ADD", 30), ("SUB", 10), ("AND", 5), ("XOR", 5), ("MUL", 10), ("DIV", 1),
+              ("LW", 25), ("SW", 10), ("BEQ", 4)]
+REGISTER_TOKEN = re.compile(r"(?<![#\w])[A-Z_$][\w$]*")  # operands starting with a letter; #4 and 8(R2) offsets are not
+LOG_LIMIT = 2000  # cycles printed before per-cycle logging is cut off
+POLL_MS = 100
+
+def decode_program(lines):
+    """Pre-decode text lines into (unit, latency, occupancy, dest, sources) records.
+
+    Register names become small integers so the scoreboard is a flat list;
+    dest is -1 for instructions that write nothing. Unknown opcodes run on an
+    ALU. Repeated lines share one record, which keeps large programs cheap to
+    hold. Returns the records and the number of distinct registers."""
+    registers = {}
+    decoded = {}
+    program = []
+    for line in lines:
+        record = decoded.get(line)
+        if record is None:
+            opcode, _, operands = line.strip().partition(" ")
+            opcode = opcode.upper()
+            unit, latency, occupancy = OPCODE_TIMING.get(opcode, ("ALU", 1, 1))
+            names = tuple(registers.setdefault(name, len(registers))
+                          for name in REGISTER_TOKEN.findall(operands.upper()))
+            if opcode in NO_DESTINATION or not names:
+                record = (unit, latency, occupancy, -1, names)
+            else:
+                record = (unit, latency, occupancy, names[0], names[1:])
+            decoded[line] = record
+        program.append(record)
+    return program, len(registers)
+
+def random_program(count, registers=32, seed=None):
+    rng = random.Random(seed)
+    opcodes = rng.choices([op for op, _ in RANDOM_MIX], [weight for _, weight in RANDOM_MIX], k=count)
+    names = rng.choices([f"R{r}" for r in range(registers)], k=3 * count)
+    offsets = rng.choices([str(4 * i) for i in range(64)], k=count)
+    lines = []
+    for i, opcode in enumerate(opcodes):
+        if opcode in ("LW", "SW"):
+            lines.append(f"{opcode} {names[3 * i]}, {offsets[i]}({names[3 * i + 1]})")
+        elif opcode == "BEQ":
+            lines.append(f"BEQ {names[3 * i]}, {names[3 * i + 1]}, next")
+        else:
+            lines.append(f"{opcode} {names[3 * i]}, {names[3 * i + 1]}, {names[3 * i + 2]}")
+    return lines
 
 class SuperscalarSimulator:
-    def __init__(self, width=2):
+    """In-order superscalar core: IF -> ID -> issue/EX -> WB, `width` instructions wide.
+
+    IF and ID hand instructions on through deque latches of `width` entries.
+    Each cycle the issue stage takes instructions from the ID latch in
+    program order and stops at the first one that cannot go: a source not
+    yet produced (RAW, with full forwarding), a destination whose earlier
+    writer would finish later (WAW), or no free unit of its type
+    (structural). The scoreboard holds the cycle each register's value
+    becomes available; each unit holds the cycle it is free again. Unused
+    issue slots are charged to the reason issue stopped. The memory stage
+    is folded into the LSU latency and branches have no control hazards.
+    """
+
+    def __init__(self, width=2, units=None):
         self.width = width
-        self.pipeline = {'IF': [], 'ID': [], 'EX': [], 'MEM': [], 'WB': []}
-        self.instructions = []
+        self.units = dict(units or FUNCTIONAL_UNITS)
+        self.pipeline = {'IF': deque(), 'ID': deque(), 'EX': [], 'WB': []}
+        self.instructions = []  # source lines
         self.cycle = 0
+        self.log = None  # callable taking one line per cycle, or None
 
     def load_instructions(self, instr_list):
-        self.instructions = instr_list
+        self.instructions = list(instr_list)
+        self.program, registers = decode_program(self.instructions)
+        self.pc = 0
+        self.cycle = 0
+        self.ready = [0] * registers  # scoreboard: cycle each register's value can be used
+        self.free_at = {unit: [0] * count for unit, count in self.units.items()}
+        self.busy = dict.fromkeys(self.units, 0)  # unit-cycles of occupancy, for utilisation
+        self.pipeline = {'IF': deque(), 'ID': deque(), 'EX': [], 'WB': []}
+        self.stalls = dict.fromkeys(STALL_REASONS, 0)
+        self.issued = 0
+        self.last_complete = 0
 
     def step(self):
-        """Simulate one cycle"""
-        self.cycle += 1
-        # Move instructions through pipeline stages
-        self.pipeline['WB'] = self.pipeline['MEM']
-        self.pipeline['MEM'] = self.pipeline['EX']
-        self.pipeline['EX'] = self.pipeline['ID']
-        # Fetch new instructions
-        fetch_count = min(self.width, len(self.instructions))
-        self.pipeline['ID'] = self.instructions[:fetch_count]
-        self.instructions = self.instructions[fetch_count:]
-        print(f"Cycle {self.cycle}: {self.pipeline}")
+        """Simulate one cycle; stages run back to front so each latch is freed before it is refilled."""
+        cycle = self.cycle
+        width = self.width
+        fetch, decode = self.pipeline['IF'], self.pipeline['ID']  # latches of program indices
+        ready, free_at = self.ready, self.free_at
+        program = self.program
+        issued = 0
+        reason = None
+        while issued < width and decode:
+            index = decode[0]
+            unit, latency, occupancy, dest, sources = program[index]
+            for src in sources:
+                if ready[src] > cycle:
+                    reason = "RAW"
+                    break
+            if reason:
+                break
+            if dest >= 0 and ready[dest] > cycle + latency:
+                reason = "WAW"
+                break
+            slots = free_at[unit]
+            for slot, free in enumerate(slots):
+                if free <= cycle:
+                    break
+            else:
+                reason = "Structural"
+                break
+            decode.popleft()
+            slots[slot] = cycle + occupancy
+            self.busy[unit] += occupancy
+            if dest >= 0:
+                ready[dest] = cycle + latency
+            if cycle + latency > self.last_complete:
+                self.last_complete = cycle + latency
+            if self.log:
+                self.pipeline['EX'].append((cycle + latency, index))
+            issued += 1
+        if issued < width:
+            if reason is None:
+                reason = "Front-end" if self.pc < len(self.program) else "Drain"
+            self.stalls[reason] += width - issued
+        self.issued += issued
+
+        while fetch and len(decode) < width:
+            decode.append(fetch.popleft())
+        while len(fetch) < width and self.pc < len(program):
+            fetch.append(self.pc)
+            self.pc += 1
+
+        if self.log:
+            finished = [index for at, index in self.pipeline['EX'] if at <= cycle + 1]
+            self.pipeline['EX'] = [(at, index) for at, index in self.pipeline['EX'] if at > cycle + 1]
+            self.pipeline['WB'] = finished
+            self.log(f"C{cycle + 1:<5} IF {' '.join(f'i{i}' for i in fetch):<14}"
+                     f"ID {' '.join(f'i{i}' for i in decode):<14}"
+                     f"EX {' '.join(f'i{i}' for _, i in self.pipeline['EX']):<18}"
+                     f"WB {' '.join(f'i{i}' for i in finished):<12}"
+                     f"{'' if issued == width else reason}")
+        self.cycle = cycle + 1
+
+    def run(self):
+        """Step until every instruction has issued and report IPC and stall counters."""
+        started = time.perf_counter()
+        step, fetch, decode = self.step, self.pipeline['IF'], self.pipeline['ID']
+        while self.pc < len(self.program) or fetch or decode:
+            step()
+        cycles = max(self.cycle, self.last_complete)
+        slots = cycles * self.width
+        stalls = dict(self.stalls)
+        # Cycles spent waiting for the last results after issue has finished.
+        stalls["Drain"] += (cycles - self.cycle) * self.width
+        return {
+            "instructions": len(self.program),
+            "cycles": cycles,
+            "ipc": len(self.program) / cycles if cycles else 0.0,
+            "stalls": stalls,
+            "slots": slots,
+            "utilisation": {unit: busy / (cycles * self.units[unit]) if cycles else 0.0
+                            for unit, busy in self.busy.items()},
+            "wall": time.perf_counter() - started,
+        }
 
 class SimulatorGUI(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Superscalar Architecture Simulator")
-        self.geometry("600x400")
+        self.geometry("820x640")
         self.sim = SuperscalarSimulator(width=2)
-        
+        self.events = queue.Queue()
+        self.running = False
+
         self.instr_entry = tk.Entry(self, width=50)
         self.instr_entry.pack(pady=10)
-        
+
         self.add_btn = tk.Button(self, text="Add Instruction", command=self.add_instruction)
         self.add_btn.pack(pady=5)
-        
+
+        config_frame = tk.Frame(self)
+        config_frame.pack(pady=5)
+        self.config_entries = {}
+        fields = [("width", "Issue Width:", "2")] + [(unit, f"{unit} Units:", str(count))
+                                                      for unit, count in FUNCTIONAL_UNITS.items()]
+        for i, (key, label, default) in enumerate(fields):
+            tk.Label(config_frame, text=label).grid(row=0, column=2 * i, sticky="w", padx=(8, 0))
+            entry = tk.Entry(config_frame, width=5)
+            entry.insert(0, default)
+            entry.grid(row=0, column=2 * i + 1, sticky="w")
+            self.config_entries[key] = entry
+        tk.Label(config_frame, text="Random Program Size:").grid(row=1, column=0, columnspan=2, sticky="w", padx=(8, 0))
+        self.random_entry = tk.Entry(config_frame, width=10)
+        self.random_entry.insert(0, "1000000")
+        self.random_entry.grid(row=1, column=2, columnspan=2, sticky="w")
+        ttk.Button(config_frame, text="Generate", command=self.generate_program).grid(row=1, column=4, columnspan=2)
+        self.log_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(config_frame, text="Log each cycle", variable=self.log_var).grid(row=1, column=6, columnspan=2)
+
         self.start_btn = tk.Button(self, text="Start Simulation", command=self.start_sim)
         self.start_btn.pack(pady=5)
-        
-        self.output = tk.Text(self, height=15, width=70)
+
+        self.output = tk.Text(self, height=24, width=100, font=("Courier", 9))
         self.output.pack(pady=10)
+        self.after(POLL_MS, self.poll_events)
 
     def add_instruction(self):
         instr = self.instr_entry.get()
@@ -50,12 +231,89 @@ class SimulatorGUI(tk.Tk):
             self.output.insert(tk.END, f"Added: {instr}\n")
             self.instr_entry.delete(0, tk.END)
 
+    def generate_program(self):
+        try:
+            count = int(self.random_entry.get())
+            if count < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Enter a positive program size")
+            return
+        self.sim.instructions = random_program(count)
+        self.output.insert(tk.END, f"Generated {count:,} random instructions.\n")
+        self.output.see(tk.END)
+
     def start_sim(self):
-        while self.sim.instructions or any(self.sim.pipeline.values()):
-            self.sim.step()
-            self.output.insert(tk.END, f"Cycle {self.sim.cycle}: {self.sim.pipeline}\n")
-            self.output.see(tk.END)
-            self.update_idletasks()
+        if self.running:
+            return
+        if not self.sim.instructions:
+            messagebox.showerror("Error", "Add or generate instructions first")
+            return
+        try:
+            width = int(self.config_entries["width"].get())
+            units = {unit: int(self.config_entries[unit].get()) for unit in FUNCTIONAL_UNITS}
+            if width < 1 or min(units.values()) < 1:
+                raise ValueError
+        except ValueError:
+            messagebox.showerror("Error", "Issue width and unit counts must be positive integers")
+            return
+        program = self.sim.instructions
+        self.sim = SuperscalarSimulator(width, units)
+        self.sim.instructions = program
+        self.running = True
+        self.start_btn.config(state=tk.DISABLED)
+        self.output.insert(tk.END, f"\nSimulating {len(program):,} instructions, width {width}, "
+                                   + ", ".join(f"{unit}x{count}" for unit, count in units.items()) + "\n")
+        threading.Thread(target=self.simulate, args=(self.sim, program, self.log_var.get()), daemon=True).start()
+
+    def simulate(self, sim, program, logging):
+        # Runs off the Tk thread; per-cycle lines and the report come back through self.events.
+        try:
+            sim.load_instructions(program)
+            lines = []
+            if logging:
+                def log(line):
+                    lines.append(line)
+                    if len(lines) >= LOG_LIMIT:
+                        sim.log = None  # the rest of the run goes at full speed
+                sim.log = log
+            result = sim.run()
+            if logging:
+                self.events.put(("log", "\n".join(lines)
+                                 + (f"\n... logging stopped after {LOG_LIMIT} cycles" if sim.cycle > LOG_LIMIT else "")))
+        except Exception as e:
+            self.events.put(("error", str(e)))
+            return
+        self.events.put(("result", (sim, result)))
+
+    def poll_events(self):
+        try:
+            while True:
+                kind, payload = self.events.get_nowait()
+                if kind == "log":
+                    self.output.insert(tk.END, payload + "\n")
+                    continue
+                if kind == "result":
+                    self.show_result(*payload)
+                elif kind == "error":
+                    messagebox.showerror("Error", payload)
+                self.running = False
+                self.start_btn.config(state=tk.NORMAL)
+        except queue.Empty:
+            pass
+        self.after(POLL_MS, self.poll_events)
+
+    def show_result(self, sim, result):
+        self.output.insert(tk.END,
+            f"\n{result['instructions']:,} instructions in {result['cycles']:,} cycles: "
+            f"IPC {result['ipc']:.3f} of {sim.width} ({result['wall']:.2f} s, "
+            f"{result['cycles'] / max(result['wall'], 1e-9):,.0f} cycles/s)\n")
+        self.output.insert(tk.END, "Lost issue slots: " + ", ".join(
+            f"{reason} {100 * count / result['slots']:.1f}%" for reason, count in result["stalls"].items() if count)
+            + "\n")
+        self.output.insert(tk.END, "Unit utilisation: " + ", ".join(
+            f"{unit}x{sim.units[unit]} {100 * used:.1f}%" for unit, used in result["utilisation"].items()) + "\n")
+        self.output.see(tk.END)
 
 if __name__ == "__main__":
     app = SimulatorGUI()